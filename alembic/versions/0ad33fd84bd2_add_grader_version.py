@@ -0,0 +1,26 @@
+"""add grader_version to quiz_attempts
+
+Revision ID: 0ad33fd84bd2
+Revises: f41def64bc68
+Create Date: 2026-10-19 09:12:41.503218
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0ad33fd84bd2'
+down_revision: Union[str, None] = 'f41def64bc68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables made by create_all() on a fresh database already have the column
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("quiz_attempts")}
+    if "grader_version" not in columns:
+        op.add_column("quiz_attempts", sa.Column("grader_version", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("quiz_attempts", "grader_version")
@@ -0,0 +1,108 @@
+"""partition quiz_attempts by month on attempted_at (Postgres only)
+
+Revision ID: 5e8b1c3f9a27
+Revises: 9c41d7e2b8a6
+Create Date: 2026-10-19 15:41:08.271954
+"""
+from datetime import date
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b1c3f9a27'
+down_revision: Union[str, None] = '9c41d7e2b8a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created up front past the current month; partition_quiz_attempts.py
+# ensure keeps extending this
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, user_id, term_id, user_answer, score, ai_feedback, correct_answer, attempted_at, grader_version"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes() -> None:
+    op.execute("CREATE INDEX ix_quiz_attempts_id ON quiz_attempts (id)")
+    op.execute(
+        "CREATE INDEX ix_quiz_attempts_user_id_term_id_attempted_at "
+        "ON quiz_attempts (user_id, term_id, attempted_at)"
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE quiz_attempts RENAME TO quiz_attempts_unpartitioned")
+    op.execute("ALTER TABLE quiz_attempts_unpartitioned RENAME CONSTRAINT quiz_attempts_pkey TO quiz_attempts_unpartitioned_pkey")
+
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE quiz_attempts (
+            id INTEGER NOT NULL DEFAULT nextval('quiz_attempts_id_seq'),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            term_id INTEGER NOT NULL REFERENCES terms (id),
+            user_answer VARCHAR NOT NULL,
+            score INTEGER NOT NULL,
+            ai_feedback VARCHAR,
+            correct_answer VARCHAR,
+            attempted_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            grader_version VARCHAR,
+            CONSTRAINT quiz_attempts_pkey PRIMARY KEY (id, attempted_at)
+        ) PARTITION BY RANGE (attempted_at)
+    """)
+
+    oldest = op.get_bind().execute(sa.text("SELECT min(attempted_at) FROM quiz_attempts_unpartitioned")).scalar()
+    this_month = date.today().replace(day=1)
+    month = date(oldest.year, oldest.month, 1) if oldest else this_month
+    while month <= _add_months(this_month, MONTHS_AHEAD):
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE quiz_attempts_y{month.year:04d}m{month.month:02d} PARTITION OF quiz_attempts "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    op.execute("CREATE TABLE quiz_attempts_default PARTITION OF quiz_attempts DEFAULT")
+
+    op.execute(f"""
+        INSERT INTO quiz_attempts ({COLUMNS})
+        SELECT id, user_id, term_id, user_answer, score, ai_feedback, correct_answer,
+               COALESCE(attempted_at, now()), grader_version
+        FROM quiz_attempts_unpartitioned
+    """)
+    # Keep the id sequence alive when the old table goes
+    op.execute("ALTER SEQUENCE quiz_attempts_id_seq OWNED BY quiz_attempts.id")
+    op.execute("DROP TABLE quiz_attempts_unpartitioned")
+    _create_indexes()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # Partitions already archived by partition_quiz_attempts.py are not restored
+    op.execute("""
+        CREATE TABLE quiz_attempts_unpartitioned (
+            id INTEGER NOT NULL DEFAULT nextval('quiz_attempts_id_seq'),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            term_id INTEGER NOT NULL REFERENCES terms (id),
+            user_answer VARCHAR NOT NULL,
+            score INTEGER NOT NULL,
+            ai_feedback VARCHAR,
+            correct_answer VARCHAR,
+            attempted_at TIMESTAMP WITHOUT TIME ZONE,
+            grader_version VARCHAR
+        )
+    """)
+    op.execute(f"INSERT INTO quiz_attempts_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM quiz_attempts")
+    op.execute("ALTER SEQUENCE quiz_attempts_id_seq OWNED BY quiz_attempts_unpartitioned.id")
+    op.execute("DROP TABLE quiz_attempts")
+    op.execute("ALTER TABLE quiz_attempts_unpartitioned RENAME TO quiz_attempts")
+    op.execute("ALTER TABLE quiz_attempts ADD CONSTRAINT quiz_attempts_pkey PRIMARY KEY (id)")
+    _create_indexes()
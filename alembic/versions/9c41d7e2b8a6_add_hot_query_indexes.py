@@ -0,0 +1,36 @@
+"""add indexes for per-user and quiz-draw queries
+
+Revision ID: 9c41d7e2b8a6
+Revises: 0ad33fd84bd2
+Create Date: 2026-10-19 14:03:27.882041
+"""
+from typing import Sequence, Union
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41d7e2b8a6'
+down_revision: Union[str, None] = '0ad33fd84bd2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns) - keep in sync with __table_args__ in app/models.py
+INDEXES = [
+    ("ix_quiz_attempts_user_id_term_id_attempted_at", "quiz_attempts", ["user_id", "term_id", "attempted_at"]),
+    ("ix_vocabulary_items_user_id_term_id", "vocabulary_items", ["user_id", "term_id"]),
+    ("ix_terms_category_difficulty", "terms", ["category", "difficulty"]),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY on Postgres so quiz_attempts stays writable while the index builds.
+    # It can't run inside a transaction, hence the autocommit block.
+    # if_not_exists: databases created by create_all() on startup already have them.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
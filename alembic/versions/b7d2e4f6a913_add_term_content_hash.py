@@ -0,0 +1,26 @@
+"""add content_hash to terms
+
+Revision ID: b7d2e4f6a913
+Revises: 5e8b1c3f9a27
+Create Date: 2026-10-19 17:22:45.610387
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4f6a913'
+down_revision: Union[str, None] = '5e8b1c3f9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tables made by create_all() on a fresh database already have the column
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("terms")}
+    if "content_hash" not in columns:
+        op.add_column("terms", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("terms", "content_hash")
@@ -0,0 +1,38 @@
+"""add cache_versions
+
+Revision ID: d4a8f1c6e205
+Revises: b7d2e4f6a913
+Create Date: 2026-10-19 19:05:12.184503
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8f1c6e205'
+down_revision: Union[str, None] = 'b7d2e4f6a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOPICS = ("terms",)
+
+
+def upgrade() -> None:
+    # Fresh databases get the table from create_all(); only add what's missing
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("cache_versions"):
+        op.create_table(
+            "cache_versions",
+            sa.Column("topic", sa.String(), nullable=False),
+            sa.Column("version", sa.BigInteger(), nullable=False),
+            sa.PrimaryKeyConstraint("topic"),
+        )
+    cache_versions = sa.table("cache_versions", sa.column("topic", sa.String), sa.column("version", sa.BigInteger))
+    existing = {row[0] for row in bind.execute(sa.select(cache_versions.c.topic))}
+    rows = [{"topic": t, "version": 0} for t in TOPICS if t not in existing]
+    if rows:
+        op.bulk_insert(cache_versions, rows)
+
+
+def downgrade() -> None:
+    op.drop_table("cache_versions")
@@ -1,12 +1,25 @@
 """
 JWT Bearer token verification for protected routes
+
+get_current_user resolves the caller from the verified JWT alone (no database
+access) - routers only need the id. Handlers that need the full row depend on
+get_current_user_record instead, which can be served from a small per-worker
+TTL cache:
+    USER_CACHE_TTL_SECONDS  how long a loaded User stays cached (default 0 = off)
+    USER_CACHE_SIZE         max cached users per worker (default 10000)
 """
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Tuple
+
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.auth_handler import decode_jwt
-from app.database import get_db
+from app.database import get_db, read_session, reads_from_primary
 from app.models import User
 
 #This tells FastAPI: "Look for a token in the Authorization header formatted as Bearer <token>"
@@ -16,13 +29,23 @@ from app.models import User
 #__init__
 security = HTTPBearer()
 
-def get_current_user(
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "0"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated caller, built from the token's claims"""
+    id: int
+    expires: float
+
+
+async def get_current_user(
         #__call__
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
     """
-    Get current authenticated user from JWT token
+    Get the authenticated user from the JWT (no database access)
     """
     # Extract token from credentials
     token = credentials.credentials
@@ -34,14 +57,66 @@ def get_current_user(
     if not payload:
         raise HTTPException(status_code=403, detail="Invalid or expired token")
     
-    # Extract user_id from payload
-    user_id = payload.get("user_id")
-    
-    # Query database for user
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    try:
+        return Principal(id=int(payload["user_id"]), expires=float(payload["expires"]))
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=403, detail="Invalid or expired token")
+
+
+async def get_current_user_id(user: Principal = Depends(get_current_user)) -> int:
+    return user.id
+
+
+async def get_read_db(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Session for read-only work: the replica when DATABASE_READ_URL is set,
+    otherwise (or right after this user wrote something) the primary session
+    """
+    # The primary session only connects on first use, so it costs nothing here
+    if reads_from_primary(user_id):
+        yield db
+        return
+    async with read_session() as read_db:
+        yield read_db
+
+
+# user id -> (monotonic expiry, detached User)
+_user_cache: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+
+
+def forget_user(user_id: int) -> None:
+    """Drop a cached User (call after changing the row in this worker)"""
+    _user_cache.pop(user_id, None)
+
+
+async def get_current_user_record(
+    user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> User:
+    """
+    Load the authenticated user's row. With USER_CACHE_TTL_SECONDS set, the
+    row may be that old and is shared between requests - treat it as read-only.
+    """
+    if USER_CACHE_TTL_SECONDS > 0:
+        cached = _user_cache.get(user.id)
+        if cached is not None and cached[0] > time.monotonic():
+            _user_cache.move_to_end(user.id)
+            return cached[1]
+
+    # Query database for user (primary key lookup)
+    record = await db.get(User, user.id)
     
     # Check if user exists
-    if not user:
+    if not record:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    return user
+
+    if USER_CACHE_TTL_SECONDS > 0:
+        db.expunge(record)
+        _user_cache[user.id] = (time.monotonic() + USER_CACHE_TTL_SECONDS, record)
+        _user_cache.move_to_end(user.id)
+        while len(_user_cache) > USER_CACHE_SIZE:
+            _user_cache.popitem(last=False)
+    return record
@@ -1,15 +1,42 @@
 """
 JWT token handler for encoding and decoding tokens
+
+Clients send the same access token with every request for up to 30 minutes,
+so verified tokens are kept in a small per-worker LRU keyed by the token's
+SHA-256 (any change to the token, signature included, is a different key).
+A hit skips PyJWT's parsing and HMAC check; expired entries are dropped on
+lookup. JWT_CACHE_SIZE sets the number of entries (default 4096, 0 = off).
 """
+import hashlib
+import threading
 import time
-from typing import Dict
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 import jwt
 from dotenv import load_dotenv
 import os
 
+from app.services.metrics import registry
+
 load_dotenv()
 JWT_SECRET = os.getenv("SECRET_KEY")
 JWT_ALGORITHM = os.getenv("ALGORITHM")
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+
+# token digest -> (expires, claims)
+_verified: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+_verified_lock = threading.Lock()
+
+jwt_cache_lookups = registry.counter("jwt_cache_lookups_total", "Verified-token cache lookups by result (hit/miss)")
+
+
+def _hit_ratio() -> float:
+    hits = jwt_cache_lookups.value(result="hit")
+    total = hits + jwt_cache_lookups.value(result="miss")
+    return hits / total if total else 0.0
+
+
+registry.gauge("jwt_cache_hit_ratio", "Share of decode_jwt calls served from the verified-token cache", callback=_hit_ratio)
 
 
 def token_response(token: str):
@@ -34,13 +61,39 @@ def sign_jwt(user_id: str) -> Dict[str, str]:
     return token_response(token)
 
 
-def decode_jwt(token: str) -> dict:
-    """
-    Decode and verify a JWT token
-    """
+def _verify(token: str) -> Optional[dict]:
     try:
         decoded_token = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
         #compares future time to current time to see if token expired
-        return decoded_token if decoded_token["expires"] >= time.time() else None
-    except:
-        return {}
+        return decoded_token if float(decoded_token["expires"]) >= time.time() else None
+    except (jwt.InvalidTokenError, KeyError, TypeError, ValueError):
+        return None
+
+
+def decode_jwt(token: str) -> Optional[dict]:
+    """
+    Decode and verify a JWT token. Returns its claims, or None if the token
+    is invalid or expired.
+    """
+    if JWT_CACHE_SIZE <= 0:
+        return _verify(token)
+
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    with _verified_lock:
+        entry = _verified.get(key)
+        if entry is not None:
+            if entry[0] >= time.time():
+                _verified.move_to_end(key)
+                jwt_cache_lookups.inc(result="hit")
+                return dict(entry[1])
+            del _verified[key]
+    jwt_cache_lookups.inc(result="miss")
+
+    claims = _verify(token)
+    if claims is not None:
+        with _verified_lock:
+            _verified[key] = (float(claims["expires"]), claims)
+            while len(_verified) > JWT_CACHE_SIZE:
+                _verified.popitem(last=False)
+        return dict(claims)
+    return None
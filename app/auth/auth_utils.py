@@ -1,11 +1,32 @@
 """
 Password hashing utilities using passlib and bcrypt
+
+BCRYPT_ROUNDS is the bcrypt cost factor (default 12; each +1 doubles the
+hashing time). Pick it for the deployment hardware with calibrate_bcrypt.py.
+Hashes stored with any other cost are rehashed on the next successful login
+(verify_and_update), so changing it needs no password resets.
 """
+import os
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
 
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+def make_context(rounds: int) -> CryptContext:
+    # min = max = default: hashes with any other cost count as outdated
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
 
 # Create password context for hashing with salting
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = make_context(BCRYPT_ROUNDS)
 
 
 def hash_password(password: str) -> str:
@@ -20,3 +41,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Verify a plain password against a hashed password
     """
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password; if it matches but the hash uses an outdated cost
+    (pwd_context.needs_update), also return a new hash to store
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
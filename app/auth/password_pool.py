@@ -0,0 +1,80 @@
+"""
+Bounded thread pool for bcrypt
+
+A bcrypt hash or verify burns 100-300 ms of CPU. Run inline in an async
+handler, it stalls every other request on the worker. The bcrypt C extension
+releases the GIL, so a small thread pool is enough to keep the event loop
+free. The async functions here wrap the ones in auth_utils.
+
+Settings:
+    PASSWORD_HASH_WORKERS      threads per worker process (default 2)
+    PASSWORD_HASH_MAX_PENDING  queued + running operations before new ones are
+                               refused with PasswordHasherBusy (default 64)
+
+Metrics: password_hash_pending (gauge), password_hash_queue_wait_seconds and
+password_hash_seconds (histograms), password_hash_rejected_total. All are
+labelled by op (hash/verify), except the gauge.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.auth import auth_utils
+from app.services.metrics import registry
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+HASH_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+hash_pending = registry.gauge("password_hash_pending", "bcrypt operations queued or running")
+hash_queue_wait = registry.histogram("password_hash_queue_wait_seconds", "Time a bcrypt operation waited for a thread", HASH_BUCKETS)
+hash_duration = registry.histogram("password_hash_seconds", "Time spent in bcrypt", HASH_BUCKETS)
+hash_rejected = registry.counter("password_hash_rejected_total", "bcrypt operations refused because the queue was full")
+
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+# Only touched from the event loop thread
+_pending = 0
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when PASSWORD_HASH_MAX_PENDING operations are already waiting"""
+
+
+async def _run(op: str, fn, *args):
+    global _pending
+    if _pending >= PASSWORD_HASH_MAX_PENDING:
+        hash_rejected.inc(op=op)
+        raise PasswordHasherBusy("Too many sign-ins in progress. Please try again in a moment.")
+
+    queued_at = time.perf_counter()
+
+    def job():
+        started = time.perf_counter()
+        hash_queue_wait.observe(started - queued_at, op=op)
+        try:
+            return fn(*args)
+        finally:
+            hash_duration.observe(time.perf_counter() - started, op=op)
+
+    _pending += 1
+    hash_pending.set(_pending)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, job)
+    finally:
+        _pending -= 1
+        hash_pending.set(_pending)
+
+
+async def hash_password(password: str) -> str:
+    return await _run("hash", auth_utils.hash_password, password)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run("verify", auth_utils.verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str):
+    """(valid, new hash or None) - see auth_utils.verify_and_update_password"""
+    return await _run("verify", auth_utils.verify_and_update_password, plain_password, hashed_password)
@@ -0,0 +1,119 @@
+"""
+Refresh tokens
+
+Login and register hand out a long-lived opaque refresh token next to the
+30-minute access token. /auth/refresh trades it for a new pair. That costs
+one indexed lookup by token hash, with no bcrypt and no users query.
+
+- Only SHA-256(token) is stored. Tokens are 256 random bits, so a slow
+  password hash buys nothing here.
+- Every refresh rotates: the presented token is revoked and a new one is
+  issued in the same family with a fresh expiry (a sliding session).
+- Presenting a revoked token again means it was copied. The whole family
+  is revoked, which logs out both the thief and the user. One exception:
+  in a session that is still live, a token revoked less than
+  REFRESH_REUSE_GRACE_SECONDS ago gets a new sibling instead, because two
+  tabs refreshing at the same moment look exactly like this.
+- /auth/logout revokes the family.
+
+Settings:
+    REFRESH_TOKEN_TTL_DAYS        idle lifetime of a refresh token (default 30)
+    REFRESH_REUSE_GRACE_SECONDS   see above (default 10)
+"""
+import hashlib
+import os
+import secrets
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import RefreshToken
+
+REFRESH_TOKEN_TTL_DAYS = float(os.getenv("REFRESH_TOKEN_TTL_DAYS", "30"))
+REFRESH_REUSE_GRACE_SECONDS = float(os.getenv("REFRESH_REUSE_GRACE_SECONDS", "10"))
+
+
+class InvalidRefreshToken(Exception):
+    """Unknown, expired or revoked refresh token"""
+
+
+def _utcnow() -> datetime:
+    # Columns are naive UTC (TIMESTAMP WITHOUT TIME ZONE on Postgres)
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def issue_refresh_token(db: AsyncSession, user_id: int, family_id: Optional[str] = None) -> str:
+    """Add a new refresh token to the session (caller commits) and return it"""
+    token = secrets.token_urlsafe(32)
+    now = _utcnow()
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=hash_token(token),
+        family_id=family_id or secrets.token_hex(16),
+        created_at=now,
+        expires_at=now + timedelta(days=REFRESH_TOKEN_TTL_DAYS),
+    ))
+    return token
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Tuple[int, str]:
+    """
+    Revoke a refresh token and issue its successor (caller commits).
+    Returns (user_id, new refresh token); raises InvalidRefreshToken.
+    """
+    now = _utcnow()
+    row = (await db.execute(
+        select(RefreshToken.id, RefreshToken.user_id, RefreshToken.family_id,
+               RefreshToken.expires_at, RefreshToken.revoked_at)
+        .where(RefreshToken.token_hash == hash_token(token))
+    )).first()
+    if row is None or row.expires_at <= now:
+        raise InvalidRefreshToken("Invalid or expired refresh token")
+
+    if row.revoked_at is None:
+        # Conditional update, so of two concurrent refreshes only one wins here
+        result = await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.id == row.id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+        revoked_now = result.rowcount == 1
+    else:
+        revoked_now = False
+
+    if not revoked_now:
+        revoked_at = row.revoked_at or now
+        family_live = (await db.execute(
+            select(RefreshToken.id)
+            .where(RefreshToken.family_id == row.family_id, RefreshToken.revoked_at.is_(None))
+            .limit(1)
+        )).first() is not None
+        # A concurrent refresh of a live session gets a sibling; anything else is reuse
+        if not family_live or (now - revoked_at).total_seconds() > REFRESH_REUSE_GRACE_SECONDS:
+            await revoke_family(db, row.family_id)
+            raise InvalidRefreshToken("Refresh token was already used")
+
+    return row.user_id, issue_refresh_token(db, row.user_id, row.family_id)
+
+
+async def revoke_family(db: AsyncSession, family_id: str) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=_utcnow())
+    )
+
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """Log out: revoke the token's whole family (unknown tokens are ignored)"""
+    family_id = (await db.execute(
+        select(RefreshToken.family_id).where(RefreshToken.token_hash == hash_token(token))
+    )).scalar()
+    if family_id is not None:
+        await revoke_family(db, family_id)
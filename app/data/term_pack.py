@@ -0,0 +1,121 @@
+"""
+Compiled term data pack (terms.pack)
+
+The catalog modules in app/data/terms are compiled by build_term_pack.py into
+one binary file that is read through mmap:
+
+    magic      4 bytes   b"STPK"
+    version    u16
+    reserved   u16
+    count      u32       number of terms
+    header_len u32
+    header     JSON      {"fields", "source_hash", "categories": {name: [ids]}}
+    offsets    (count + 1) x u32, little-endian, relative to the body
+    body       term i is body[offsets[i]:offsets[i + 1]], a compact JSON
+               array of the field values in header["fields"] order
+
+A term's id is its position in the catalog. Terms are decoded only when
+asked for, so iterating the pack never holds a second copy of the catalog.
+"""
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Optional
+
+MAGIC = b"STPK"
+VERSION = 1
+FIELDS = ("category", "term", "difficulty", "formal_definition",
+          "simple_definition", "example", "why_it_matters")
+
+_PREAMBLE = struct.Struct("<4sHHII")
+
+
+class TermPackError(ValueError):
+    pass
+
+
+def write_pack(terms: Iterable[dict], path: str, source_hash: str) -> int:
+    """Compile terms into a pack file (atomically). Returns the term count."""
+    body = bytearray()
+    offsets = [0]
+    categories: Dict[str, List[int]] = {}
+    for term_id, term in enumerate(terms):
+        record = json.dumps([term.get(f) for f in FIELDS], ensure_ascii=False, separators=(",", ":"))
+        body += record.encode("utf-8")
+        offsets.append(len(body))
+        categories.setdefault(term["category"], []).append(term_id)
+
+    count = len(offsets) - 1
+    header = json.dumps({"fields": FIELDS, "source_hash": source_hash, "categories": categories},
+                        separators=(",", ":")).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, 0, count, len(header)))
+        f.write(header)
+        f.write(struct.pack(f"<{count + 1}I", *offsets))
+        f.write(body)
+    os.replace(tmp_path, path)
+    return count
+
+
+class TermPack:
+    """Read-only, mmap-backed view of a pack file"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                # mmap refuses empty files
+                raise TermPackError(f"Unreadable term pack {path}: {e}") from e
+        try:
+            magic, version, _, count, header_len = _PREAMBLE.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise TermPackError(f"{path} is not a version {VERSION} term pack")
+            header = json.loads(self._map[_PREAMBLE.size:_PREAMBLE.size + header_len])
+            self.fields = tuple(header["fields"])
+            self.source_hash = header["source_hash"]
+            self._categories: Dict[str, List[int]] = header["categories"]
+            self._offsets_at = _PREAMBLE.size + header_len
+            self._body_at = self._offsets_at + 4 * (count + 1)
+            # A truncated file would otherwise only fail when its last records are read
+            (body_len,) = struct.unpack_from("<I", self._map, self._offsets_at + 4 * count)
+            if self._body_at + body_len > len(self._map):
+                raise TermPackError(f"{path} is truncated")
+        except (struct.error, ValueError, KeyError, TypeError) as e:
+            self._map.close()
+            if isinstance(e, TermPackError):
+                raise
+            raise TermPackError(f"Unreadable term pack {path}: {e}") from e
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _record(self, term_id: int) -> dict:
+        start, end = struct.unpack_from("<II", self._map, self._offsets_at + 4 * term_id)
+        values = json.loads(self._map[self._body_at + start:self._body_at + end])
+        return dict(zip(self.fields, values))
+
+    def get(self, term_id: int) -> Optional[dict]:
+        if not 0 <= term_id < self.count:
+            return None
+        return self._record(term_id)
+
+    def __iter__(self) -> Iterator[dict]:
+        for term_id in range(self.count):
+            yield self._record(term_id)
+
+    def categories(self) -> List[str]:
+        return list(self._categories)
+
+    def ids_for_category(self, category: str) -> List[int]:
+        return list(self._categories.get(category, []))
+
+    def by_category(self, category: str) -> Iterator[dict]:
+        for term_id in self._categories.get(category, []):
+            yield self._record(term_id)
+
+    def close(self) -> None:
+        self._map.close()
@@ -1,37 +1,96 @@
-from .agile_methodology import agile_methodology
-from .ansible import ansible
-from .api_design import api_design
-from .aws import aws
-from .azure import azure
-from .cdn_caching import cdn_caching
-from .ci_cd import ci_cd
-from .databases import databases
-from .devops import devops
-from .docker_kubernetes import docker_kubernetes
-from .git import git
-from .linux import linux
-from .networking import networking
-from .security import security
-from .swe import swe
-from .system_design import system_design
-from .terraform import terraform
-
-ALL_TERMS = (
-    agile_methodology
-    + ansible
-    + api_design
-    + aws
-    + azure
-    + cdn_caching
-    + ci_cd
-    + databases
-    + devops
-    + docker_kubernetes
-    + git
-    + linux
-    + networking
-    + security
-    + swe
-    + system_design
-    + terraform
+"""
+Catalog terms.
+
+The modules in this package (one per category) are the source of truth. They
+are compiled into terms.pack by build_term_pack.py (done in the Docker build).
+Nothing is loaded on import: iter_terms() streams terms from the pack, and
+ALL_TERMS is built on first access. When the pack is missing or older than the
+modules, both fall back to importing the modules.
+"""
+import hashlib
+import importlib
+import logging
+import os
+from typing import Iterator, List, Optional
+
+from app.data.term_pack import TermPack, TermPackError
+
+logger = logging.getLogger(__name__)
+
+# Concatenated in this order to form ALL_TERMS
+SOURCE_MODULES = (
+    "agile_methodology",
+    "ansible",
+    "api_design",
+    "aws",
+    "azure",
+    "cdn_caching",
+    "ci_cd",
+    "databases",
+    "devops",
+    "docker_kubernetes",
+    "git",
+    "linux",
+    "networking",
+    "security",
+    "swe",
+    "system_design",
+    "terraform",
 )
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+PACK_PATH = os.getenv("TERM_PACK_PATH", os.path.join(PACKAGE_DIR, "terms.pack"))
+
+_pack: Optional[TermPack] = None
+_pack_checked = False
+
+
+def source_hash() -> str:
+    """Fingerprint of the source modules, stored in the pack to detect staleness"""
+    digest = hashlib.sha256()
+    for name in SOURCE_MODULES:
+        with open(os.path.join(PACKAGE_DIR, f"{name}.py"), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def load_from_modules() -> List[dict]:
+    terms = []
+    for name in SOURCE_MODULES:
+        module = importlib.import_module(f"{__name__}.{name}")
+        terms.extend(getattr(module, name))
+    return terms
+
+
+def get_pack() -> Optional[TermPack]:
+    """The compiled pack, or None if it's missing or out of date"""
+    global _pack, _pack_checked
+    if not _pack_checked:
+        _pack_checked = True
+        if os.path.exists(PACK_PATH):
+            try:
+                pack = TermPack(PACK_PATH)
+            except (OSError, TermPackError) as e:
+                logger.warning(f"Ignoring term pack: {e}")
+            else:
+                if pack.source_hash == source_hash():
+                    _pack = pack
+                else:
+                    pack.close()
+                    logger.warning("Term pack is out of date - run `python build_term_pack.py`")
+    return _pack
+
+
+def iter_terms() -> Iterator[dict]:
+    """All catalog terms in ALL_TERMS order, decoded one at a time"""
+    pack = get_pack()
+    return iter(pack) if pack is not None else iter(load_from_modules())
+
+
+def __getattr__(name):
+    # ALL_TERMS is materialized on first use (PEP 562)
+    if name == "ALL_TERMS":
+        terms = list(iter_terms())
+        globals()["ALL_TERMS"] = terms
+        return terms
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,16 +1,77 @@
 """
 Database configuration and session management
+
+Routers use the async engine (asyncpg for Postgres, aiosqlite for SQLite)
+through get_db(). The sync engine and SessionLocal remain for scripts
+(seeding, maintenance jobs) and Alembic.
+
+Pool settings (Postgres only - SQLite keeps SQLAlchemy's defaults):
+    DB_POOL_SIZE       persistent connections per pool (default 5)
+    DB_MAX_OVERFLOW    extra connections allowed under load (default 10)
+    DB_POOL_TIMEOUT    seconds to wait for a free connection (default 30)
+    DB_POOL_RECYCLE    replace connections older than this many seconds (default 1800)
+    DB_POOL_PRE_PING   test connections on checkout, drops stale ones after a DB restart (default true)
+Each worker process has its own pools, so size them against the worker count
+and the server's max_connections.
+
+Read replica (optional):
+    DATABASE_READ_URL         replica connection string; read-only endpoints use it via get_read_db
+    READ_YOUR_WRITES_SECONDS  after a user writes, their reads stay on the primary this long (default 5)
+Without DATABASE_READ_URL every session goes to the primary.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
+import time
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
+from app.services.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
+
 load_dotenv()
 
 # Database URL from environment
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
+
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its asyncio counterpart"""
+    if url.startswith("sqlite+aiosqlite") or url.startswith("postgresql+asyncpg"):
+        return url
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[len("sqlite"):]
+    for prefix in ("postgresql+psycopg2", "postgresql", "postgres"):
+        if url.startswith(prefix + "://"):
+            return "postgresql+asyncpg" + url[len(prefix):]
+    return url
+
+
+# Async URL can be set explicitly, otherwise it's derived from DATABASE_URL
+ASYNC_DATABASE_URL = os.environ.get("ASYNC_DATABASE_URL") or (to_async_url(DATABASE_URL) if DATABASE_URL else None)
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+
+def pool_options() -> dict:
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+# Optional replica for read-only endpoints
+DATABASE_READ_URL = os.environ.get("DATABASE_READ_URL")
+ASYNC_DATABASE_READ_URL = to_async_url(DATABASE_READ_URL) if DATABASE_READ_URL else None
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
 # Only use connect_args for SQLite
 if DATABASE_URL and DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
@@ -18,23 +79,77 @@ if DATABASE_URL and DATABASE_URL.startswith("sqlite"):
         connect_args={"check_same_thread": False}
     )
 else:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **pool_options())
+
+if ASYNC_DATABASE_URL and ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+else:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, **pool_options())
+
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
+
+if not ASYNC_DATABASE_READ_URL:
+    read_engine = None
+elif ASYNC_DATABASE_READ_URL.startswith("sqlite"):
+    read_engine = create_async_engine(ASYNC_DATABASE_READ_URL)
+else:
+    read_engine = create_async_engine(ASYNC_DATABASE_READ_URL, poolclass=InstrumentedAsyncQueuePool, **pool_options())
+if read_engine is not None:
+    instrument_engine(read_engine.sync_engine, "read")
 
 # Create SessionLocal class - each instance is a database session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async sessions for request handlers. expire_on_commit=False so objects can
+# still be read after commit without an implicit (and forbidden) lazy load.
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+ReadSessionLocal = (
+    async_sessionmaker(read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if read_engine is not None else None
+)
+
 # Base class for database models
 Base = declarative_base()
 
 
 # Dependency function to get database session
-def get_db():
+async def get_db():
     """
-    Provides a database session to endpoints
+    Provides an async database session to endpoints
     Automatically closes the session when done
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+# ============================================
+# Read-your-writes stickiness
+# ============================================
+
+# user id -> monotonic time until which their reads go to the primary.
+# Kept per worker process: a read landing on another worker right after a
+# write can still see replica lag.
+_recent_writes: Dict[int, float] = {}
+
+
+def record_write(user_id: int) -> None:
+    """Call after committing a user's write so their next reads see it"""
+    now = time.monotonic()
+    if len(_recent_writes) > 10000:
+        for uid in [uid for uid, until in _recent_writes.items() if until <= now]:
+            del _recent_writes[uid]
+    _recent_writes[user_id] = now + READ_YOUR_WRITES_SECONDS
+
+
+def reads_from_primary(user_id: Optional[int]) -> bool:
+    """True when there is no replica or the user wrote within the sticky window"""
+    if ReadSessionLocal is None:
+        return True
+    until = _recent_writes.get(user_id)
+    return until is not None and until > time.monotonic()
+
+
+def read_session() -> AsyncSession:
+    """New replica session (only valid when DATABASE_READ_URL is set)"""
+    return ReadSessionLocal()
@@ -5,16 +5,19 @@ Cloud-native microservice for learning technical concepts
 import os
 import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from app.database import Base, engine
-from app.routers import terms, quiz, vocabulary, auth
-from seed import seed_terms
+from app.database import async_engine, read_engine
+from app.migrations import verify_schema
+from app.routers import terms, quiz, vocabulary, auth, metrics
+from app.security_headers import SecurityHeadersMiddleware
+from app.services.rate_limit import limiter
+from app.services.cache_bus import TERMS, bus as cache_bus
+from app.services.near_duplicates import reset_term_index
+from app.services.related_terms import reset_related_index
 
 # Setup logging first (must be before other imports)
 from app import logging_config
@@ -25,26 +28,44 @@ logger = logging.getLogger(__name__)
 # Get environment setting
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
-# Create rate limiter (limits requests per IP address)
-limiter = Limiter(key_func=get_remote_address)
+# verify: only check the schema revision (run init_db.py once per deploy first)
+# bootstrap: create/migrate/seed on startup - convenient locally, races with several workers
+STARTUP_MODE = os.getenv("STARTUP_MODE", "verify" if ENVIRONMENT == "production" else "bootstrap")
+if STARTUP_MODE not in ("verify", "bootstrap"):
+    raise ValueError(f"STARTUP_MODE must be 'verify' or 'bootstrap', got {STARTUP_MODE!r}")
+
+# In-process caches that must be dropped when another worker changes terms
+cache_bus.on_invalidate(TERMS, reset_term_index)
+cache_bus.on_invalidate(TERMS, reset_related_index)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: db
-    logger.info("Application starting", extra={"environment": ENVIRONMENT})
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created/verified")
-    
-    # Startup: seed initial terms (safe skip if exists)
-    try:
-        seed_terms()
-        logger.info("Database seeded with initial terms")
-    except Exception as e:
-        logger.warning(f"Seed skipped: {str(e)}")
-    
+    logger.info("Application starting", extra={"environment": ENVIRONMENT, "startup_mode": STARTUP_MODE})
+    if STARTUP_MODE == "verify":
+        revision = await verify_schema(async_engine)
+        logger.info(f"Database schema at head revision {revision}")
+    else:
+        from init_db import init_database
+        from seed import seed_terms
+        init_database(seed=False)
+        logger.info("Database tables created/migrated")
+
+        # Startup: seed catalog terms (only new/changed ones are written)
+        try:
+            stats = seed_terms()
+            logger.info("Catalog terms seeded", extra=stats)
+        except Exception as e:
+            logger.warning(f"Seed skipped: {str(e)}")
+
+    await cache_bus.start(async_engine)
     logger.info("Application startup complete")
     yield
     logger.info("Application shutting down") 
+    await cache_bus.stop()
+    await async_engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
 
 
 
@@ -83,23 +104,15 @@ if ENVIRONMENT == "production":
     allowed_hosts = [frontend_domain] if frontend_domain else ["*"]
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=allowed_hosts)
 
-# Security: Add security headers middleware
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains" if ENVIRONMENT == "production" else ""
-        return response
-
-app.add_middleware(SecurityHeadersMiddleware)
+# Security: Add security headers middleware (HSTS only in production)
+app.add_middleware(SecurityHeadersMiddleware, hsts=ENVIRONMENT == "production")
 
 # Register routers with common prefix
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(terms.router, prefix="/api/v1")
 app.include_router(quiz.router, prefix="/api/v1")
 app.include_router(vocabulary.router, prefix="/api/v1")
+app.include_router(metrics.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -140,11 +153,10 @@ async def readiness_probe():
     try:
         # Check database connection
         from sqlalchemy import text
-        from app.database import SessionLocal
+        from app.database import async_engine
         
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         
         return {
             "status": "ready",
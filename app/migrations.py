@@ -0,0 +1,62 @@
+"""
+Schema revision check for STARTUP_MODE=verify
+
+The API doesn't create tables or run migrations when it serves requests;
+init_db.py does that once per deploy. On startup each worker only checks that
+the database is at the Alembic head revision of the code it's running.
+
+The expected head is read straight from alembic/versions (revision and
+down_revision lines) instead of through Alembic, which costs a few hundred
+milliseconds to import.
+"""
+import os
+import re
+from typing import Set
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+VERSIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic", "versions")
+
+_REVISION = re.compile(r"^revision(?:\s*:\s*[^=]+)?\s*=\s*['\"]([0-9a-f]+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision(?:\s*:\s*[^=]+)?\s*=\s*(.+)$", re.MULTILINE)
+
+
+class SchemaNotReady(RuntimeError):
+    pass
+
+
+def expected_heads(versions_dir: str = VERSIONS_DIR) -> Set[str]:
+    """Revisions no other revision builds on"""
+    revisions, parents = set(), set()
+    for name in os.listdir(versions_dir):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(versions_dir, name)) as f:
+            source = f.read()
+        revision = _REVISION.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down = _DOWN_REVISION.search(source)
+        if down:
+            parents.update(re.findall(r"['\"]([0-9a-f]+)['\"]", down.group(1)))
+    return revisions - parents
+
+
+async def verify_schema(async_engine) -> str:
+    """Raise SchemaNotReady unless the database is at the head revision"""
+    expected = expected_heads()
+    try:
+        async with async_engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars())
+    except DBAPIError:
+        # No alembic_version table: the database was never initialized
+        current = set()
+    if current != expected:
+        raise SchemaNotReady(
+            f"Database is at revision {', '.join(sorted(current)) or 'none'} but the code expects "
+            f"{', '.join(sorted(expected))} - run `python init_db.py` first"
+        )
+    return ", ".join(sorted(current))
@@ -1,5 +1,5 @@
 # Key SQLAlchemy imports you'll need:
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base  # This we already have
@@ -14,6 +14,8 @@ class User(Base):
 
 class VocabularyItem(Base):
     __tablename__ = "vocabulary_items"
+    # Vocabulary list (user_id) and the quiz answer lookup (user_id, term_id)
+    __table_args__ = (Index("ix_vocabulary_items_user_id_term_id", "user_id", "term_id"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -25,6 +27,8 @@ class VocabularyItem(Base):
 
 class Term(Base):
     __tablename__ = "terms"
+    # Quiz draws filter on category and difficulty together
+    __table_args__ = (Index("ix_terms_category_difficulty", "category", "difficulty"),)
     
     id = Column(Integer, primary_key=True, index=True)
     term = Column(String, unique=True, nullable=False, index=True)
@@ -41,6 +45,8 @@ class Term(Base):
     why_it_matters = Column(String, nullable=True)  
     difficulty = Column(Integer, nullable=False, default=1)  
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # SHA-256 of the catalog entry this row was seeded from (see seed.py); NULL for user-suggested terms
+    content_hash = Column(String(64), nullable=True)
 
 class Category(Base):
     __tablename__ = "categories"
@@ -51,8 +57,36 @@ class Category(Base):
 
     # we'll wire up relationships later
 
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+    # Only the SHA-256 of the token is stored (see app/auth/refresh_tokens.py).
+    # Rotating a token revokes it and adds a new row in the same family.
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False, index=True)
+    family_id = Column(String(32), nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+
+class CacheVersion(Base):
+    __tablename__ = "cache_versions"
+    # One row per cache topic ("terms", ...), bumped by every write that should
+    # invalidate in-process caches on other workers (see app/services/cache_bus.py)
+
+    topic = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
 class QuizAttempt(Base):
     __tablename__ = "quiz_attempts"
+    # On Postgres this table is range-partitioned by month on attempted_at
+    # (see partition_quiz_attempts.py) and its primary key is (id, attempted_at).
+    # The ORM uses that identity everywhere, so updates by primary key carry
+    # the partition key. The DDL keeps id as a single-column key, which is what
+    # create_all() emits before the migration and all SQLite can autoincrement.
+    # Per-user history and the latest attempt per (user, term)
+    __table_args__ = (Index("ix_quiz_attempts_user_id_term_id_attempted_at", "user_id", "term_id", "attempted_at"),)
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -61,5 +95,9 @@ class QuizAttempt(Base):
     score = Column(Integer, nullable=False)  # 0-100
     ai_feedback = Column(String, nullable=True)
     correct_answer = Column(String, nullable=True)
-    attempted_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    attempted_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    # Which grading model/prompt produced score and ai_feedback
+    grader_version = Column(String, nullable=True)
+
+    __mapper_args__ = {"primary_key": [id, attempted_at]}
 
@@ -0,0 +1,76 @@
+"""
+Column queries for the read endpoints
+
+Read-only endpoints select just the columns their response needs and get
+plain Row tuples back, with no ORM instances, identity map or attribute
+instrumentation. Columns are labelled with the response schema's field
+names, so a Row validates straight into the schema with from_attributes
+(FastJSON or model_validate), in bulk.
+
+The statements are built here so the query-plan tests check exactly what
+the routers run.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy import Row, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Term, VocabularyItem
+
+# TermResponse
+TERM_COLUMNS = (
+    Term.id, Term.term, Term.formal_definition, Term.simple_definition, Term.example, Term.why_it_matters,
+    Term.category, Term.category_id, Term.difficulty, Term.created_at,
+)
+
+# VocabularyItemResponse
+VOCABULARY_COLUMNS = (
+    VocabularyItem.id, VocabularyItem.term_id, Term.term, Term.formal_definition, Term.simple_definition,
+    Term.example, Term.why_it_matters, Term.category, Term.category_id, Term.difficulty,
+    VocabularyItem.saved_at, VocabularyItem.review_count, VocabularyItem.last_score,
+)
+
+# QuizQuestion
+QUIZ_QUESTION_COLUMNS = (
+    Term.id.label("term_id"), (literal("Explain ") + Term.term).label("term"), Term.category, Term.difficulty,
+)
+
+
+def terms_query(category: Optional[str] = None):
+    query = select(*TERM_COLUMNS)
+    if category:
+        query = query.where(Term.category == category)
+    return query.order_by(Term.term)
+
+
+def term_by_id_query(term_id: int):
+    return select(*TERM_COLUMNS).where(Term.id == term_id)
+
+
+def term_by_name_query(name: str):
+    return select(*TERM_COLUMNS).where(Term.term.ilike(name))
+
+
+def vocabulary_query(user_id: int):
+    return (
+        select(*VOCABULARY_COLUMNS)
+        .join(Term, VocabularyItem.term_id == Term.id)
+        .where(VocabularyItem.user_id == user_id)
+    )
+
+
+def quiz_question_query(category: Optional[str] = None, difficulty: Optional[int] = None):
+    query = select(*QUIZ_QUESTION_COLUMNS)
+    if category:
+        query = query.where(Term.category == category)
+    if difficulty:
+        query = query.where(Term.difficulty == difficulty)
+    return query.order_by(func.random()).limit(1)
+
+
+async def fetch_all(db: AsyncSession, query) -> Sequence[Row]:
+    return (await db.execute(query)).all()
+
+
+async def fetch_one(db: AsyncSession, query) -> Optional[Row]:
+    return (await db.execute(query)).first()
@@ -0,0 +1,33 @@
+"""
+Fast JSON responses for the large read endpoints
+
+When a handler returns pydantic models, FastAPI checks them again against
+response_model, dumps them to Python dicts and then runs json.dumps over the
+result. The handlers that return the most data use a FastJSON adapter
+instead. It validates ORM objects (or row tuples, or dicts) once with
+from_attributes, and pydantic-core writes the JSON bytes in the same call.
+FastAPI passes a returned Response through untouched. The routes keep their
+response_model, so the OpenAPI schema is unchanged.
+"""
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class JSONBytesResponse(Response):
+    """A response whose body is already-encoded JSON"""
+    media_type = "application/json"
+
+
+class FastJSON:
+    """Validates data as `response_type` and renders it straight to JSON bytes"""
+
+    def __init__(self, response_type: Any):
+        self.adapter = TypeAdapter(response_type)
+
+    def dump(self, data: Any) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(data, from_attributes=True))
+
+    def response(self, data: Any, status_code: int = 200) -> JSONBytesResponse:
+        return JSONBytesResponse(self.dump(data), status_code=status_code)
@@ -2,18 +2,19 @@
 Authentication Router - Handles user registration and login
 """
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas import UserLogin, UserRegister
-from app.database import get_db
+from app.schemas import RefreshRequest, UserLogin, UserRegister
+from app.database import get_db, record_write
 from app.models import User
 from app.auth.auth_handler import sign_jwt
-from app.auth.auth_utils import hash_password, verify_password
-
-# Create limiter instance
-limiter = Limiter(key_func=get_remote_address)
+from app.auth.auth_bearer import forget_user
+from app.auth.password_pool import PasswordHasherBusy, hash_password, verify_and_update_password
+from app.auth.refresh_tokens import (
+    InvalidRefreshToken, issue_refresh_token, revoke_refresh_token, rotate_refresh_token
+)
+from app.services.rate_limit import limiter
 
 router = APIRouter(
     prefix="/auth",
@@ -23,43 +24,88 @@ router = APIRouter(
 
 @router.post("/login")
 @limiter.limit("5/minute", error_message="Too many login attempts. Please wait a minute and try again.")
-async def login_user(request: Request, user: UserLogin, db: Session = Depends(get_db)):
+async def login_user(request: Request, user: UserLogin, db: AsyncSession = Depends(get_db)):
     """
     Login user
     """
     # Check if user exists
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    result = await db.execute(select(User).where(User.email == user.email))
+    existing_user = result.scalars().first()
     
     if not existing_user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    # Verify password
-    if not verify_password(user.password, existing_user.hashed_password):
+    # Verify password (bcrypt runs in the password pool, off the event loop)
+    try:
+        valid, new_hash = await verify_and_update_password(user.password, existing_user.hashed_password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    
-    return sign_jwt(str(existing_user.id))
+
+    # Stored with an old BCRYPT_ROUNDS cost - upgrade it while we have the password
+    if new_hash:
+        existing_user.hashed_password = new_hash
+
+    refresh_token = issue_refresh_token(db, existing_user.id)
+    await db.commit()
+    if new_hash:
+        forget_user(existing_user.id)
+    return {**sign_jwt(str(existing_user.id)), "refresh_token": refresh_token}
 
 
 @router.post("/register")
-async def register_user(user: UserRegister, db: Session = Depends(get_db)):
+async def register_user(user: UserRegister, db: AsyncSession = Depends(get_db)):
     """
     Register a new user
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user.email).first()
+    result = await db.execute(select(User).where(User.email == user.email))
+    existing_user = result.scalars().first()
     
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
+    try:
+        hashed_password = await hash_password(user.password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
     # Create the User object id automaticallly generates because it's primary key
     new_user = User(
         email=user.email,
-        hashed_password=hash_password(user.password)
+        hashed_password=hashed_password
     )
 
     # Add to database
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)  # Get the auto-generated id
+    await db.flush()  # Get the auto-generated id
+    refresh_token = issue_refresh_token(db, new_user.id)
+    await db.commit()
+    record_write(new_user.id)
 
     # Return JWT token
-    return sign_jwt(str(new_user.id))
+    return {**sign_jwt(str(new_user.id)), "refresh_token": refresh_token}
+
+
+@router.post("/refresh")
+async def refresh_access_token(body: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Trade a refresh token for a new access token and refresh token
+    (one indexed lookup - no password check, no users query)
+    """
+    try:
+        user_id, refresh_token = await rotate_refresh_token(db, body.refresh_token)
+    except InvalidRefreshToken as e:
+        await db.commit()  # keep a reuse-triggered revocation
+        raise HTTPException(status_code=401, detail=str(e))
+    await db.commit()
+    return {**sign_jwt(str(user_id)), "refresh_token": refresh_token}
+
+
+@router.post("/logout", status_code=204)
+async def logout_user(body: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Revoke the session's refresh tokens (the access token expires on its own)
+    """
+    await revoke_refresh_token(db, body.refresh_token)
+    await db.commit()
@@ -0,0 +1,41 @@
+"""
+Metrics Router - Exposes in-process counters, gauges and histograms
+
+The endpoint is for scrapers, not users: it answers only requests carrying
+METRICS_TOKEN as a bearer token, and does not exist (404) while
+METRICS_TOKEN is unset.
+"""
+import os
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.services.metrics import registry
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Create router instance
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"]
+)
+
+metrics_bearer = HTTPBearer(auto_error=False)
+
+
+def require_metrics_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_bearer)) -> None:
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Invalid metrics token")
+
+
+# Plain def: the AI usage gauges read the shared counter store, so FastAPI runs this in its threadpool
+@router.get("/", dependencies=[Depends(require_metrics_token)])
+def get_metrics():
+    """
+    Snapshot of this worker's metrics (AI calls, tokens, latency, budgets)
+    """
+    return registry.snapshot()
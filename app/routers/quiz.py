@@ -4,25 +4,24 @@ Quiz Router - Handles quiz generation and answer grading
 import logging
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from zoneinfo import ZoneInfo
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 
 from app.schemas import QuizQuestion, QuizAnswerRequest, QuizResult
-from app.database import get_db
-from app.models import Term, QuizAttempt, User
-from app.auth.auth_bearer import get_current_user
-from app.services.ai_client import grade_user_answer
+from app.database import get_db, record_write
+from app.models import Term, QuizAttempt, VocabularyItem
+from app.auth.auth_bearer import Principal, get_current_user, get_read_db
+from app.queries import fetch_one, quiz_question_query
+from app.services.ai_client import grade_user_answer, GRADER_VERSION
+from app.services.ai_usage import AIBudgetExceeded
+from app.services.rate_limit import limiter
 from typing import Optional
 
 # Module logger
 logger = logging.getLogger(__name__)
 
-# Create limiter instance
-limiter = Limiter(key_func=get_remote_address)
-
 # Create router instance
 router = APIRouter(
     prefix="/quiz",
@@ -35,29 +34,19 @@ router = APIRouter(
 async def get_random_quiz(
     category: Optional[str] = None,
     difficulty: Optional[int] = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a random term to quiz on, optionally filtered by category and difficulty
     """
-    query = db.query(Term)
-    if category:
-        query = query.filter(Term.category == category)
-    if difficulty:
-        query = query.filter(Term.difficulty == difficulty)
-    random_term = query.order_by(func.random()).first()
-    if not random_term:
+    question = await fetch_one(db, quiz_question_query(category, difficulty))
+    if not question:
         raise HTTPException(
             status_code=404,
             detail="No terms available in database for the given filters."
         )
-    return QuizQuestion(
-        term_id=random_term.id,
-        term=f"Explain {random_term.term}",
-        category=random_term.category,
-        difficulty=random_term.difficulty
-    )
+    return QuizQuestion.model_validate(question, from_attributes=True)
 
 
 @router.post("/answer", response_model=QuizResult)
@@ -65,14 +54,14 @@ async def get_random_quiz(
 async def submit_answer(
     request: Request,
     answer: QuizAnswerRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Submit quiz answer and get AI grading
     """
     # Get the term from database
-    term = db.query(Term).filter(Term.id == answer.term_id).first()
+    term = await db.get(Term, answer.term_id)
     
     if not term:
         raise HTTPException(
@@ -80,7 +69,13 @@ async def submit_answer(
             detail=f"Term with id {answer.term_id} not found"
         )
     
-    ai_result = grade_user_answer(term.term, term.simple_definition, answer.user_answer)
+    try:
+        # Blocking SDK call - keep it off the event loop
+        ai_result = await run_in_threadpool(
+            grade_user_answer, term.term, term.simple_definition, answer.user_answer, user_id=current_user.id
+        )
+    except AIBudgetExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
     logger.debug(f"AI grader result: {ai_result}")
 
     if not ai_result or "score" not in ai_result or "feedback" not in ai_result:
@@ -98,29 +93,33 @@ async def submit_answer(
         user_answer=answer.user_answer,
         score=score,
         ai_feedback=ai_feedback,
-        correct_answer=term.simple_definition
+        correct_answer=term.simple_definition,
+        grader_version=GRADER_VERSION
     )
     
     db.add(quiz_attempt)
-    db.commit()
+    await db.commit()
+    record_write(current_user.id)
 
     
 
     # Save to vocabulary or update existing
-    from app.models import VocabularyItem
     saved_to_vocabulary = score < 70
     
     # Check if this term is already in user's vocabulary
-    existing_vocab = db.query(VocabularyItem).filter(
-        VocabularyItem.user_id == current_user.id,
-        VocabularyItem.term_id == answer.term_id
-    ).first()
+    result = await db.execute(
+        select(VocabularyItem).where(
+            VocabularyItem.user_id == current_user.id,
+            VocabularyItem.term_id == answer.term_id
+        )
+    )
+    existing_vocab = result.scalars().first()
     
     if existing_vocab:
         # Update existing vocabulary item
         existing_vocab.review_count += 1
         existing_vocab.last_score = score
-        db.commit()
+        await db.commit()
     elif saved_to_vocabulary:
         # Save new term to vocabulary if score is low
         vocab_item = VocabularyItem(
@@ -131,7 +130,7 @@ async def submit_answer(
             last_score=score
         )
         db.add(vocab_item)
-        db.commit()
+        await db.commit()
 
 
     return QuizResult(
@@ -2,19 +2,23 @@
 Terms Router - Handles term explanation/lookup
 """
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Request
-from app.schemas import TermRequest, TermResponse, TermSuggestRequest, TermSuggestResponse
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import Term, User
-from app.auth.auth_bearer import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from app.schemas import TermRequest, TermResponse, TermSuggestRequest, TermSuggestResponse, RelatedTermResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.database import get_db, record_write
+from app.models import Term
+from app.queries import fetch_all, fetch_one, term_by_id_query, term_by_name_query, terms_query
+from app.responses import FastJSON
+from app.auth.auth_bearer import Principal, get_current_user, get_read_db
 from app.services.ai_client import validate_and_generate_term
+from app.services.ai_usage import AIBudgetExceeded
+from app.services.cache_bus import TERMS, bus as cache_bus, publish
+from app.services.rate_limit import limiter
+from app.services.near_duplicates import get_term_index, add_to_term_index, same_term
+from app.services.related_terms import get_related_index, add_to_related_index, RELATED_TOP_K
 from zoneinfo import ZoneInfo
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-
-# Create limiter instance
-limiter = Limiter(key_func=get_remote_address)
 
 # Create router instance
 router = APIRouter(
@@ -22,18 +26,22 @@ router = APIRouter(
     tags=["terms"]
 )
 
+# Serializers for the hot read endpoints (one validation, JSON written by pydantic-core)
+term_json = FastJSON(TermResponse)
+term_list_json = FastJSON(list[TermResponse])
+
 #output validation through TermResponse
 @router.post("/", response_model=TermResponse)
 async def explain_term(
     request: TermRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Explain a technical term
     """
     # Query database for the term
-    term = db.query(Term).filter(Term.term.ilike(request.term)).first()
+    term = await fetch_one(db, term_by_name_query(request.term))
     
     if not term:
         raise HTTPException(
@@ -41,65 +49,34 @@ async def explain_term(
             detail=f"Term '{request.term}' not found in database"
         )
     
-    return TermResponse(
-        id=term.id,
-        term=term.term,
-        formal_definition=term.formal_definition,
-        simple_definition=term.simple_definition,
-        example=term.example,
-        why_it_matters=term.why_it_matters,
-        category=term.category,
-        category_id=term.category_id,
-        difficulty=term.difficulty,
-        created_at=term.created_at,
-    )
+    return term_json.response(term)
 
 
 @router.get("/all", response_model=list[TermResponse])
 async def get_all_terms(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     category: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all terms, optionally filtered by category
     """
-    query = db.query(Term)
-    
-    # Filter by category if provided
-    if category:
-        query = query.filter(Term.category == category)
+    # Get all terms (optionally one category), ordered by term name
+    terms = await fetch_all(db, terms_query(category))
     
-    # Get all terms, ordered by term name
-    terms = query.order_by(Term.term).all()
-    
-    return [
-        TermResponse(
-            id=term.id,
-            term=term.term,
-            formal_definition=term.formal_definition,
-            simple_definition=term.simple_definition,
-            example=term.example,
-            why_it_matters=term.why_it_matters,
-            category=term.category,
-            category_id=term.category_id,
-            difficulty=term.difficulty,
-            created_at=term.created_at,
-        )
-        for term in terms
-    ]
+    return term_list_json.response(terms)
 
 
 @router.get("/{term_id}", response_model=TermResponse)
 async def get_term_by_id(
     term_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get a specific term by ID
     """
-    term = db.query(Term).filter(Term.id == term_id).first()
+    term = await fetch_one(db, term_by_id_query(term_id))
     
     if not term:
         raise HTTPException(
@@ -107,18 +84,32 @@ async def get_term_by_id(
             detail=f"Term with ID {term_id} not found"
         )
     
-    return TermResponse(
-        id=term.id,
-        term=term.term,
-        formal_definition=term.formal_definition,
-        simple_definition=term.simple_definition,
-        example=term.example,
-        why_it_matters=term.why_it_matters,
-        category=term.category,
-        category_id=term.category_id,
-        difficulty=term.difficulty,
-        created_at=term.created_at,
-    )
+    return term_json.response(term)
+
+
+@router.get("/{term_id}/related", response_model=list[RelatedTermResponse])
+async def get_related_terms(
+    term_id: int,
+    limit: int = Query(default=5, ge=1, le=RELATED_TOP_K),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get terms related to a specific term (precomputed TF-IDF neighbors)
+    """
+    related_index = await get_related_index(db)
+
+    if term_id not in related_index:
+        # Term may have been added by another worker since the table was built
+        term = await fetch_one(db, term_by_id_query(term_id))
+        if not term:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Term with ID {term_id} not found"
+            )
+        add_to_related_index(term)
+
+    return related_index.related(term_id, limit)
 
 
 @router.post("/suggest", response_model=TermSuggestResponse)
@@ -126,32 +117,41 @@ async def get_term_by_id(
 async def suggest_new_term(
     request: Request,
     term_request: TermSuggestRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     User suggests a new term. AI validates and generates content if approved.
     Rate limited to 1 suggestion per minute to prevent spam.
     """
-    # Normalize the input term for comparison (lowercase, remove periods, extra spaces)
-    normalized_input = term_request.term.lower().strip().rstrip('.').replace('  ', ' ')
-    
-    # Check for exact duplicates first (case-insensitive, ignoring punctuation)
-    existing_terms = db.query(Term).all()
-    for existing in existing_terms:
-        normalized_existing = existing.term.lower().strip().rstrip('.').replace('  ', ' ')
-        if normalized_input == normalized_existing:
-            return TermSuggestResponse(
-                approved=False,
-                reason=f"This term already exists in our database as '{existing.term}'",
-                term_data=None
-            )
+    # Check for duplicates and near-duplicates first (MinHash/LSH lookup, no table scan)
+    term_index = await get_term_index(db)
+    matches = term_index.query(term_request.term)
+    if matches:
+        existing_name = term_index.text(matches[0][0])
+        reason = (
+            f"This term already exists in our database as '{existing_name}'"
+            if same_term(term_request.term, existing_name)
+            else f"This term is too similar to an existing term: '{existing_name}'"
+        )
+        return TermSuggestResponse(
+            approved=False,
+            reason=reason,
+            term_data=None
+        )
     
     # Get all existing terms for AI validation
-    existing_term_names = [t.term for t in existing_terms]
+    result = await db.execute(select(Term.term))
+    existing_term_names = list(result.scalars().all())
     
     # Use AI to validate and generate content
-    ai_result = validate_and_generate_term(term_request.term, existing_term_names)
+    try:
+        # Blocking SDK call - keep it off the event loop
+        ai_result = await run_in_threadpool(
+            validate_and_generate_term, term_request.term, existing_term_names, user_id=current_user.id
+        )
+    except AIBudgetExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e))
     
     if not ai_result:
         raise HTTPException(
@@ -180,23 +180,18 @@ async def suggest_new_term(
     )
     
     db.add(new_term)
-    db.commit()
-    db.refresh(new_term)
+    # Other workers drop their term caches once this commits
+    version = await publish(db, TERMS)
+    await db.commit()
+    record_write(current_user.id)
+    await db.refresh(new_term)
+    add_to_term_index(new_term.id, new_term.term)
+    add_to_related_index(new_term)
+    cache_bus.applied_locally(TERMS, version)
     
     # Return success with term data
     return TermSuggestResponse(
         approved=True,
         reason=ai_result.get("reason", "Term approved and added!"),
-        term_data=TermResponse(
-            id=new_term.id,
-            term=new_term.term,
-            formal_definition=new_term.formal_definition,
-            simple_definition=new_term.simple_definition,
-            example=new_term.example,
-            why_it_matters=new_term.why_it_matters,
-            category=new_term.category,
-            category_id=new_term.category_id,
-            difficulty=new_term.difficulty,
-            created_at=new_term.created_at
-        )
+        term_data=TermResponse.model_validate(new_term, from_attributes=True)
     )
\ No newline at end of file
@@ -2,12 +2,14 @@
 Vocabulary Router - Handles user's saved terms
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.schemas import VocabularyItemResponse, VocabularyListResponse
-from app.database import get_db
-from app.models import VocabularyItem, Term, User
-from app.auth.auth_bearer import get_current_user
+from app.schemas import VocabularyListResponse
+from app.database import get_db, record_write
+from app.models import VocabularyItem, Term
+from app.auth.auth_bearer import Principal, get_current_user, get_read_db
+from app.queries import fetch_all, vocabulary_query
+from app.responses import FastJSON
 
 # Create router instance
 router = APIRouter(
@@ -15,56 +17,34 @@ router = APIRouter(
     tags=["vocabulary"]
 )
 
+vocabulary_json = FastJSON(VocabularyListResponse)
+
 
 @router.get("/", response_model=VocabularyListResponse)
 async def get_vocabulary(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get all saved vocabulary items for user
     """
-    # Get vocabulary items for current user only
-    vocab_items = db.query(VocabularyItem).filter(
-        VocabularyItem.user_id == current_user.id
-    ).all()
-    
-    # Build response with term details
-    items = []
-    for item in vocab_items:
-        items.append(VocabularyItemResponse(
-            id=item.id,
-            term_id=item.term_id,
-            term=item.term.term,
-            formal_definition=item.term.formal_definition,
-            simple_definition=item.term.simple_definition,
-            example=item.term.example,
-            why_it_matters=item.term.why_it_matters,
-            category=item.term.category,
-            category_id=item.term.category_id,
-            difficulty=item.term.difficulty,
-            saved_at=item.saved_at,
-            review_count=item.review_count,
-            last_score=item.last_score
-        ))
+    # Get vocabulary items for current user only, with their term's columns (one join)
+    items = await fetch_all(db, vocabulary_query(current_user.id))
     
-    return VocabularyListResponse(
-        items=items,
-        total=len(items)
-    )
+    return vocabulary_json.response({"items": items, "total": len(items)})
 
 
 @router.post("/{term_id}")
 async def save_term_to_vocabulary(
     term_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Save a term to user's vocabulary
     """
     # Check if term exists
-    term = db.query(Term).filter(Term.id == term_id).first()
+    term = await db.get(Term, term_id)
     
     if not term:
         raise HTTPException(
@@ -79,6 +59,7 @@ async def save_term_to_vocabulary(
     )
     
     db.add(vocab_item)
-    db.commit()
+    await db.commit()
+    record_write(current_user.id)
     
     return {"message": f"Term '{term.term}' saved to vocabulary", "term_id": term_id}
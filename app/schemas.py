@@ -26,6 +26,12 @@ class Token(BaseModel):
     """JWT token - output"""
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    """Refresh token - input for /auth/refresh and /auth/logout"""
+    refresh_token: str = Field(min_length=1, max_length=128)
 
 
 # ============================================
@@ -56,6 +62,15 @@ class TermResponse(BaseModel):
     created_at: datetime
 
 
+class RelatedTermResponse(BaseModel):
+    """A related term with its similarity score"""
+    id: int
+    term: str
+    category: str
+    difficulty: int
+    score: float
+
+
 class TermSuggestResponse(BaseModel):
     """Response for term suggestion"""
     approved: bool
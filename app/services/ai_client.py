@@ -2,12 +2,43 @@ import os
 import json
 import logging
 from dotenv import load_dotenv
-import google.generativeai as genai
+from typing import Optional
+
+from app.services.ai_usage import track_ai_call
 
 # Module logger
 logger = logging.getLogger(__name__)
 
-def grade_user_answer(term: str, correct_definition: str, user_answer: str):
+# Model and prompt used for grading. Bump GRADER_PROMPT_VERSION whenever the
+# grading prompt changes so regrade_attempts.py can find stale scores.
+GRADER_MODEL = "gemini-2.5-flash"
+GRADER_PROMPT_VERSION = 1
+GRADER_VERSION = f"{GRADER_MODEL}/prompt-v{GRADER_PROMPT_VERSION}"
+
+# The 17 term categories (one per module in app/data/terms)
+CATEGORIES = [
+    "devops", "docker-kubernetes", "ci-cd", "terraform", "ansible", 
+    "aws", "azure", "networking", "security", "databases", 
+    "system-design", "api-design", "git", "linux", 
+    "cdn-caching", "agile-methodology", "swe"
+]
+
+
+def _generative_model(api_key: str, model_name: str):
+    """
+    Configure the Gemini SDK and return a model.
+
+    The SDK (with grpc and protobuf) is imported here rather than at module
+    load: it takes longer to import than the rest of the app, and most worker
+    processes and test runs never make an AI call.
+    """
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name)
+
+def grade_user_answer(term: str, correct_definition: str, user_answer: str,
+                      user_id: Optional[int] = None, endpoint: str = "quiz.answer"):
     """
     Uses the Gemini API to grade a user's answer for a technical term.
 
@@ -15,9 +46,14 @@ def grade_user_answer(term: str, correct_definition: str, user_answer: str):
         term: The technical term being quizzed.
         correct_definition: The ideal answer/definition.
         user_answer: The user's submitted answer.
+        user_id: The user the call is made for (counts against their daily budget).
+        endpoint: Label for the calling endpoint in AI metrics.
 
     Returns:
         A dictionary containing the 'score' and 'feedback', or None on error.
+
+    Raises:
+        AIBudgetExceeded: if a daily AI budget is already used up.
     """
     load_dotenv()
     api_key = os.getenv("GEMINI_API_KEY")
@@ -25,8 +61,7 @@ def grade_user_answer(term: str, correct_definition: str, user_answer: str):
         logger.error("GEMINI_API_KEY not found in environment variables.")
         return None
 
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("gemini-2.5-flash")
+    model = _generative_model(api_key, GRADER_MODEL)
 
     prompt = f"""
     You are an expert AI assistant for software, devops, cloud, cybersecurity, system, and network engineers. Your task is to evaluate a user's explanation of a technical term and provide a score and constructive feedback.
@@ -49,27 +84,34 @@ def grade_user_answer(term: str, correct_definition: str, user_answer: str):
     **IMPORTANT: Your entire response must be only the raw JSON object, with no extra text or formatting.**
     """
 
-    try:
-        response = model.generate_content(prompt)
-        cleaned_response = response.text.strip().replace('```json', '').replace('```', '')
-        result = json.loads(cleaned_response)
-        if "score" in result and "feedback" in result:
-            return result
-        else:
-            logger.error("AI response did not contain 'score' or 'feedback'.")
+    with track_ai_call(endpoint, user_id) as call:
+        try:
+            response = model.generate_content(prompt)
+            call.record_usage(response)
+            cleaned_response = response.text.strip().replace('```json', '').replace('```', '')
+            result = json.loads(cleaned_response)
+            if "score" in result and "feedback" in result:
+                call.outcome = "success"
+                return result
+            else:
+                call.outcome = "invalid_response"
+                logger.error("AI response did not contain 'score' or 'feedback'.")
+                return None
+        except Exception as e:
+            logger.exception("An error occurred while calling the API or parsing the response")
             return None
-    except Exception as e:
-        logger.exception("An error occurred while calling the API or parsing the response")
-        return None
 
 
-def validate_and_generate_term(term: str, existing_terms: list):
+def validate_and_generate_term(term: str, existing_terms: list,
+                               user_id: Optional[int] = None, endpoint: str = "terms.suggest"):
     """
     Uses Gemini API to validate a user-suggested term and generate its content.
     
     Args:
         term: The term suggested by the user
         existing_terms: List of terms already in the database
+        user_id: The user the call is made for (counts against their daily budget)
+        endpoint: Label for the calling endpoint in AI metrics
         
     Returns:
         Dictionary with validation result and generated content, or None on error
@@ -83,6 +125,9 @@ def validate_and_generate_term(term: str, existing_terms: list):
             "why_it_matters": str,
             "difficulty": int  # 1-5
         }
+
+    Raises:
+        AIBudgetExceeded: if a daily AI budget is already used up
     """
     load_dotenv()
     api_key = os.getenv("GEMINI_API_KEY")
@@ -90,15 +135,7 @@ def validate_and_generate_term(term: str, existing_terms: list):
         logger.error("GEMINI_API_KEY not found in environment variables.")
         return None
 
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("gemini-2.5-flash")
-
-    categories = [
-        "devops", "docker-kubernetes", "ci-cd", "terraform", "ansible", 
-        "aws", "azure", "networking", "security", "databases", 
-        "system-design", "api-design", "git", "linux", 
-        "cdn-caching", "agile-methodology", "swe"
-    ]
+    model = _generative_model(api_key, "gemini-2.5-flash")
 
     prompt = f"""
     You are an expert technical term curator for a software engineering, DevOps, cloud, and cybersecurity learning platform.
@@ -110,7 +147,7 @@ def validate_and_generate_term(term: str, existing_terms: list):
     {', '.join(existing_terms[:50])}... (showing first 50)
 
     **Available Categories:**
-    {', '.join(categories)}
+    {', '.join(CATEGORIES)}
 
     **Your Task:**
     1. Check if this term already exists in the database (STRICT fuzzy match - consider synonyms, abbreviations, similar meanings, etc.)
@@ -147,18 +184,101 @@ def validate_and_generate_term(term: str, existing_terms: list):
     If rejected, only include "approved", "reason", and set others to null.
     """
 
-    try:
-        response = model.generate_content(prompt)
-        cleaned_response = response.text.strip().replace('```json', '').replace('```', '')
-        result = json.loads(cleaned_response)
-        
-        required_keys = ["approved", "reason"]
-        if not all(key in result for key in required_keys):
-            logger.error("AI response missing required keys")
-            return None
+    with track_ai_call(endpoint, user_id) as call:
+        try:
+            response = model.generate_content(prompt)
+            call.record_usage(response)
+            cleaned_response = response.text.strip().replace('```json', '').replace('```', '')
+            result = json.loads(cleaned_response)
             
-        return result
-    except Exception as e:
-        logger.exception("An error occurred while validating term")
+            required_keys = ["approved", "reason"]
+            if not all(key in result for key in required_keys):
+                call.outcome = "invalid_response"
+                logger.error("AI response missing required keys")
+                return None
+                
+            call.outcome = "success"
+            return result
+        except Exception as e:
+            logger.exception("An error occurred while validating term")
+            return None
+
+
+def generate_term_content(question: str, category_hint: Optional[str] = None,
+                          endpoint: str = "pipeline.generate_terms"):
+    """
+    Uses Gemini API to turn a raw interview question into a catalog term entry.
+
+    Args:
+        question: The interview question (used as the term name)
+        category_hint: Category suggested by the question's section, if any
+        endpoint: Label for the calling endpoint in AI metrics
+
+    Returns:
+        Dictionary shaped like the entries in app/data/terms, plus "approved"
+        and "reason", or None on error
+
+    Raises:
+        AIBudgetExceeded: if the global daily AI budget is already used up
+    """
+    load_dotenv()
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        logger.error("GEMINI_API_KEY not found in environment variables.")
         return None
-        
\ No newline at end of file
+
+    model = _generative_model(api_key, "gemini-2.5-flash")
+
+    hint = f"The question comes from the '{category_hint}' section." if category_hint else ""
+
+    prompt = f"""
+    You are an expert technical term curator for a software engineering, DevOps, cloud, and cybersecurity learning platform.
+
+    **Interview Question:**
+    {question}
+
+    **Available Categories:**
+    {', '.join(CATEGORIES)}
+    {hint}
+
+    **Your Task:**
+    1. Decide if the question asks about a technical concept that can be explained in a short answer
+       (reject open-ended scenarios, coding exercises and questions outside the available categories)
+    2. If approved, write study content that answers the question
+
+    **IMPORTANT: Return ONLY valid JSON with this exact structure:**
+    {{
+        "approved": true/false,
+        "reason": "Brief explanation of approval/rejection",
+        "category": "one of the categories listed above (only if approved)",
+        "formal_definition": "Academic/formal definition (only if approved)",
+        "simple_definition": "Simple 1-sentence explanation (only if approved)",
+        "example": "Real-world example or use case (only if approved)",
+        "why_it_matters": "Why engineers should know this (only if approved)",
+        "difficulty": 1-5 integer (only if approved, 1=beginner, 5=expert)
+    }}
+
+    If rejected, only include "approved", "reason", and set others to null.
+    """
+
+    with track_ai_call(endpoint) as call:
+        try:
+            response = model.generate_content(prompt)
+            call.record_usage(response)
+            cleaned_response = response.text.strip().replace('```json', '').replace('```', '')
+            result = json.loads(cleaned_response)
+
+            if "approved" not in result:
+                call.outcome = "invalid_response"
+                logger.error("AI response missing required keys")
+                return None
+            if result["approved"] and result.get("category") not in CATEGORIES:
+                call.outcome = "invalid_response"
+                logger.error(f"AI returned unknown category: {result.get('category')}")
+                return None
+
+            call.outcome = "success"
+            return result
+        except Exception as e:
+            logger.exception("An error occurred while generating term content")
+            return None
@@ -0,0 +1,210 @@
+"""
+AI call accounting: per-call metrics and daily budgets
+
+Every Gemini call goes through track_ai_call(), which records token counts
+(from the SDK's usage_metadata), wall time and outcome per endpoint.
+
+Budgets are enforced before the provider is called: track_ai_call() first
+reserves one call and AI_TOKEN_RESERVATION tokens against today's totals
+and refuses the call if the user or the whole service was already over
+budget. When the call finishes the reservation is settled to the tokens
+actually used. The totals live in a shared counter store (same backends as
+rate limiting), so every gunicorn worker and script draws on one budget
+and a worker restart does not reset it.
+
+Settings (budgets: 0 = unlimited):
+    AI_USER_DAILY_TOKEN_BUDGET, AI_USER_DAILY_CALL_BUDGET
+    AI_GLOBAL_DAILY_TOKEN_BUDGET, AI_GLOBAL_DAILY_CALL_BUDGET
+    AI_TOKEN_RESERVATION   tokens held per call until it finishes (default 2000)
+    AI_USAGE_STORAGE       counter store (default RATE_LIMIT_STORAGE, else memory://)
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from limits.storage import storage_from_string
+
+from app.services.metrics import registry
+# Registers the sqlite:// and resp:// storage schemes with `limits`
+from app.services import rate_limit_storage  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+USER_DAILY_TOKEN_BUDGET = int(os.getenv("AI_USER_DAILY_TOKEN_BUDGET", "0"))
+USER_DAILY_CALL_BUDGET = int(os.getenv("AI_USER_DAILY_CALL_BUDGET", "0"))
+GLOBAL_DAILY_TOKEN_BUDGET = int(os.getenv("AI_GLOBAL_DAILY_TOKEN_BUDGET", "0"))
+GLOBAL_DAILY_CALL_BUDGET = int(os.getenv("AI_GLOBAL_DAILY_CALL_BUDGET", "0"))
+TOKEN_RESERVATION = int(os.getenv("AI_TOKEN_RESERVATION", "2000"))
+AI_USAGE_STORAGE = os.getenv("AI_USAGE_STORAGE", os.getenv("RATE_LIMIT_STORAGE", "memory://"))
+
+# Counters outlive their UTC day by a day, then expire
+_COUNTER_TTL = 2 * 24 * 3600
+
+AI_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0, 60.0)
+
+ai_calls = registry.counter("ai_calls_total", "AI calls by endpoint and outcome")
+ai_tokens = registry.counter("ai_tokens_total", "AI tokens by endpoint and kind (prompt/response)")
+ai_latency = registry.histogram("ai_call_duration_seconds", "AI call wall time by endpoint", AI_LATENCY_BUCKETS)
+ai_budget_rejections = registry.counter("ai_budget_rejections_total", "AI calls refused by a daily budget")
+ai_usage_store_errors = registry.counter("ai_usage_store_errors_total", "AI budget checks skipped because the counter store failed")
+
+
+class AIBudgetExceeded(Exception):
+    """Raised before an AI call when a daily budget is used up"""
+
+    def __init__(self, scope: str, message: str):
+        super().__init__(message)
+        self.scope = scope
+
+
+# (token budget, call budget) per scope, read at call time so tests can patch them
+def _budgets() -> Dict[str, Tuple[int, int]]:
+    return {"global": (GLOBAL_DAILY_TOKEN_BUDGET, GLOBAL_DAILY_CALL_BUDGET),
+            "user": (USER_DAILY_TOKEN_BUDGET, USER_DAILY_CALL_BUDGET)}
+
+
+_BUDGET_MESSAGES = {
+    "global": "The AI service has reached its daily limit. Please try again tomorrow.",
+    "user": "You have reached your daily AI limit. Please come back tomorrow.",
+}
+
+
+class _DailyUsage:
+    """Token and call totals for the current UTC day, globally and per user, in a shared store"""
+
+    def __init__(self, uri: str):
+        self.storage = storage_from_string(uri)
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).date().isoformat()
+
+    @staticmethod
+    def _scopes(user_id: Optional[int]) -> List[str]:
+        return ["global"] if user_id is None else ["global", f"user:{user_id}"]
+
+    def _incr(self, day: str, scope: str, kind: str, amount: int) -> int:
+        return self.storage.incr(f"ai_usage/{day}/{scope}/{kind}", _COUNTER_TTL, amount)
+
+    def _usage(self, scope: str) -> Dict[str, int]:
+        day = self._today()
+        return {kind: self.storage.get(f"ai_usage/{day}/{scope}/{kind}") for kind in ("tokens", "calls")}
+
+    def reserve(self, user_id: Optional[int], tokens: int) -> str:
+        """
+        Count a call and hold `tokens` for it, or raise AIBudgetExceeded.
+        Returns the day the reservation was booked on, for settle().
+
+        Each increment is atomic in the store, so concurrent callers see each
+        other's reservations and cannot all slip under the limit together.
+        """
+        day = self._today()
+        budgets = _budgets()
+        reserved = []
+        for scope in self._scopes(user_id):
+            kind = "global" if scope == "global" else "user"
+            token_budget, call_budget = budgets[kind]
+            used_calls = self._incr(day, scope, "calls", 1)
+            used_tokens = self._incr(day, scope, "tokens", tokens)
+            reserved.append(scope)
+            # Compare what was used before this call: the call itself may run over
+            if (call_budget and used_calls - 1 >= call_budget) or (token_budget and used_tokens - tokens >= token_budget):
+                for done in reserved:
+                    self._incr(day, done, "calls", -1)
+                    self._incr(day, done, "tokens", -tokens)
+                ai_budget_rejections.inc(scope=kind)
+                raise AIBudgetExceeded(kind, _BUDGET_MESSAGES[kind])
+        return day
+
+    def settle(self, day: str, user_id: Optional[int], reserved_tokens: int, used_tokens: int) -> None:
+        """Replace a call's reservation with the tokens it actually used"""
+        if used_tokens != reserved_tokens:
+            for scope in self._scopes(user_id):
+                self._incr(day, scope, "tokens", used_tokens - reserved_tokens)
+
+    def user(self, user_id: int) -> Dict[str, int]:
+        return self._usage(f"user:{user_id}")
+
+    def global_usage(self) -> Dict[str, int]:
+        return self._usage("global")
+
+    def global_tokens(self) -> int:
+        return self.global_usage()["tokens"]
+
+    def global_calls(self) -> int:
+        return self.global_usage()["calls"]
+
+
+_usage = _DailyUsage(AI_USAGE_STORAGE)
+registry.gauge("ai_tokens_today", "Tokens used or reserved today (UTC), all workers", callback=lambda: _usage.global_tokens())
+registry.gauge("ai_calls_today", "AI calls made today (UTC), all workers", callback=lambda: _usage.global_calls())
+
+
+class AICall:
+    """Mutable record filled in by the caller inside track_ai_call()"""
+
+    def __init__(self, endpoint: str, user_id: Optional[int]):
+        self.endpoint = endpoint
+        self.user_id = user_id
+        self.outcome = "error"
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+
+    def record_usage(self, response) -> None:
+        """Pull token counts from a generate_content() response"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        self.prompt_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        self.response_tokens = getattr(usage, "candidates_token_count", 0) or 0
+
+
+@contextmanager
+def track_ai_call(endpoint: str, user_id: Optional[int] = None):
+    """
+    Reserve budget for an AI call, then time it and record its outcome and
+    token usage on exit.
+
+    Raises AIBudgetExceeded before the body runs if a daily budget is used
+    up. The outcome stays "error" unless the caller sets it.
+    """
+    reserved = TOKEN_RESERVATION
+    try:
+        day = _usage.reserve(user_id, reserved)
+    except AIBudgetExceeded:
+        raise
+    except Exception:
+        # An unreachable counter store must not take the AI features down with it
+        logger.exception("AI usage store unavailable; call not counted against the budget")
+        ai_usage_store_errors.inc()
+        day = None
+
+    call = AICall(endpoint, user_id)
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        duration = time.perf_counter() - start
+        ai_calls.inc(endpoint=endpoint, outcome=call.outcome)
+        ai_latency.observe(duration, endpoint=endpoint)
+        ai_tokens.inc(call.prompt_tokens, endpoint=endpoint, kind="prompt")
+        ai_tokens.inc(call.response_tokens, endpoint=endpoint, kind="response")
+        if day is not None:
+            try:
+                _usage.settle(day, user_id, reserved, call.prompt_tokens + call.response_tokens)
+            except Exception:
+                logger.exception("AI usage store unavailable; token usage not recorded")
+                ai_usage_store_errors.inc()
+        logger.info(
+            "AI call finished",
+            extra={
+                "endpoint": endpoint,
+                "outcome": call.outcome,
+                "duration_ms": round(duration * 1000, 1),
+                "prompt_tokens": call.prompt_tokens,
+                "response_tokens": call.response_tokens,
+            },
+        )
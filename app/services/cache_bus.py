@@ -0,0 +1,220 @@
+"""
+Cross-worker cache invalidation
+
+In-process caches (the related-terms table, the near-duplicate index) live in
+each worker. When one worker or a script writes terms, every other worker has
+to drop its copy.
+
+Writers call publish(db, topic) inside the write transaction. It bumps the
+topic's row in cache_versions and, on Postgres, sends
+NOTIFY cache_invalidation '<topic>:<version>'. Both take effect on commit.
+Each worker runs one CacheBus (started in the app lifespan) that watches for
+new versions in one of two ways:
+
+    listen  a dedicated asyncpg connection LISTENs on the channel (Postgres)
+    poll    re-reads cache_versions every CACHE_POLL_SECONDS (SQLite, tests,
+            or Postgres behind a transaction-pooling pgbouncer)
+
+Handlers registered with on_invalidate() run once for each newer version.
+After every (re)connect the listener re-reads the table, so notifications
+sent while it was disconnected are not lost.
+
+Settings:
+    CACHE_BUS           auto (listen on Postgres, else poll) | listen | poll | off
+    CACHE_POLL_SECONDS  polling interval (default 2)
+"""
+import asyncio
+import logging
+import os
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import insert, select, text, update
+
+from app.models import CacheVersion
+from app.services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+CACHE_BUS = os.getenv("CACHE_BUS", "auto")
+CACHE_POLL_SECONDS = float(os.getenv("CACHE_POLL_SECONDS", "2"))
+if CACHE_BUS not in ("auto", "listen", "poll", "off"):
+    raise ValueError(f"CACHE_BUS must be auto, listen, poll or off, got {CACHE_BUS!r}")
+
+CHANNEL = "cache_invalidation"
+# How often the listener checks that its connection is still alive
+LISTEN_KEEPALIVE_SECONDS = 30
+RECONNECT_DELAY_SECONDS = 5
+
+# Topics. Add one only together with a writer that publishes it and a cache
+# that subscribes to it.
+TERMS = "terms"
+
+invalidations = registry.counter("cache_invalidations_total", "Newer cache versions seen by this worker")
+
+
+def _bump_statement(topic: str):
+    return (
+        update(CacheVersion)
+        .where(CacheVersion.topic == topic)
+        .values(version=CacheVersion.version + 1)
+        .returning(CacheVersion.version)
+    )
+
+
+def _notify_statement(topic: str, version: int):
+    return text("SELECT pg_notify(:channel, :payload)").bindparams(channel=CHANNEL, payload=f"{topic}:{version}")
+
+
+async def publish(db, topic: str) -> int:
+    """
+    Bump a topic's version in the current transaction (async session).
+    Other workers see it once the caller commits. Returns the new version.
+    """
+    version = (await db.execute(_bump_statement(topic))).scalar()
+    if version is None:
+        version = 1
+        await db.execute(insert(CacheVersion).values(topic=topic, version=version))
+    if (await db.connection()).dialect.name == "postgresql":
+        await db.execute(_notify_statement(topic, version))
+    return version
+
+
+def publish_sync(db, topic: str) -> int:
+    """publish() for sync sessions (scripts)"""
+    version = db.execute(_bump_statement(topic)).scalar()
+    if version is None:
+        version = 1
+        db.execute(insert(CacheVersion).values(topic=topic, version=version))
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(_notify_statement(topic, version))
+    return version
+
+
+class CacheBus:
+    """Per-worker subscriber that runs invalidation handlers for newer versions"""
+
+    def __init__(self, mode: str = CACHE_BUS, poll_seconds: float = CACHE_POLL_SECONDS):
+        self.engine = None
+        self.mode = mode
+        self.poll_seconds = poll_seconds
+        self.versions: Dict[str, int] = {}
+        self._handlers: Dict[str, List[Callable[[], None]]] = defaultdict(list)
+        self._task: Optional[asyncio.Task] = None
+        # Set by remember_versions(): caches exist before start()
+        self._preloaded = False
+
+    def on_invalidate(self, topic: str, handler: Callable[[], None]) -> None:
+        self._handlers[topic].append(handler)
+
+    def apply(self, topic: str, version: int) -> bool:
+        """Record a version; runs the topic's handlers if it is newer than the last one seen"""
+        if version <= self.versions.get(topic, 0):
+            return False
+        self.versions[topic] = version
+        invalidations.inc(topic=topic)
+        for handler in self._handlers.get(topic, []):
+            try:
+                handler()
+            except Exception:
+                logger.exception(f"Cache invalidation handler failed for {topic}")
+        return True
+
+    def applied_locally(self, topic: str, version: int) -> None:
+        """
+        Called by a writer that already updated its own caches after publishing.
+        Skips the eviction its own notification would cause, unless another
+        write landed in between.
+        """
+        if version == self.versions.get(topic, 0) + 1:
+            self.versions[topic] = version
+
+    async def read_versions(self) -> Dict[str, int]:
+        async with self.engine.connect() as conn:
+            rows = await conn.execute(select(CacheVersion.topic, CacheVersion.version))
+            return {topic: version for topic, version in rows}
+
+    async def poll_once(self) -> None:
+        for topic, version in (await self.read_versions()).items():
+            self.apply(topic, version)
+
+    async def remember_versions(self, engine) -> None:
+        """
+        Record the current versions before building caches outside a running
+        worker (the gunicorn master preloads them before forking). start()
+        then evicts whatever changed in between.
+        """
+        self.engine = engine
+        self.versions = await self.read_versions()
+        self._preloaded = True
+
+    async def start(self, engine) -> None:
+        """Start watching the database behind an async engine"""
+        if self.mode == "off":
+            return
+        if self.mode == "auto":
+            self.mode = "listen" if engine.dialect.name == "postgresql" else "poll"
+        self.engine = engine
+        current = await self.read_versions()
+        if self._preloaded:
+            # Caches were preloaded: drop any that went stale before this worker started
+            for topic, version in current.items():
+                self.apply(topic, version)
+        else:
+            # Caches are built after this point, so current versions need no eviction
+            self.versions = current
+        loop = self._listen_loop if self.mode == "listen" else self._poll_loop
+        self._task = asyncio.create_task(loop())
+        logger.info(f"Cache invalidation bus started ({self.mode})")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.warning(f"Cache version poll failed: {e}")
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        topic, _, version = payload.rpartition(":")
+        try:
+            self.apply(topic, int(version))
+        except ValueError:
+            logger.warning(f"Ignoring malformed cache notification {payload!r}")
+
+    async def _listen_loop(self) -> None:
+        import asyncpg
+
+        dsn = self.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn)
+                await conn.add_listener(CHANNEL, self._on_notify)
+                # Catch up on anything published while we were not listening
+                await self.poll_once()
+                while True:
+                    await asyncio.sleep(LISTEN_KEEPALIVE_SECONDS)
+                    await conn.fetchval("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener lost its connection: {e}")
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            finally:
+                if conn is not None and not conn.is_closed():
+                    conn.terminate()
+
+
+# The worker's bus; main.py registers the cache handlers and starts it
+bus = CacheBus()
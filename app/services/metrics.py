@@ -0,0 +1,158 @@
+"""
+In-process metrics registry (counters, gauges, histograms)
+
+Metrics live in memory per worker process and are published as JSON on
+the /metrics endpoint. Labels are passed as keyword arguments.
+"""
+import bisect
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+# Seconds - covers fast DB work up to slow AI calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels: dict) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    """Monotonically increasing value per label set"""
+
+    type = "counter"
+
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [{"labels": dict(k), "value": v} for k, v in self._values.items()]
+
+
+class Gauge:
+    """Point-in-time value; can be set directly or computed on read"""
+
+    type = "gauge"
+
+    def __init__(self, name: str, description: str, callback: Optional[Callable[[], float]] = None):
+        self.name = name
+        self.description = description
+        self.callback = callback
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def snapshot(self) -> list:
+        if self.callback is not None:
+            return [{"labels": {}, "value": self.callback()}]
+        with self._lock:
+            return [{"labels": dict(k), "value": v} for k, v in self._values.items()]
+
+
+class Histogram:
+    """Bucketed distribution (cumulative bucket counts, like Prometheus)"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, description: str, buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"count": 0, "sum": 0.0, "counts": [0] * (len(self.buckets) + 1)}
+                self._series[key] = series
+            series["count"] += 1
+            series["sum"] += value
+            series["counts"][index] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(_label_key(labels))
+        return series["count"] if series else 0
+
+    def snapshot(self) -> list:
+        with self._lock:
+            result = []
+            for key, series in self._series.items():
+                cumulative, buckets = 0, {}
+                for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                    cumulative += count
+                    buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+                result.append({
+                    "labels": dict(key),
+                    "count": series["count"],
+                    "sum": round(series["sum"], 6),
+                    "buckets": buckets,
+                })
+            return result
+
+
+class MetricsRegistry:
+    """Get-or-create access to named metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' already registered as {metric.type}")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "", callback: Optional[Callable[[], float]] = None) -> Gauge:
+        return self._get_or_create(Gauge, name, description, callback=callback)
+
+    def histogram(self, name: str, description: str = "", buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, description, buckets=buckets)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            m.name: {"type": m.type, "description": m.description, "values": m.snapshot()}
+            for m in metrics
+        }
+
+
+# Shared registry for the whole process
+registry = MetricsRegistry()
@@ -0,0 +1,364 @@
+"""
+Near-duplicate detection for term names using MinHash signatures and LSH banding.
+
+Term names are normalized (lowercased, question phrasing such as "what is"
+removed, comparisons written as "X vs Y"), broken into word bigrams that
+keep word order, and summarized as a fixed-length MinHash signature.
+Signatures are split into bands; two terms become candidates when any band
+matches exactly, so a lookup only touches a handful of buckets instead of
+comparing against every term in the catalog.
+"""
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Signature layout: 64 hashes split into 16 bands of 4 rows. Pairs with a
+# Jaccard similarity around 0.5 or higher almost always share a band.
+NUM_PERM = 64
+NUM_BANDS = 16
+HASH_SEED = 1337
+# Estimated similarity a candidate must reach to be reported as a duplicate
+SIMILARITY_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.7"))
+
+# Where the API keeps its persisted index (signatures per term id)
+TERM_INDEX_PATH = os.getenv("TERM_INDEX_PATH", "app/data/term_index.json")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Bump when shingling changes, so persisted signatures are rebuilt
+SHINGLE_VERSION = 2
+
+# Words that only phrase the question and say nothing about the concept
+STOPWORDS = frozenset({
+    "a", "an", "are", "between", "compare", "comparison", "define", "describe",
+    "difference", "differences", "do", "does", "explain", "how", "is", "the",
+    "what", "whats", "which", "why",
+})
+# "Difference between X and Y" / "Compare X with Y" is the same term as "X vs Y"
+_COMPARISON_CUES = frozenset({"between", "compare", "comparison", "difference", "differences"})
+_VERSUS = frozenset({"vs", "versus"})
+_COMPARISON_JOINERS = frozenset({"and", "with"})
+
+_NON_WORD = re.compile(r"[^A-Za-z0-9+#]+")
+
+
+def _singular(word: str) -> str:
+    """Crude plural stripping that leaves acronyms (HTTPS, DNS) and short words alone"""
+    if word.endswith("s") and word[:-1].isupper():
+        return word[:-1].lower()  # APIs, VMs
+    lowered = word.lower()
+    if word.isupper() or len(lowered) <= 4 or not lowered.endswith("s") or lowered.endswith("ss"):
+        return lowered
+    return lowered[:-1]
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase, strip question phrasing and crude plurals; comparisons become vs"""
+    words = _NON_WORD.sub(" ", text.replace("’", "'").replace("'", "")).split()
+    lowered = [w.lower() for w in words]
+    comparison = any(w in _COMPARISON_CUES for w in lowered)
+    tokens = []
+    for word, low in zip(words, lowered):
+        if low in _VERSUS or (comparison and low in _COMPARISON_JOINERS):
+            tokens.append("vs")
+        elif low not in STOPWORDS:
+            tokens.append(_singular(word))
+    if not tokens:
+        # Term made only of filler words - compare it on what it has
+        tokens = lowered
+    return tokens
+
+
+def shingles(text: str) -> set:
+    """Word bigrams of the normalized name, with start/end markers (word order matters)"""
+    tokens = ["^", *normalize_tokens(text), "$"]
+    return {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def same_term(a: str, b: str) -> bool:
+    """True when two names normalize to the same words (an exact duplicate)"""
+    return normalize_tokens(a) == normalize_tokens(b)
+
+
+def _permutations(num_perm: int, seed: int) -> List[Tuple[int, int]]:
+    rng = random.Random(seed)
+    return [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+
+
+class NearDuplicateIndex:
+    """
+    In-memory MinHash/LSH index over term names.
+
+    Keys are whatever identifies a term to the caller (a database id,
+    or a label for catalog entries in offline reports).
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = NUM_BANDS,
+                 threshold: float = SIMILARITY_THRESHOLD, seed: int = HASH_SEED,
+                 shingle_version: int = SHINGLE_VERSION):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.seed = seed
+        self.shingle_version = shingle_version
+        self._perms = _permutations(num_perm, seed)
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+        self._texts: Dict[Hashable, str] = {}
+        self._buckets: List[Dict[Tuple[int, ...], set]] = [dict() for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def keys(self):
+        return self._signatures.keys()
+
+    def text(self, key: Hashable) -> Optional[str]:
+        return self._texts.get(key)
+
+    def stored_signature(self, key: Hashable) -> Optional[Tuple[int, ...]]:
+        return self._signatures.get(key)
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash signature of a term name"""
+        hashes = [zlib.crc32(g.encode("utf-8")) for g in shingles(text)]
+        if not hashes:
+            return tuple([_MAX_HASH] * self.num_perm)
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH
+            for a, b in self._perms
+        )
+
+    def _bands_of(self, signature: Tuple[int, ...]):
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, signature[band * rows:(band + 1) * rows]
+
+    def add(self, key: Hashable, text: str, signature: Optional[Iterable[int]] = None) -> None:
+        """Index a term (re-adding a key replaces its previous entry)"""
+        if key in self._signatures:
+            self.remove(key)
+        sig = tuple(signature) if signature is not None else self.signature(text)
+        self._signatures[key] = sig
+        self._texts[key] = text
+        for band, chunk in self._bands_of(sig):
+            self._buckets[band].setdefault(chunk, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        sig = self._signatures.pop(key, None)
+        self._texts.pop(key, None)
+        if sig is None:
+            return
+        for band, chunk in self._bands_of(sig):
+            bucket = self._buckets[band].get(chunk)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][chunk]
+
+    def _candidates(self, sig: Tuple[int, ...]) -> set:
+        found = set()
+        for band, chunk in self._bands_of(sig):
+            bucket = self._buckets[band].get(chunk)
+            if bucket:
+                found |= bucket
+        return found
+
+    @staticmethod
+    def similarity(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity from two signatures"""
+        return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+    def query(self, text: str, threshold: Optional[float] = None) -> List[Tuple[Hashable, float]]:
+        """
+        Find indexed terms that look like duplicates of `text`.
+
+        Returns (key, estimated similarity) pairs, most similar first.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        sig = self.signature(text)
+        matches = []
+        for key in self._candidates(sig):
+            score = self.similarity(sig, self._signatures[key])
+            if score >= threshold:
+                matches.append((key, score))
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches
+
+    def clusters(self, threshold: Optional[float] = None) -> List[List[Hashable]]:
+        """
+        Group all indexed terms into near-duplicate clusters.
+
+        Only pairs that share an LSH bucket are compared, so this scales with
+        the number of candidate pairs rather than n².
+        """
+        threshold = self.threshold if threshold is None else threshold
+        parent: Dict[Hashable, Hashable] = {}
+
+        def find(k):
+            parent.setdefault(k, k)
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        seen_pairs = set()
+        for band_buckets in self._buckets:
+            for bucket in band_buckets.values():
+                if len(bucket) < 2:
+                    continue
+                members = list(bucket)
+                for i, a in enumerate(members):
+                    for b in members[i + 1:]:
+                        pair = (a, b) if repr(a) < repr(b) else (b, a)
+                        if pair in seen_pairs:
+                            continue
+                        seen_pairs.add(pair)
+                        if self.similarity(self._signatures[a], self._signatures[b]) >= threshold:
+                            root_a, root_b = find(a), find(b)
+                            if root_a != root_b:
+                                parent[root_b] = root_a
+
+        groups: Dict[Hashable, List[Hashable]] = {}
+        for key in parent:
+            groups.setdefault(find(key), []).append(key)
+        return [sorted(g, key=repr) for g in groups.values() if len(g) > 1]
+
+    def save(self, path: str) -> None:
+        """Persist signatures so a restart doesn't re-hash the catalog"""
+        payload = {
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "seed": self.seed,
+            "shingle_version": self.shingle_version,
+            "entries": [
+                {"key": key, "term": self._texts[key], "signature": list(sig)}
+                for key, sig in self._signatures.items()
+            ],
+        }
+        # A private temp file per writer: several processes may save at once
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path) or ".", suffix=".tmp", delete=False) as f:
+            json.dump(payload, f)
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+
+    @classmethod
+    def load(cls, path: str, threshold: float = SIMILARITY_THRESHOLD) -> "NearDuplicateIndex":
+        with open(path) as f:
+            payload = json.load(f)
+        index = cls(num_perm=payload["num_perm"], bands=payload["bands"],
+                    threshold=threshold, seed=payload["seed"],
+                    shingle_version=payload.get("shingle_version", 1))
+        for entry in payload["entries"]:
+            index.add(entry["key"], entry["term"], signature=entry["signature"])
+        return index
+
+
+# ============================================
+# API-facing singleton (term ids from the database)
+# ============================================
+
+_term_index: Optional[NearDuplicateIndex] = None
+# Bumped by reset_term_index(); a build that raced with a reset is discarded
+_generation = 0
+
+
+def _load_persisted() -> Optional[NearDuplicateIndex]:
+    if not TERM_INDEX_PATH or not os.path.exists(TERM_INDEX_PATH):
+        return None
+    try:
+        index = NearDuplicateIndex.load(TERM_INDEX_PATH)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable term index {TERM_INDEX_PATH}: {e}")
+        return None
+    if (index.num_perm, index.bands, index.seed, index.shingle_version) != (
+            NUM_PERM, NUM_BANDS, HASH_SEED, SHINGLE_VERSION):
+        return None
+    return index
+
+
+def save_term_index() -> None:
+    if _term_index is None or not TERM_INDEX_PATH:
+        return
+    try:
+        _term_index.save(TERM_INDEX_PATH)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not persist term index to {TERM_INDEX_PATH}: {e}")
+
+
+def build_term_index(rows: Iterable[Tuple[int, str]]) -> NearDuplicateIndex:
+    """
+    (Re)build the shared index from (term id, term name) rows.
+
+    Signatures from the persisted file are reused for unchanged terms.
+    """
+    global _term_index
+    persisted = _load_persisted()
+    index = NearDuplicateIndex()
+    changed = persisted is None
+    live_ids = set()
+    for term_id, name in rows:
+        live_ids.add(term_id)
+        if persisted is not None and persisted.text(term_id) == name:
+            index.add(term_id, name, signature=persisted.stored_signature(term_id))
+        else:
+            index.add(term_id, name)
+            changed = True
+    if persisted is not None and set(persisted.keys()) - live_ids:
+        changed = True
+    _term_index = index
+    if changed:
+        save_term_index()
+    logger.info(f"Near-duplicate index ready with {len(index)} terms")
+    return index
+
+
+async def get_term_index(db) -> NearDuplicateIndex:
+    """Shared index for the API, built from the terms table on first use"""
+    global _term_index
+    if _term_index is None:
+        from sqlalchemy import select
+        from app.models import Term
+        generation = _generation
+        result = await db.execute(select(Term.id, Term.term))
+        index = build_term_index(result.all())
+        if generation != _generation:
+            # Terms changed while we were reading - serve this once, rebuild next time
+            _term_index = None
+            return index
+    return _term_index
+
+
+def reset_term_index() -> None:
+    """Drop the index so the next request rebuilds it (terms changed on another worker)"""
+    global _term_index, _generation
+    _term_index = None
+    _generation += 1
+
+
+def add_to_term_index(term_id: int, name: str) -> None:
+    """
+    Index a newly inserted term in this worker's copy.
+
+    Not persisted here: the file is rewritten by the next build (preload or
+    first use), which hashes the few terms it doesn't have yet. Other workers
+    pick the term up through the cache bus.
+    """
+    if _term_index is not None:
+        _term_index.add(term_id, name)
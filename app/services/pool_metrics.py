@@ -0,0 +1,92 @@
+"""
+Connection-pool instrumentation
+
+Checkout/checkin/connect/invalidate are tracked with SQLAlchemy pool events.
+Pools have no event for time spent waiting on a free connection, so the pool
+classes below time connect() themselves. Everything lands in the shared
+metrics registry, labelled by pool name, and is published on /metrics.
+"""
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.services.metrics import registry
+
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+pool_wait = registry.histogram("db_pool_checkout_wait_seconds", "Time to obtain a pooled connection", POOL_WAIT_BUCKETS)
+pool_timeouts = registry.counter("db_pool_timeouts_total", "Checkouts that gave up after pool_timeout")
+pool_checkouts = registry.counter("db_pool_checkouts_total", "Connections handed out by the pool")
+pool_connects = registry.counter("db_pool_connects_total", "New DBAPI connections opened")
+pool_invalidations = registry.counter("db_pool_invalidations_total", "Connections discarded (e.g. failed pre-ping)")
+pool_checked_out = registry.gauge("db_pool_checked_out", "Connections currently checked out")
+pool_overflow = registry.gauge("db_pool_overflow", "Connections open beyond pool_size")
+pool_size = registry.gauge("db_pool_size", "Configured pool_size")
+
+
+class _TimedCheckoutMixin:
+    """Records how long connect() waits for a connection"""
+
+    metrics_label = "default"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_timeouts.inc(pool=self.metrics_label)
+            raise
+        finally:
+            pool_wait.observe(time.perf_counter() - start, pool=self.metrics_label)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep the label
+        new_pool = super().recreate()
+        new_pool.metrics_label = self.metrics_label
+        return new_pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine, label: str) -> None:
+    """
+    Attach pool event listeners to a (sync) Engine.
+
+    For an AsyncEngine pass async_engine.sync_engine.
+    """
+    if isinstance(engine.pool, _TimedCheckoutMixin):
+        engine.pool.metrics_label = label
+
+    def _refresh_gauges():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            pool_overflow.set(max(pool.overflow(), 0), pool=label)
+            pool_size.set(pool.size(), pool=label)
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_checkouts.inc(pool=label)
+        pool_checked_out.inc(pool=label)
+        _refresh_gauges()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        pool_checked_out.dec(pool=label)
+        _refresh_gauges()
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_connects.inc(pool=label)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_invalidations.inc(pool=label)
+
+    _refresh_gauges()
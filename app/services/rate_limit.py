@@ -0,0 +1,48 @@
+"""
+Rate limiting
+
+One slowapi Limiter for the whole app; routers decorate their endpoints with
+it. Requests carrying a valid access token are counted per user, anonymous
+ones (login, register) per client IP, so a classroom behind one NAT does not
+share a budget.
+
+Settings:
+    RATE_LIMIT_STORAGE   where the counters live (default memory://)
+                           memory://                 per worker process
+                           sqlite:////tmp/limits.db  shared by the workers on one host
+                           resp://redis:6379         shared by several hosts (Redis protocol)
+    RATE_LIMIT_STRATEGY  sliding-window-counter (default) | fixed-window
+
+If a shared store stops answering, each worker falls back to memory until it
+is back.
+"""
+import os
+
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from starlette.requests import Request
+
+from app.auth.auth_handler import decode_jwt
+# Registers the sqlite:// and resp:// storage schemes with `limits`
+from app.services import rate_limit_storage  # noqa: F401
+
+RATE_LIMIT_STORAGE = os.getenv("RATE_LIMIT_STORAGE", "memory://")
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "sliding-window-counter")
+
+
+def rate_limit_key(request: Request) -> str:
+    """user:<id> for a valid bearer token, otherwise ip:<client address>"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = decode_jwt(token)
+        if payload and "user_id" in payload:
+            return f"user:{payload['user_id']}"
+    return f"ip:{get_remote_address(request)}"
+
+
+limiter = Limiter(
+    key_func=rate_limit_key,
+    storage_uri=RATE_LIMIT_STORAGE,
+    strategy=RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=True,
+)
@@ -0,0 +1,347 @@
+"""
+Shared counters for rate limiting
+
+Two backends for the `limits` library (which slowapi uses), registered under
+their own URI schemes. They support the fixed-window and
+sliding-window-counter strategies.
+
+    sqlite:///path/to/file.db   every worker on one host shares the file. An
+                                acquire is one BEGIN IMMEDIATE transaction, so
+                                check-and-increment is atomic across processes.
+    resp://[:password@]host[:port][/db]
+                                Redis or anything else that speaks its protocol
+                                (RESP2). No client library needed. Increments
+                                are atomic INCRBYs; a hit that pushes a window
+                                over its limit is taken back with DECRBY, so
+                                the limit is never exceeded (under contention a
+                                request may be refused slightly early).
+
+Both connect on first use and reconnect after a fork, so they are safe to
+create before gunicorn forks its workers.
+
+slowapi calls its storage synchronously, so both stores block the event loop
+for each hit: normally a local file write or one round trip, at worst the
+SQLite busy timeout (0.5 s) or the socket timeout (1 s). After that the hit
+fails and slowapi falls back to per-worker memory counters.
+"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from math import floor
+from typing import Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport, TimestampedSlidingWindow
+
+# Expired rows are swept after this many SQLite writes
+SQLITE_PURGE_EVERY = 1000
+
+
+def _sliding_window_ttls(previous_count: int, expiry: int, now: float) -> Tuple[float, float]:
+    """Seconds until the previous window stops counting, and until the current one ends"""
+    previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+    current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+    return previous_ttl, current_ttl
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Rate limit counters in a SQLite file (one host, many workers)"""
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    # Transactions hold the write lock for microseconds; a longer wait means
+    # something is wrong, and the wait stalls the event loop
+    def __init__(self, uri: str, wrap_exceptions: bool = False, timeout: float = 0.5, **options):
+        # Same convention as SQLAlchemy: sqlite:///relative.db, sqlite:////absolute.db
+        self.path = uri.split("://", 1)[1][1:] or ":memory:"
+        self.timeout = float(timeout)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Counters are disposable, so a power cut losing the last writes is fine
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID"
+            )
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @contextmanager
+    def _session(self, write: bool = False):
+        with self._lock:
+            conn = self._connection()
+            if not write:
+                yield conn
+                return
+            # IMMEDIATE takes the write lock up front, so the reads inside see
+            # counters no other worker can change until COMMIT
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                self._writes += 1
+                if self._writes % SQLITE_PURGE_EVERY == 0:
+                    conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (time.time(),))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _get(conn, key: str, now: float) -> int:
+        row = conn.execute("SELECT value FROM rate_limits WHERE key = ? AND expires_at > ?", (key, now)).fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def _incr(conn, key: str, expiry: float, amount: int, now: float) -> int:
+        # An expired row starts over, otherwise the window (and its expiry) is kept
+        return conn.execute(
+            "INSERT INTO rate_limits (key, value, expires_at) VALUES (?1, ?2, ?3) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "value = CASE WHEN expires_at <= ?4 THEN excluded.value ELSE value + excluded.value END, "
+            "expires_at = CASE WHEN expires_at <= ?4 THEN excluded.expires_at ELSE expires_at END "
+            "RETURNING value",
+            (key, amount, now + expiry, now),
+        ).fetchone()[0]
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        with self._session(write=True) as conn:
+            return self._incr(conn, key, expiry, amount, time.time())
+
+    def get(self, key: str) -> int:
+        with self._session() as conn:
+            return self._get(conn, key, time.time())
+
+    def get_expiry(self, key: str) -> float:
+        with self._session() as conn:
+            row = conn.execute("SELECT expires_at FROM rate_limits WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            with self._session() as conn:
+                conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        with self._session(write=True) as conn:
+            return conn.execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        with self._session(write=True) as conn:
+            conn.execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._session(write=True) as conn:
+            previous_count = self._get(conn, previous_key, now)
+            current_count = self._get(conn, current_key, now)
+            previous_ttl, _ = _sliding_window_ttls(previous_count, expiry, now)
+            if floor(previous_count * previous_ttl / expiry + current_count) + amount > limit:
+                return False
+            self._incr(conn, current_key, 2 * expiry, amount, now)
+            return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._session() as conn:
+            previous_count = self._get(conn, previous_key, now)
+            current_count = self._get(conn, current_key, now)
+        previous_ttl, current_ttl = _sliding_window_ttls(previous_count, expiry, now)
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        with self._session(write=True) as conn:
+            conn.execute("DELETE FROM rate_limits WHERE key IN (?, ?)", (previous_key, current_key))
+
+
+class RespError(Exception):
+    """Error reply from a RESP server"""
+
+
+class RespConnection:
+    """Just enough of a RESP2 client: pipelined commands over one socket"""
+
+    def __init__(self, host: str, port: int, password: Optional[str] = None, db: int = 0, timeout: float = 1.0):
+        self.host, self.port = host, port
+        self.password, self.db = password, db
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        self._pid = os.getpid()
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            self._roundtrip(setup)
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+        self._sock = self._reader = None
+
+    @staticmethod
+    def _encode(command) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("RESP server closed the connection")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            return RespError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            return None if length < 0 else self._reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unexpected RESP reply {line!r}")
+
+    def _roundtrip(self, commands) -> list:
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+        # Read every reply before raising, so the stream stays in step
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def execute(self, *commands) -> list:
+        """Send the commands in one write and return their replies"""
+        with self._lock:
+            if self._sock is None or self._pid != os.getpid():
+                self._connect()
+            try:
+                return self._roundtrip(commands)
+            except (OSError, ConnectionError, ValueError):
+                self.close()
+                raise
+
+
+class RespStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Rate limit counters in Redis (or a compatible server), shared by every host"""
+
+    STORAGE_SCHEME = ["resp"]
+    KEY_PATTERN = "LIMITER*"
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, timeout: float = 1.0, **options):
+        parsed = urlparse(uri)
+        self.connection = RespConnection(
+            parsed.hostname or "localhost",
+            parsed.port or 6379,
+            password=unquote(parsed.password) if parsed.password else None,
+            db=int(parsed.path.strip("/") or 0),
+            timeout=float(timeout),
+        )
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return (OSError, ConnectionError, RespError)
+
+    def _incr(self, key: str, expiry: float, amount: int, *extra) -> Tuple[int, list]:
+        """INCRBY a window counter, starting it with its expiry; returns the count and `extra` replies"""
+        expiry_ms = int(expiry * 1000)
+        # SET NX starts the window with its expiry; INCRBY keeps an existing TTL
+        replies = self.connection.execute(
+            ("SET", key, 0, "PX", expiry_ms, "NX"), ("INCRBY", key, amount), ("PTTL", key), *extra
+        )
+        if replies[2] == -1:
+            # The key expired between SET and INCRBY, and INCRBY recreated it
+            # without a TTL; without this the window would never reset
+            self.connection.execute(("PEXPIRE", key, expiry_ms))
+        return replies[1], replies[3:]
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self._incr(key, expiry, amount)[0]
+
+    def get(self, key: str) -> int:
+        return int(self.connection.execute(("GET", key))[0] or 0)
+
+    def get_expiry(self, key: str) -> float:
+        ttl_ms = self.connection.execute(("PTTL", key))[0]
+        return time.time() + max(ttl_ms, 0) / 1000
+
+    def check(self) -> bool:
+        try:
+            return self.connection.execute(("PING",))[0] == "PONG"
+        except self.base_exceptions:
+            return False
+
+    def reset(self) -> int:
+        cursor, removed = b"0", 0
+        while True:
+            cursor, keys = self.connection.execute(("SCAN", cursor, "MATCH", self.KEY_PATTERN, "COUNT", 1000))[0]
+            if keys:
+                removed += self.connection.execute(("DEL", *keys))[0]
+            if cursor == b"0":
+                return removed
+
+    def clear(self, key: str) -> None:
+        self.connection.execute(("DEL", key))
+
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        current_count, (previous,) = self._incr(current_key, 2 * expiry, amount, ("GET", previous_key))
+        previous_count = int(previous or 0)
+        previous_ttl, _ = _sliding_window_ttls(previous_count, expiry, now)
+        if floor(previous_count * previous_ttl / expiry + current_count) > limit:
+            self.connection.execute(("DECRBY", current_key, amount))
+            return False
+        return True
+
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous, current = self.connection.execute(("GET", previous_key), ("GET", current_key))
+        previous_count, current_count = int(previous or 0), int(current or 0)
+        previous_ttl, current_ttl = _sliding_window_ttls(previous_count, expiry, now)
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.connection.execute(("DEL", *self.sliding_window_keys(key, expiry, time.time())))
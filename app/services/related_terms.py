@@ -0,0 +1,279 @@
+"""
+"Related terms" neighbor table built from TF-IDF vectors.
+
+Each term is a sparse TF-IDF vector over the words of its name (weighted
+double) and its formal/simple definitions. Vectors are L2-normalized, so the
+dot product of two vectors is their cosine similarity. Similarities are
+computed once, by walking an inverted index (the sparse X·Xᵀ product), and the
+top-k neighbors of every term are stored. Serving a request is then a plain
+dictionary lookup.
+
+New terms are added incrementally: the new vector is scored against the
+existing ones through the inverted index and spliced into any neighbor list it
+improves. A removed term's former neighbors get their lists recomputed. IDF
+weights are frozen at build time until the next full rebuild.
+
+In the API the table is built off the event loop (asyncio.to_thread), or in
+the gunicorn master by preload_caches(). When terms change on another
+worker, the next request diffs the terms table against the table's copy and
+applies only what changed; a full rebuild (again in a thread) happens only
+when more than REBUILD_FRACTION of the terms changed.
+"""
+import asyncio
+import heapq
+import logging
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How many neighbors are kept per term
+RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", "10"))
+# Neighbors below this cosine similarity are not worth showing
+MIN_SIMILARITY = 0.05
+NAME_WEIGHT = 2
+# Past this share of changed terms, a sync rebuilds instead of patching
+REBUILD_FRACTION = 0.1
+
+# Fields a term's vector and metadata come from
+SOURCE_FIELDS = ("term", "category", "difficulty", "formal_definition", "simple_definition")
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]")
+
+STOPWORDS = frozenset({
+    "a", "about", "all", "also", "an", "and", "any", "are", "as", "at", "be", "because",
+    "between", "but", "by", "can", "difference", "do", "does", "each", "e.g", "for", "from",
+    "has", "have", "how", "i", "if", "in", "into", "is", "it", "its", "like", "may", "more",
+    "most", "not", "of", "on", "one", "or", "other", "so", "such", "than", "that", "the",
+    "their", "them", "then", "there", "these", "they", "this", "to", "two", "use", "used",
+    "uses", "using", "vs", "was", "way", "what", "when", "where", "which", "while", "who",
+    "why", "will", "with", "without", "you", "your",
+})
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [w for w in _WORD.findall(text.lower()) if w not in STOPWORDS]
+
+
+def term_tokens(term: str, formal_definition: Optional[str], simple_definition: Optional[str]) -> Counter:
+    counts = Counter()
+    for _ in range(NAME_WEIGHT):
+        counts.update(tokenize(term))
+    counts.update(tokenize(formal_definition))
+    counts.update(tokenize(simple_definition))
+    return counts
+
+
+def _source(term: dict) -> tuple:
+    return tuple(term.get(field) for field in SOURCE_FIELDS)
+
+
+class RelatedTermsIndex:
+    """Sparse TF-IDF vectors plus a precomputed top-k neighbor table"""
+
+    def __init__(self, top_k: int = RELATED_TOP_K, min_similarity: float = MIN_SIMILARITY):
+        self.top_k = top_k
+        self.min_similarity = min_similarity
+        self._idf: Dict[str, float] = {}
+        self._num_docs = 0
+        self._vectors: Dict[int, Dict[str, float]] = {}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._neighbors: Dict[int, List[Tuple[float, int]]] = {}
+        self._meta: Dict[int, dict] = {}
+        self._sources: Dict[int, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def __contains__(self, term_id: int) -> bool:
+        return term_id in self._vectors
+
+    def _idf_for(self, token: str) -> float:
+        # Unseen tokens get the IDF of a word that appears in one document
+        return self._idf.get(token, math.log((1 + self._num_docs) / 2) + 1)
+
+    def _vectorize(self, counts: Counter) -> Dict[str, float]:
+        weights = {t: (1 + math.log(c)) * self._idf_for(t) for t, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        if norm == 0:
+            return {}
+        return {t: w / norm for t, w in weights.items()}
+
+    def _scores(self, vector: Dict[str, float], exclude: int) -> Dict[int, float]:
+        """One row of X·Xᵀ via the inverted index"""
+        scores: Dict[int, float] = {}
+        for token, weight in vector.items():
+            for other, other_weight in self._postings.get(token, {}).items():
+                if other != exclude:
+                    scores[other] = scores.get(other, 0.0) + weight * other_weight
+        return scores
+
+    def _top(self, scores: Dict[int, float]) -> List[Tuple[float, int]]:
+        best = heapq.nlargest(self.top_k, ((s, i) for i, s in scores.items() if s >= self.min_similarity))
+        return [(round(s, 4), i) for s, i in best]
+
+    def build(self, terms: Iterable[dict]) -> None:
+        """
+        Full rebuild from term dicts with id, term, category, difficulty,
+        formal_definition and simple_definition.
+        """
+        counts: Dict[int, Counter] = {}
+        self._meta = {}
+        self._sources = {}
+        for t in terms:
+            counts[t["id"]] = term_tokens(t["term"], t.get("formal_definition"), t.get("simple_definition"))
+            self._meta[t["id"]] = {"term": t["term"], "category": t["category"], "difficulty": t["difficulty"]}
+            self._sources[t["id"]] = _source(t)
+
+        self._num_docs = len(counts)
+        df = Counter()
+        for c in counts.values():
+            df.update(c.keys())
+        self._idf = {tok: math.log((1 + self._num_docs) / (1 + n)) + 1 for tok, n in df.items()}
+
+        self._vectors = {term_id: self._vectorize(c) for term_id, c in counts.items()}
+        self._postings = {}
+        for term_id, vector in self._vectors.items():
+            for token, weight in vector.items():
+                self._postings.setdefault(token, {})[term_id] = weight
+
+        self._neighbors = {
+            term_id: self._top(self._scores(vector, exclude=term_id))
+            for term_id, vector in self._vectors.items()
+        }
+
+    def add(self, term: dict) -> None:
+        """Incrementally add (or replace) one term"""
+        term_id = term["id"]
+        if term_id in self._vectors:
+            self.remove(term_id)
+        vector = self._vectorize(term_tokens(term["term"], term.get("formal_definition"), term.get("simple_definition")))
+        self._meta[term_id] = {"term": term["term"], "category": term["category"], "difficulty": term["difficulty"]}
+        self._sources[term_id] = _source(term)
+        scores = self._scores(vector, exclude=term_id)
+
+        self._vectors[term_id] = vector
+        for token, weight in vector.items():
+            self._postings.setdefault(token, {})[term_id] = weight
+        self._neighbors[term_id] = self._top(scores)
+
+        # Splice the new term into neighbor lists it now belongs to
+        for other, score in scores.items():
+            if score < self.min_similarity:
+                continue
+            current = self._neighbors.get(other, [])
+            if len(current) < self.top_k or score > current[-1][0]:
+                current.append((round(score, 4), term_id))
+                current.sort(reverse=True)
+                self._neighbors[other] = current[:self.top_k]
+
+    def remove(self, term_id: int) -> None:
+        vector = self._vectors.pop(term_id, None)
+        if vector is None:
+            return
+        for token in vector:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.pop(term_id, None)
+                if not posting:
+                    del self._postings[token]
+        self._neighbors.pop(term_id, None)
+        self._meta.pop(term_id, None)
+        self._sources.pop(term_id, None)
+        # Recompute the lists it was in, so they are backfilled to top_k
+        for other, neighbors in self._neighbors.items():
+            if any(i == term_id for _, i in neighbors):
+                self._neighbors[other] = self._top(self._scores(self._vectors[other], exclude=other))
+
+    def diff(self, terms: Iterable[dict]) -> Tuple[List[dict], List[int]]:
+        """(terms that are new or changed, ids no longer present) compared with `terms`"""
+        changed, seen = [], set()
+        for t in terms:
+            seen.add(t["id"])
+            if self._sources.get(t["id"]) != _source(t):
+                changed.append(t)
+        return changed, [term_id for term_id in self._vectors if term_id not in seen]
+
+    def apply(self, changed: Iterable[dict], removed: Iterable[int]) -> None:
+        for term_id in removed:
+            self.remove(term_id)
+        for t in changed:
+            self.add(t)
+
+    def related(self, term_id: int, limit: Optional[int] = None) -> List[dict]:
+        """Precomputed neighbors of a term, most similar first"""
+        neighbors = self._neighbors.get(term_id, [])
+        if limit is not None:
+            neighbors = neighbors[:limit]
+        return [{"id": i, **self._meta[i], "score": s} for s, i in neighbors]
+
+
+# ============================================
+# API-facing singleton
+# ============================================
+
+_related_index: Optional[RelatedTermsIndex] = None
+# Set by reset_related_index(): terms changed, sync before serving
+_stale = False
+# One build or sync at a time per worker
+_lock = asyncio.Lock()
+
+_TERM_COLUMNS = ("id", "term", "category", "difficulty", "formal_definition", "simple_definition")
+
+
+def _term_dict(row) -> dict:
+    return {name: getattr(row, name) for name in _TERM_COLUMNS}
+
+
+async def get_related_index(db) -> RelatedTermsIndex:
+    """Shared neighbor table, built on first use and kept in sync with the terms table"""
+    global _related_index, _stale
+    if _related_index is not None and not _stale:
+        return _related_index
+    async with _lock:
+        if _related_index is not None and not _stale:
+            return _related_index
+        from sqlalchemy import select
+        from app.models import Term
+        # Cleared before reading: a change that lands during the read sets it again
+        _stale = False
+        result = await db.execute(select(
+            Term.id, Term.term, Term.category, Term.difficulty, Term.formal_definition, Term.simple_definition
+        ))
+        terms = [_term_dict(r) for r in result.all()]
+
+        if _related_index is not None:
+            changed, removed = _related_index.diff(terms)
+            if len(changed) + len(removed) <= REBUILD_FRACTION * max(len(terms), len(_related_index)):
+                # A few terms: patch in place, each one is a single row of X·Xᵀ
+                _related_index.apply(changed, removed)
+                logger.info(f"Related-terms table synced ({len(changed)} changed, {len(removed)} removed)")
+                return _related_index
+
+        # Seconds of CPU for a large catalog - keep it off the event loop
+        index = RelatedTermsIndex()
+        await asyncio.to_thread(index.build, terms)
+        _related_index = index
+        logger.info(f"Related-terms table built for {len(index)} terms")
+    return _related_index
+
+
+def reset_related_index() -> None:
+    """Terms changed on another worker: the next request syncs the table"""
+    global _stale
+    _stale = True
+
+
+def add_to_related_index(term) -> None:
+    """Incrementally index a newly inserted Term"""
+    global _stale
+    if _related_index is not None:
+        _related_index.add(_term_dict(term))
+    if _lock.locked():
+        # A build in progress may have read the terms before this one
+        _stale = True
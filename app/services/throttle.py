@@ -0,0 +1,49 @@
+"""
+Rate shaping for batch jobs that call the AI service
+
+TokenBucket spreads calls evenly at a target rate (with a small burst) so
+offline jobs don't spike our Gemini quota.
+"""
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Async token bucket: acquire() waits until a token is available.
+
+    rate_per_minute: sustained calls per minute
+    burst: how many calls may go out back-to-back after an idle period
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def set_rate(self, rate_per_minute: float) -> None:
+        """Change the sustained rate (used by adaptive throttling)"""
+        self._refill()
+        self.rate = max(rate_per_minute, 0.1) / 60.0
+
+    @property
+    def rate_per_minute(self) -> float:
+        return self.rate * 60.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
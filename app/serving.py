@@ -0,0 +1,48 @@
+"""
+Multi-worker serving with gunicorn (see gunicorn.conf.py)
+
+UvicornWorker pins uvicorn to uvloop and httptools, so a missing one fails at
+startup instead of silently falling back to asyncio / h11.
+
+preload_caches() runs in the gunicorn master after the app is imported and
+before the workers are forked. It builds the term catalog's in-process
+indexes (related terms, near duplicates) once. Every worker then starts with
+them already built, sharing the pages copy-on-write, instead of each worker
+querying all terms and rebuilding on its first request.
+"""
+import asyncio
+import logging
+
+from uvicorn.workers import UvicornWorker as _UvicornWorker
+
+logger = logging.getLogger(__name__)
+
+
+class UvicornWorker(_UvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+
+async def _build_caches() -> None:
+    from app.database import AsyncSessionLocal, async_engine
+    from app.services.cache_bus import bus as cache_bus
+    from app.services.near_duplicates import get_term_index
+    from app.services.related_terms import get_related_index
+
+    try:
+        # Versions first, so a write that lands during the build is evicted in the workers
+        await cache_bus.remember_versions(async_engine)
+        async with AsyncSessionLocal() as db:
+            related = await get_related_index(db)
+            await get_term_index(db)
+        logger.info(f"Preloaded term caches ({len(related)} terms) before forking workers")
+    finally:
+        # No pooled connection may be inherited by the workers
+        await async_engine.dispose()
+
+
+def preload_caches() -> None:
+    """Build the term caches in the current (master) process; failures only cost the preload"""
+    try:
+        asyncio.run(_build_caches())
+    except Exception as e:
+        logger.warning(f"Cache preload skipped, workers will build them on first use: {e}")
@@ -13,7 +13,6 @@ import os
 import sys
 import subprocess
 from datetime import datetime
-import boto3
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -27,7 +26,17 @@ DB_USER = os.getenv("POSTGRES_USER", "vocabuser")
 DB_PASSWORD = os.getenv("POSTGRES_PASSWORD")
 DB_NAME = os.getenv("POSTGRES_DB", "vocabdb")
 
-s3_client = boto3.client("s3", region_name=AWS_REGION)
+_s3_client = None
+
+
+def get_s3_client():
+    """S3 client, created on first use so a usage error doesn't pay for importing boto3."""
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+
+        _s3_client = boto3.client("s3", region_name=AWS_REGION)
+    return _s3_client
 
 
 def backup_database():
@@ -58,7 +67,7 @@ def backup_database():
         
         # Upload to S3
         print(f"📤 Uploading to S3: s3://{S3_BUCKET}/{backup_filename}")
-        s3_client.upload_file(
+        get_s3_client().upload_file(
             backup_filename,
             S3_BUCKET,
             backup_filename,
@@ -83,7 +92,7 @@ def restore_database(backup_file=None):
         if backup_file is None:
             # Get latest backup
             print(f"📋 Listing backups in s3://{S3_BUCKET}/...")
-            response = s3_client.list_objects_v2(Bucket=S3_BUCKET, Prefix="stacktutor_db_")
+            response = get_s3_client().list_objects_v2(Bucket=S3_BUCKET, Prefix="stacktutor_db_")
             
             if "Contents" not in response:
                 print("❌ No backups found in S3")
@@ -96,7 +105,7 @@ def restore_database(backup_file=None):
         
         # Download from S3
         print(f"📥 Downloading from S3: s3://{S3_BUCKET}/{backup_file}")
-        s3_client.download_file(S3_BUCKET, backup_file, backup_file)
+        get_s3_client().download_file(S3_BUCKET, backup_file, backup_file)
         print(f"✅ Backup downloaded: {backup_file}")
         
         # Restore to database
@@ -132,7 +141,7 @@ def list_backups():
     """List all backups in S3."""
     try:
         print(f"📋 Backups in s3://{S3_BUCKET}/:\n")
-        response = s3_client.list_objects_v2(Bucket=S3_BUCKET, Prefix="stacktutor_db_")
+        response = get_s3_client().list_objects_v2(Bucket=S3_BUCKET, Prefix="stacktutor_db_")
         
         if "Contents" not in response:
             print("No backups found")
@@ -0,0 +1,137 @@
+"""
+Concurrency benchmark for DB-bound endpoints.
+
+Starts the API with uvicorn (one worker) against a throwaway database, then
+hammers /terms/{id} and /vocabulary/ with concurrent clients and reports
+throughput and latency percentiles.
+
+Compare two code versions by pointing --app-dir at another checkout, e.g.:
+    git worktree add /tmp/before <commit>
+    python benchmarks/bench_db_concurrency.py --app-dir /tmp/before
+    python benchmarks/bench_db_concurrency.py
+
+Usage:
+    python benchmarks/bench_db_concurrency.py [--concurrency 50] [--duration 10]
+        [--database-url postgresql://...] [--app-dir .]
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(app_dir: str, database_url: str, port: int, extra_env: dict = None) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "SECRET_KEY": os.getenv("SECRET_KEY", "benchmark-secret"),
+        "ALGORITHM": os.getenv("ALGORITHM", "HS256"),
+        "LOG_LEVEL": "WARNING",
+        **(extra_env or {}),
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=app_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_ready(base_url: str, timeout: float = 60) -> float:
+    """Seconds until the server answers /health"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return time.perf_counter() - start
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise RuntimeError("server did not become ready")
+
+
+async def run_load(base_url: str, path_factory, headers: dict, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, timeout=30,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                resp = await client.get(path_factory())
+                latencies.append(time.perf_counter() - start)
+                if resp.status_code != 200:
+                    errors += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def setup_user(base_url: str) -> dict:
+    creds = {"email": f"bench{random.randint(0, 10**9)}@example.com", "password": "benchmark-pass"}
+    token = httpx.post(f"{base_url}/api/v1/auth/register", json=creds, timeout=30).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    # Give the user a vocabulary list to read back
+    for term_id in range(1, 21):
+        httpx.post(f"{base_url}/api/v1/vocabulary/{term_id}", headers=headers, timeout=30)
+    return headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--app-dir", default=REPO_ROOT, help="Checkout to benchmark")
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    database_url = args.database_url or f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    server = start_server(args.app_dir, database_url, port)
+    try:
+        wait_ready(base_url)
+        headers = setup_user(base_url)
+        endpoints = {
+            "/terms/{id}": lambda: f"/api/v1/terms/{random.randint(1, 300)}",
+            "/vocabulary/": lambda: "/api/v1/vocabulary/",
+        }
+        print(f"App: {args.app_dir}  DB: {database_url.split('@')[-1]}  concurrency={args.concurrency}")
+        for name, path_factory in endpoints.items():
+            stats = asyncio.run(run_load(base_url, path_factory, headers, args.concurrency, args.duration))
+            print(f"  {name:<14} {stats['rps']:8.1f} req/s   p50 {stats['p50_ms']:7.1f} ms   "
+                  f"p99 {stats['p99_ms']:7.1f} ms   errors {stats['errors']}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
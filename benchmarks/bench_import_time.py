@@ -0,0 +1,114 @@
+"""
+Import-time and cold-start benchmark for the API, with regression thresholds.
+
+1. Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+   reports the total import time plus the packages that cost the most.
+2. Starts the API with uvicorn (STARTUP_MODE=verify, like production) against
+   a throwaway database and measures process start -> first served /health.
+
+Exits with status 1 if a median goes over its threshold, or if a module that
+should only load on first use (the Gemini SDK, boto3) is imported at startup.
+Thresholds depend on the machine; set them from a baseline run on the CI box.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5] [--top 10]
+        [--max-import-ms 1500] [--max-ready-ms 4000]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+from bench_db_concurrency import REPO_ROOT
+from bench_startup import time_startup
+
+# Heavy SDKs the app must not import until an endpoint actually needs them
+LAZY_MODULES = ("google.generativeai", "boto3")
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+CHILD = f"""
+import sys
+import app.main
+print("LAZY:" + ",".join(m for m in {LAZY_MODULES!r} if m in sys.modules))
+"""
+
+
+def app_env(database_url: str) -> dict:
+    return {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "SECRET_KEY": os.getenv("SECRET_KEY", "benchmark-secret"),
+        "ALGORITHM": os.getenv("ALGORITHM", "HS256"),
+        "LOG_LEVEL": "WARNING",
+    }
+
+
+def measure_imports(database_url: str) -> dict:
+    """Import app.main once under -X importtime; times are in microseconds"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD], cwd=REPO_ROOT,
+                          env=app_env(database_url), check=True, capture_output=True, text=True)
+    self_by_package = defaultdict(int)
+    total = 0
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, _, module = match.groups()
+        self_by_package[module.split(".")[0]] += int(self_us)
+        if module == "app.main":
+            total = int(cumulative_us)
+    marker = next(line for line in proc.stdout.splitlines() if line.startswith("LAZY:"))
+    lazy_loaded = {m for m in marker[len("LAZY:"):].split(",") if m}
+    return {"total": total, "packages": self_by_package, "lazy_loaded": lazy_loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Most expensive packages to list")
+    parser.add_argument("--max-import-ms", type=float, default=float(os.getenv("MAX_IMPORT_MS", 1500)))
+    parser.add_argument("--max-ready-ms", type=float, default=float(os.getenv("MAX_READY_MS", 4000)))
+    args = parser.parse_args()
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    subprocess.run([sys.executable, "init_db.py", "--no-seed"], cwd=REPO_ROOT, check=True,
+                   stdout=subprocess.DEVNULL, env=app_env(database_url))
+
+    measure_imports(database_url)  # warm the bytecode cache
+    imports = [measure_imports(database_url) for _ in range(args.runs)]
+    import_ms = statistics.median(r["total"] for r in imports) / 1000
+    print(f"import app.main   median {import_ms:7.0f} ms   (threshold {args.max_import_ms:.0f} ms)")
+    packages = defaultdict(list)
+    for result in imports:
+        for package, self_us in result["packages"].items():
+            packages[package].append(self_us)
+    ranked = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for package, times in ranked[:args.top]:
+        print(f"    {package:<28} {statistics.median(times) / 1000:7.1f} ms")
+
+    ready = [time_startup(database_url, "verify", 1) for _ in range(args.runs)]
+    ready_ms = statistics.median(ready) * 1000
+    print(f"start -> /health  median {ready_ms:7.0f} ms   (threshold {args.max_ready_ms:.0f} ms)")
+
+    failures = []
+    lazy_loaded = sorted(set().union(*(r["lazy_loaded"] for r in imports)))
+    if lazy_loaded:
+        failures.append(f"imported at startup: {', '.join(lazy_loaded)}")
+    if import_ms > args.max_import_ms:
+        failures.append(f"import time {import_ms:.0f} ms > {args.max_import_ms:.0f} ms")
+    if ready_ms > args.max_ready_ms:
+        failures.append(f"time to first request {ready_ms:.0f} ms > {args.max_ready_ms:.0f} ms")
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✅ Startup within thresholds")
+
+
+if __name__ == "__main__":
+    main()
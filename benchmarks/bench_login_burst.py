@@ -0,0 +1,89 @@
+"""
+Latency of read endpoints during a burst of password hashing.
+
+Starts the API with uvicorn (one worker) against a throwaway database and
+measures /terms/all?category=git and /quiz/random twice: alone, and while
+other clients keep registering new users. Every registration costs a bcrypt
+hash. /auth/register is used for the burst because /auth/login is rate
+limited per IP.
+
+Compare against another checkout with --app-dir, like bench_db_concurrency.py.
+
+Usage:
+    python benchmarks/bench_login_burst.py [--concurrency 4] [--burst 8] [--duration 10]
+        [--app-dir .]
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import tempfile
+import time
+
+import httpx
+
+from bench_db_concurrency import REPO_ROOT, free_port, run_load, setup_user, start_server, wait_ready
+
+ENDPOINTS = {
+    "/terms/all?category=git": lambda: "/api/v1/terms/all?category=git",
+    "/quiz/random": lambda: "/api/v1/quiz/random",
+}
+
+
+async def register_burst(base_url: str, clients: int, duration: float) -> int:
+    """Keep `clients` registrations in flight for `duration` seconds"""
+    counter = itertools.count()
+    prefix = random.randint(0, 10**9)
+    deadline = time.perf_counter() + duration
+    done = 0
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        async def worker():
+            nonlocal done
+            while time.perf_counter() < deadline:
+                creds = {"email": f"burst{prefix}-{next(counter)}@example.com", "password": "benchmark-pass"}
+                await client.post("/api/v1/auth/register", json=creds)
+                done += 1
+
+        await asyncio.gather(*(worker() for _ in range(clients)))
+    return done
+
+
+async def measure(base_url: str, path_factory, headers: dict, concurrency: int, burst: int, duration: float):
+    load = run_load(base_url, path_factory, headers, concurrency, duration)
+    if not burst:
+        return await load, 0
+    return await asyncio.gather(load, register_burst(base_url, burst, duration))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--app-dir", default=REPO_ROOT, help="Checkout to benchmark")
+    parser.add_argument("--concurrency", type=int, default=4, help="Clients on the read endpoint")
+    parser.add_argument("--burst", type=int, default=8, help="Concurrent registrations during the burst")
+    parser.add_argument("--duration", type=float, default=10)
+    args = parser.parse_args()
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(args.app_dir, database_url, port)
+    try:
+        wait_ready(base_url)
+        headers = setup_user(base_url)
+        print(f"App: {args.app_dir}  concurrency={args.concurrency}  burst={args.burst}")
+        for name, path_factory in ENDPOINTS.items():
+            for burst in (0, args.burst):
+                stats, registrations = asyncio.run(
+                    measure(base_url, path_factory, headers, args.concurrency, burst, args.duration))
+                label = f"{registrations / args.duration:5.1f} reg/s" if burst else "   no burst"
+                print(f"  {name:<24} {label}   {stats['rps']:7.1f} req/s   p50 {stats['p50_ms']:7.1f} ms   "
+                      f"p99 {stats['p99_ms']:7.1f} ms   errors {stats['errors']}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
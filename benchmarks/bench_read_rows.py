@@ -0,0 +1,160 @@
+"""
+Per-row cost of the catalog and vocabulary reads.
+
+Runs both endpoints' database read and response body against a temporary
+SQLite file (aiosqlite), with a fresh session per request like the app:
+    before  select the ORM entities (joinedload for vocabulary), then copy
+            their attributes into the response field by field (the old
+            handlers)
+    after   select column tuples (app/queries.py) and validate the Rows
+            straight into the response with FastJSON
+Both must produce identical JSON. Time is the best of --runs; memory is the
+tracemalloc peak of one extra run, divided by the row count.
+
+Usage:
+    python benchmarks/bench_read_rows.py [--rows 10000] [--runs 10]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+# app.models needs a database URL to import; the benchmark makes its own engine
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import joinedload
+
+from app.models import Base, Term, User, VocabularyItem
+from app.queries import fetch_all, terms_query, vocabulary_query
+from app.responses import FastJSON
+from app.schemas import TermResponse, VocabularyListResponse
+
+USER_ID = 1
+term_list_json = FastJSON(list[TermResponse])
+vocabulary_json = FastJSON(VocabularyListResponse)
+
+
+async def seed(engine, count: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [{"id": USER_ID, "email": "bench@example.com", "hashed_password": "x"}])
+        await conn.execute(insert(Term), [
+            {
+                "id": i, "term": f"Term {i}", "category": f"category-{i % 17}", "difficulty": i % 3 + 1,
+                "formal_definition": f"Formal definition of term {i}, long enough to look like a real one. " * 2,
+                "simple_definition": f"Simple definition of term {i}.",
+                "example": f"Example use of term {i}" if i % 4 else None,
+                "why_it_matters": "It shows up in interviews and in production incidents.",
+                "created_at": datetime(2025, 1, 1, 12, i % 60, i % 60),
+            }
+            for i in range(1, count + 1)
+        ])
+        await conn.execute(insert(VocabularyItem), [
+            {"user_id": USER_ID, "term_id": i, "review_count": i % 5, "saved_at": datetime(2025, 2, 1),
+             "last_score": i % 10 if i % 3 else None}
+            for i in range(1, count + 1)
+        ])
+
+
+async def catalog_before(db) -> bytes:
+    terms = (await db.execute(select(Term).order_by(Term.term))).scalars().all()
+    return term_list_json.dump([
+        TermResponse(
+            id=term.id, term=term.term, formal_definition=term.formal_definition,
+            simple_definition=term.simple_definition, example=term.example,
+            why_it_matters=term.why_it_matters, category=term.category, category_id=term.category_id,
+            difficulty=term.difficulty, created_at=term.created_at,
+        )
+        for term in terms
+    ])
+
+
+async def catalog_after(db) -> bytes:
+    return term_list_json.dump(await fetch_all(db, terms_query()))
+
+
+async def vocabulary_before(db) -> bytes:
+    result = await db.execute(
+        select(VocabularyItem).options(joinedload(VocabularyItem.term)).where(VocabularyItem.user_id == USER_ID)
+    )
+    items = [
+        {
+            "id": item.id, "term_id": item.term_id, "term": item.term.term,
+            "formal_definition": item.term.formal_definition, "simple_definition": item.term.simple_definition,
+            "example": item.term.example, "why_it_matters": item.term.why_it_matters,
+            "category": item.term.category, "category_id": item.term.category_id,
+            "difficulty": item.term.difficulty, "saved_at": item.saved_at,
+            "review_count": item.review_count, "last_score": item.last_score,
+        }
+        for item in result.scalars().all()
+    ]
+    return vocabulary_json.dump({"items": items, "total": len(items)})
+
+
+async def vocabulary_after(db) -> bytes:
+    items = await fetch_all(db, vocabulary_query(USER_ID))
+    return vocabulary_json.dump({"items": items, "total": len(items)})
+
+
+CASES = {
+    "catalog": (catalog_before, catalog_after),
+    "vocabulary": (vocabulary_before, vocabulary_after),
+}
+
+
+async def run(count: int, runs: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        await seed(engine, count)
+
+        async def request(handler) -> bytes:
+            async with sessions() as db:
+                return await handler(db)
+
+        print(f"{count} rows per request, best of {runs} runs")
+        for name, handlers in CASES.items():
+            bodies = [await request(handler) for handler in handlers]
+            assert json.loads(bodies[0]) == json.loads(bodies[1]), f"{name}: responses differ"
+
+            results = {}
+            for label, handler in zip(("before", "after"), handlers):
+                times = []
+                for _ in range(runs):
+                    gc.collect()
+                    started = time.perf_counter()
+                    await request(handler)
+                    times.append(time.perf_counter() - started)
+                gc.collect()
+                tracemalloc.start()
+                await request(handler)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                results[label] = min(times)
+                print(f"  {name:<10} {label:<6} {min(times) * 1000:7.1f} ms/request  "
+                      f"{min(times) / count * 1e6:5.1f} us/row  {peak / count:6.0f} B/row peak")
+            print(f"  {name:<10} speedup {results['before'] / results['after']:.1f}x")
+
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.runs))
+
+
+if __name__ == "__main__":
+    main()
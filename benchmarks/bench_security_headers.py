@@ -0,0 +1,110 @@
+"""
+Per-request cost of the security headers middleware.
+
+Calls a bare Starlette app directly through ASGI (no server, no sockets)
+and compares three stacks: no middleware, the old BaseHTTPMiddleware
+version and the ASGI SecurityHeadersMiddleware.
+
+Usage:
+    python benchmarks/bench_security_headers.py [--requests 20000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.security_headers import SecurityHeadersMiddleware
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """The implementation app/main.py used before"""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Strict-Transport-Security"] = ""
+        return response
+
+
+async def health(request):
+    return JSONResponse({"status": "healthy"})
+
+
+def build(middleware=None):
+    app = Starlette(routes=[Route("/health", health)])
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+def scope(path: str) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+
+def receiver():
+    """ASGI receive: the (empty) request body, then block like a server with no disconnect"""
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    return receive
+
+
+async def time_requests(app, count: int) -> float:
+    """Microseconds per request"""
+    request_scope = scope("/health")
+
+    async def send(message):
+        pass
+
+    for _ in range(200):
+        await app(dict(request_scope), receiver(), send)
+    started = time.perf_counter()
+    for _ in range(count):
+        await app(dict(request_scope), receiver(), send)
+    return (time.perf_counter() - started) / count * 1e6
+
+
+async def run(count: int):
+    stacks = {
+        "no middleware": build(),
+        "BaseHTTPMiddleware": build(LegacySecurityHeadersMiddleware),
+        "ASGI middleware": build(SecurityHeadersMiddleware),
+    }
+    baseline = None
+    print(f"{count} requests per stack")
+    for name, app in stacks.items():
+        per_request = await time_requests(app, count)
+        baseline = per_request if baseline is None else baseline
+        print(f"  {name:<20} {per_request:7.1f} us/request   overhead {per_request - baseline:6.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
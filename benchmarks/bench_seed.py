@@ -0,0 +1,54 @@
+"""
+Seeder benchmark: full load, no-op re-run and a 1% change on a synthetic catalog.
+
+Usage:
+    python benchmarks/bench_seed.py [--terms 20000] [--database-url postgresql://...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+def synthetic_catalog(count: int, revision: str = "") -> list:
+    return [
+        {
+            "term": f"Synthetic term {i}", "category": f"category-{i % 17}", "difficulty": i % 3 + 1,
+            "formal_definition": f"Formal definition of synthetic term {i}{revision if i % 100 == 0 else ''}.",
+            "simple_definition": f"Simple definition {i}.", "example": f"Example {i}", "why_it_matters": "It matters.",
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--terms", type=int, default=20000)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'seed.db')}")
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    from seed import seed_terms
+
+    engine = create_engine(os.environ["DATABASE_URL"])
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    print(f"DB: {os.environ['DATABASE_URL'].split('@')[-1]}  terms={args.terms}")
+    for label, catalog in (
+        ("initial load", synthetic_catalog(args.terms)),
+        ("no changes", synthetic_catalog(args.terms)),
+        ("1% changed", synthetic_catalog(args.terms, revision=" (revised)")),
+    ):
+        stats = seed_terms(catalog, session_factory)
+        print(f"  {label:<13} {stats['ms']:9.1f} ms   inserted {stats['inserted']:6}   updated {stats['updated']:6}")
+
+
+if __name__ == "__main__":
+    main()
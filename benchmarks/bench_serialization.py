@@ -0,0 +1,121 @@
+"""
+Serialization cost of /terms/all with a large catalog.
+
+Calls a FastAPI app directly through ASGI with the database left out: the
+handlers return the same in-memory Term rows, and the timing covers only
+turning them into a JSON response body.
+    before  TermResponse built per row, then FastAPI re-validates and
+            serializes through response_model (the old handler)
+    after   FastJSON: one validation from attributes, JSON bytes written by
+            pydantic-core (app/responses.py)
+Both must produce identical JSON. Reports the best of --runs, like timeit.
+
+Usage:
+    python benchmarks/bench_serialization.py [--terms 10000] [--runs 20]
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+# app.models needs a database URL to import; nothing connects to it
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import FastAPI
+
+from app.models import Term
+from app.responses import FastJSON
+from app.schemas import TermResponse
+
+
+def synthetic_terms(count: int) -> list:
+    return [
+        Term(
+            id=i, term=f"Term {i}", category=f"category-{i % 17}", category_id=i % 17 + 1, difficulty=i % 3 + 1,
+            formal_definition=f"Formal definition of term {i}, long enough to look like a real one. " * 2,
+            simple_definition=f"Simple definition of term {i}.", example=f"Example use of term {i}" if i % 4 else None,
+            why_it_matters="It shows up in interviews and in production incidents.",
+            created_at=datetime(2025, 1, 1, 12, i % 60, i % 60),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def build_app(terms: list) -> FastAPI:
+    app = FastAPI()
+    term_list_json = FastJSON(list[TermResponse])
+
+    @app.get("/before", response_model=list[TermResponse])
+    async def before():
+        return [
+            TermResponse(
+                id=term.id, term=term.term, formal_definition=term.formal_definition,
+                simple_definition=term.simple_definition, example=term.example,
+                why_it_matters=term.why_it_matters, category=term.category, category_id=term.category_id,
+                difficulty=term.difficulty, created_at=term.created_at,
+            )
+            for term in terms
+        ]
+
+    @app.get("/after", response_model=list[TermResponse])
+    async def after():
+        return term_list_json.response(terms)
+
+    return app
+
+
+async def request(app, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def run(count: int, runs: int):
+    terms = synthetic_terms(count)
+    app = build_app(terms)
+    bodies = {path: await request(app, path) for path in ("/before", "/after")}
+    assert json.loads(bodies["/before"]) == json.loads(bodies["/after"]), "responses differ"
+
+    print(f"{count} terms, {len(bodies['/after']) / 1e6:.1f} MB of JSON, best of {runs} runs")
+    results = {}
+    for path in ("/before", "/after"):
+        times = []
+        for _ in range(runs):
+            gc.collect()
+            started = time.perf_counter()
+            await request(app, path)
+            times.append(time.perf_counter() - started)
+        results[path] = min(times)
+        print(f"  {path[1:]:<7} {results[path] * 1000:8.1f} ms/request   {results[path] / count * 1e6:6.2f} us/term")
+    print(f"  speedup {results['/before'] / results['/after']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--terms", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.terms, args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Startup-to-ready benchmark for STARTUP_MODE=bootstrap vs verify.
+
+Initializes a throwaway database once with init_db.py, then repeatedly starts
+the API (optionally several processes at once, like workers of one deploy)
+and measures how long it takes until every process answers /health. uvicorn
+only starts accepting connections after the lifespan startup has finished.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--processes 4]
+        [--database-url postgresql://...]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_db_concurrency import REPO_ROOT, free_port, start_server, wait_ready
+
+MODES = ("bootstrap", "verify")
+
+
+def time_startup(database_url: str, mode: str, processes: int) -> float:
+    """Seconds from spawning `processes` servers until all of them are ready"""
+    ports = [free_port() for _ in range(processes)]
+    start = time.perf_counter()
+    servers = [start_server(REPO_ROOT, database_url, port, {"STARTUP_MODE": mode}) for port in ports]
+    try:
+        with ThreadPoolExecutor(processes) as pool:
+            list(pool.map(lambda port: wait_ready(f"http://127.0.0.1:{port}"), ports))
+        return time.perf_counter() - start
+    finally:
+        for server in servers:
+            server.terminate()
+        for server in servers:
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--processes", type=int, default=1, help="Servers started together")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    subprocess.run(
+        [sys.executable, "init_db.py"], cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL,
+        env={**os.environ, "DATABASE_URL": database_url,
+             "SECRET_KEY": os.getenv("SECRET_KEY", "benchmark-secret"), "ALGORITHM": os.getenv("ALGORITHM", "HS256")},
+    )
+
+    print(f"DB: {database_url.split('@')[-1]}  processes={args.processes}  runs={args.runs}")
+    for mode in MODES:
+        times = [time_startup(database_url, mode, args.processes) for _ in range(args.runs)]
+        print(f"  {mode:<10} median {statistics.median(times) * 1000:7.0f} ms   "
+              f"min {min(times) * 1000:7.0f} ms   max {max(times) * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
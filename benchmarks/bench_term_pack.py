@@ -0,0 +1,61 @@
+"""
+Catalog load benchmark: importing app/data/terms modules vs the compiled pack.
+
+Each measurement runs in a fresh interpreter and times loading every term
+(import + iterate, stdlib imports excluded), plus the process's peak RSS.
+"cold" uses an empty bytecode cache, like a container built with
+PYTHONDONTWRITEBYTECODE=1; "warm" reuses compiled .pyc files.
+
+Usage:
+    python benchmarks/bench_term_pack.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, resource, time
+# stdlib the app imports anyway - keep it out of the measurement
+import hashlib, importlib, logging, mmap, struct
+start = time.perf_counter()
+from app.data.terms import get_pack, iter_terms
+count = sum(1 for _ in iter_terms())
+elapsed = time.perf_counter() - start
+print(json.dumps({"ms": elapsed * 1000, "count": count, "pack": get_pack() is not None,
+                  "rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))
+"""
+
+
+def measure(pack_path: str, pycache: str) -> dict:
+    env = {**os.environ, "TERM_PACK_PATH": pack_path, "PYTHONPYCACHEPREFIX": pycache}
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=REPO_ROOT, env=env,
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    subprocess.run([sys.executable, "build_term_pack.py"], cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL)
+    pack_path = os.path.join(REPO_ROOT, "app", "data", "terms", "terms.pack")
+    warm_cache = tempfile.mkdtemp()
+    for source, path in (("modules", os.path.join(warm_cache, "missing.pack")), ("pack", pack_path)):
+        measure(path, warm_cache)  # populate the warm bytecode cache
+        for cache in ("cold", "warm"):
+            results = [measure(path, tempfile.mkdtemp() if cache == "cold" else warm_cache) for _ in range(args.runs)]
+            assert all(r["pack"] == (source == "pack") for r in results)
+            print(f"  {source:<8} {cache:<5} {statistics.median(r['ms'] for r in results):7.1f} ms   "
+                  f"peak RSS {statistics.median(r['rss_kb'] for r in results) / 1024:6.1f} MB   "
+                  f"({results[0]['count']} terms)")
+
+
+if __name__ == "__main__":
+    main()
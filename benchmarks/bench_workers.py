@@ -0,0 +1,135 @@
+"""
+Throughput of the gunicorn entry point at several worker counts.
+
+Initializes a throwaway database with init_db.py, then for each worker count
+starts `gunicorn -c gunicorn.conf.py` and drives /health and
+/terms/{id}/related with concurrent clients from several load processes.
+Reports requests per second, latency and memory per worker: Pss counts pages
+shared with the master and the other workers fractionally, Private counts
+pages this worker has to itself.
+
+Throughput can only grow with workers up to the number of free cores, and
+the load generator needs cores too.
+
+Usage:
+    python benchmarks/bench_workers.py [--workers 1 2 4 8] [--concurrency 64]
+        [--duration 10] [--load-processes 2] [--no-preload]
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from bench_db_concurrency import REPO_ROOT, free_port, run_load, wait_ready
+
+ENDPOINTS = {
+    "/health": lambda: "/health",
+    "/terms/{id}/related": lambda: f"/api/v1/terms/{random.randint(1, 300)}/related",
+}
+
+
+def start_gunicorn(database_url: str, port: int, workers: int, preload: bool, tmpdir: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "SECRET_KEY": os.getenv("SECRET_KEY", "benchmark-secret"),
+        "ALGORITHM": os.getenv("ALGORITHM", "HS256"),
+        "LOG_LEVEL": "WARNING",
+        "WEB_CONCURRENCY": str(workers),
+        "WEB_BIND": f"127.0.0.1:{port}",
+        "PRELOAD_CACHES": "true" if preload else "false",
+        "RATE_LIMIT_STORAGE": f"sqlite:///{os.path.join(tmpdir, 'limits.db')}",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "--access-logfile", "/dev/null"],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def worker_pids(master: int) -> list:
+    with open(f"/proc/{master}/task/{master}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def memory_mb(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if rest.strip().endswith("kB"):
+                fields[name] = int(rest.split()[0]) / 1024
+    return {"pss": fields["Pss"], "private": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def load(base_url: str, path: str, headers: dict, concurrency: int, duration: float) -> dict:
+    return asyncio.run(run_load(base_url, ENDPOINTS[path], headers, concurrency, duration))
+
+
+def measure(base_url: str, path: str, headers: dict, concurrency: int, duration: float, processes: int) -> dict:
+    with ProcessPoolExecutor(processes) as pool:
+        futures = [pool.submit(load, base_url, path, headers, concurrency // processes, duration)
+                   for _ in range(processes)]
+        results = [f.result() for f in futures]
+    return {
+        "rps": sum(r["rps"] for r in results),
+        "p50_ms": statistics.median(r["p50_ms"] for r in results),
+        "p99_ms": max(r["p99_ms"] for r in results),
+        "errors": sum(r["errors"] for r in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--concurrency", type=int, default=64, help="Total concurrent clients")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--load-processes", type=int, default=2)
+    parser.add_argument("--no-preload", action="store_true", help="Let each worker build its own caches")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    subprocess.run(
+        [sys.executable, "init_db.py"], cwd=REPO_ROOT, check=True, stdout=subprocess.DEVNULL,
+        env={**os.environ, "DATABASE_URL": database_url,
+             "SECRET_KEY": os.getenv("SECRET_KEY", "benchmark-secret"), "ALGORITHM": os.getenv("ALGORITHM", "HS256")},
+    )
+
+    print(f"CPUs: {len(os.sched_getaffinity(0))}  concurrency={args.concurrency}  "
+          f"load processes={args.load_processes}  preload={not args.no_preload}")
+    for workers in args.workers:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_gunicorn(database_url, port, workers, not args.no_preload, tmpdir)
+        try:
+            wait_ready(base_url)
+            while len(worker_pids(server.pid)) < workers:
+                time.sleep(0.1)
+            time.sleep(1)
+            creds = {"email": f"bench{random.randint(0, 10**9)}@example.com", "password": "benchmark-pass"}
+            token = httpx.post(f"{base_url}/api/v1/auth/register", json=creds, timeout=30).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+
+            print(f"  {workers} worker(s)")
+            for path in ENDPOINTS:
+                stats = measure(base_url, path, headers, args.concurrency, args.duration, args.load_processes)
+                print(f"    {path:<22} {stats['rps']:8.1f} req/s   p50 {stats['p50_ms']:7.1f} ms   "
+                      f"p99 {stats['p99_ms']:7.1f} ms   errors {stats['errors']}")
+            memory = [memory_mb(pid) for pid in worker_pids(server.pid)]
+            print(f"    memory per worker      Pss {statistics.mean(m['pss'] for m in memory):6.1f} MB   "
+                  f"Private {statistics.mean(m['private'] for m in memory):6.1f} MB")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
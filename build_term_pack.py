@@ -0,0 +1,29 @@
+"""
+Compile the catalog modules in app/data/terms into app/data/terms/terms.pack.
+
+Run after editing any term module (the Docker build runs it). Without an
+up-to-date pack the app still works, it just imports the modules instead.
+
+Usage:
+    python build_term_pack.py
+    python build_term_pack.py --check   # exit 1 if the pack is missing or stale
+"""
+import argparse
+
+from app.data.term_pack import write_pack
+from app.data.terms import PACK_PATH, get_pack, load_from_modules, source_hash
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile catalog terms into a data pack")
+    parser.add_argument("--check", action="store_true", help="Only check that the pack is up to date")
+    parser.add_argument("--output", default=PACK_PATH)
+    args = parser.parse_args()
+
+    if args.check:
+        if get_pack() is None:
+            print(f"❌ {PACK_PATH} is missing or out of date")
+            raise SystemExit(1)
+        print(f"✅ {PACK_PATH} is up to date")
+    else:
+        count = write_pack(load_from_modules(), args.output, source_hash())
+        print(f"📦 Wrote {count} terms to {args.output}")
@@ -0,0 +1,65 @@
+"""
+Pick BCRYPT_ROUNDS for this host.
+
+Times bcrypt hashing at increasing cost factors and recommends the highest
+cost whose median hash time stays within the target. Run it on (or on the
+same instance type as) the deployment host, with nothing else busy. Each
+extra round doubles the time, so measuring stops at the first cost over the
+target.
+
+Logins run bcrypt on the PASSWORD_HASH_WORKERS threads, so a login burst
+queues behind these numbers. Keep the target well under the login latency
+you can accept.
+
+Usage:
+    python calibrate_bcrypt.py [--target-ms 250] [--samples 5]
+"""
+import argparse
+import statistics
+import time
+from typing import Optional
+
+from app.auth.auth_utils import BCRYPT_ROUNDS, make_context
+
+MIN_ROUNDS = 10  # OWASP's floor for bcrypt
+MAX_ROUNDS = 16
+
+
+def median_hash_ms(rounds: int, samples: int) -> float:
+    context = make_context(rounds)
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash("calibration-password")
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def calibrate(target_ms: float, samples: int) -> Optional[int]:
+    """Highest cost within the target, or None if even MIN_ROUNDS is over it"""
+    chosen = None
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        ms = median_hash_ms(rounds, samples)
+        fits = ms <= target_ms
+        marker = "current" if rounds == BCRYPT_ROUNDS else ""
+        print(f"  rounds {rounds:2d}  {ms:8.1f} ms  {'✅' if fits else '❌'} {marker}")
+        if not fits:
+            break
+        chosen = rounds
+    return chosen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recommend a bcrypt cost factor for this host")
+    parser.add_argument("--target-ms", type=float, default=250, help="Acceptable time per hash (default 250)")
+    parser.add_argument("--samples", type=int, default=5, help="Hashes timed per cost (default 5)")
+    args = parser.parse_args()
+
+    print(f"⏱️  Timing bcrypt (target {args.target_ms:.0f} ms per hash)")
+    rounds = calibrate(args.target_ms, args.samples)
+    if rounds is None:
+        print(f"⚠️  Even {MIN_ROUNDS} rounds is over the target - not going below {MIN_ROUNDS}")
+        rounds = MIN_ROUNDS
+    print(f"\n👉 BCRYPT_ROUNDS={rounds}  (currently {BCRYPT_ROUNDS})")
+    if rounds != BCRYPT_ROUNDS:
+        print("   Existing hashes are rehashed with the new cost as users log in.")
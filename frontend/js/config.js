@@ -27,6 +27,103 @@ const config = {
     // Get the full API URL
     get API_URL() {
         return this.getApiUrl();
+    },
+
+    // ============================================
+    // Session: short-lived access token + rotating refresh token
+    // ============================================
+
+    // Store the tokens returned by /auth/login, /auth/register and /auth/refresh
+    saveSession(data) {
+        localStorage.setItem('token', data.access_token);
+        if (data.refresh_token) {
+            localStorage.setItem('refresh_token', data.refresh_token);
+        }
+    },
+
+    clearSession() {
+        localStorage.removeItem('token');
+        localStorage.removeItem('refresh_token');
+    },
+
+    // Seconds until the access token expires (its "expires" claim), or 0 if unreadable
+    accessTokenTtl() {
+        const token = localStorage.getItem('token');
+        try {
+            const payload = JSON.parse(atob(token.split('.')[1].replace(/-/g, '+').replace(/_/g, '/')));
+            return payload.expires - Date.now() / 1000;
+        } catch (e) {
+            return 0;
+        }
+    },
+
+    // Trade the refresh token for a new pair. Concurrent callers share one request,
+    // so a page firing several API calls at once rotates the token only once.
+    refreshSession() {
+        if (!this._refreshing) {
+            this._refreshing = (async () => {
+                const refreshToken = localStorage.getItem('refresh_token');
+                if (!refreshToken) {
+                    return false;
+                }
+                try {
+                    const response = await fetch(`${this.API_URL}/auth/refresh`, {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({ refresh_token: refreshToken })
+                    });
+                    if (!response.ok) {
+                        return false;
+                    }
+                    this.saveSession(await response.json());
+                    return true;
+                } catch (e) {
+                    return false;
+                }
+            })().finally(() => { this._refreshing = null; });
+        }
+        return this._refreshing;
+    },
+
+    // fetch() for authenticated endpoints: path is relative to API_URL. Refreshes the
+    // access token shortly before it expires, retries once after a 401/403, and
+    // sends the user to the login page when the session can't be renewed.
+    async apiFetch(path, options = {}) {
+        if (this.accessTokenTtl() < 60) {
+            await this.refreshSession();
+        }
+        const send = () => fetch(`${this.API_URL}${path}`, {
+            ...options,
+            headers: { ...(options.headers || {}), 'Authorization': `Bearer ${localStorage.getItem('token')}` }
+        });
+
+        let response = await send();
+        if (response.status === 401 || response.status === 403) {
+            if (await this.refreshSession()) {
+                response = await send();
+            } else {
+                this.clearSession();
+                window.location.href = 'index.html';
+            }
+        }
+        return response;
+    },
+
+    async logout() {
+        const refreshToken = localStorage.getItem('refresh_token');
+        this.clearSession();
+        if (refreshToken) {
+            try {
+                await fetch(`${this.API_URL}/auth/logout`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ refresh_token: refreshToken })
+                });
+            } catch (e) {
+                // Nothing to do - the refresh token expires on its own
+            }
+        }
+        window.location.href = 'index.html';
     }
 };
 
@@ -0,0 +1,333 @@
+"""
+Bulk term-generation pipeline for the questions in interview_questions_raw.py.
+
+Steps:
+    1. Parse raw_question_block into questions, tracking section headings
+    2. Drop questions already in the catalog/database (near-duplicate check)
+    3. Generate term content with the AI client, with bounded concurrency
+       and a token-bucket rate limit; every result is appended to a JSONL
+       checkpoint so a crashed run resumes where it stopped
+    4. Write approved terms in bulk to the database, or to a data module
+       for review before it is added to app/data/terms
+
+Usage:
+    python generate_terms.py --dry-run                       # parse + dedupe only
+    python generate_terms.py --write module                  # -> app/data/terms/generated.py
+    python generate_terms.py --write db --concurrency 4 --rate 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.data.terms import ALL_TERMS
+from app.services.ai_usage import AIBudgetExceeded
+from app.services.near_duplicates import NearDuplicateIndex
+from app.services.throttle import TokenBucket
+
+DEFAULT_CHECKPOINT = "generated_terms.jsonl"
+DEFAULT_MODULE_PATH = "app/data/terms/generated.py"
+
+# Section headings in the raw block -> catalog category
+SECTION_CATEGORIES = {
+    "linux": "linux",
+    "networking": "networking",
+    "git": "git",
+    "aws": "aws",
+    "azure": "azure",
+    "terraform": "terraform",
+    "docker & k8s": "docker-kubernetes",
+    "ansible": "ansible",
+    "ci/cd": "ci-cd",
+    "devops methodology, practices, & agile": "agile-methodology",
+    "cdn & caching": "cdn-caching",
+    "api design": "api-design",
+    "databases": "databases",
+    "general": "swe",
+    "security": "security",
+    "system design": "system-design",
+    "data": "databases",
+    "data engineering": "databases",
+    "sql": "databases",
+    "cyber security & info security": "security",
+    "compliance": "security",
+    "encryption and authentication": "security",
+    "owasp top 10, pentesting and/or web applications": "security",
+    "data architect": "databases",
+}
+
+# Words a question line usually starts with (lines without "?" that don't
+# start like this are headings such as "SQL" or "Machine Learning")
+QUESTION_STARTS = (
+    "what", "how", "why", "when", "where", "which", "who", "explain", "describe",
+    "define", "difference", "differentiate", "compare", "name", "implement", "write",
+    "can", "could", "does", "do", "is", "are", "should", "would", "i ", "a ", "you",
+    "in ", "list", "give", "tell", "please", "summarise", "summarize", "state",
+)
+
+FIELD_ORDER = ("category", "term", "difficulty", "formal_definition",
+               "simple_definition", "example", "why_it_matters")
+
+
+def parse_questions(block: str) -> List[Dict[str, Optional[str]]]:
+    """
+    Split the raw block into questions with their section and subsection.
+
+    "🔹 AWS" lines and bare headings like "SQL" start a section, lines ending
+    with ":" or wrapped in dashes start a subsection. The block opens with
+    Linux questions before any heading.
+    """
+    questions = []
+    section, subsection = "Linux", None
+    seen = set()
+    for raw_line in block.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if line.startswith("🔹"):
+            section, subsection = line.lstrip("🔹").strip(), None
+            continue
+        if line.startswith("$"):
+            # Shell snippet belonging to the previous question
+            continue
+        if line.endswith(":") or re.fullmatch(r"-{2,}.+-{2,}", line):
+            subsection = line.strip("-:").strip()
+            continue
+        lowered = line.lower()
+        is_question = (
+            line.endswith("?")
+            or lowered.startswith(QUESTION_STARTS)
+            or " vs " in lowered
+            or len(line.split()) > 8
+        )
+        if not is_question:
+            section, subsection = line, None
+            continue
+        if lowered in seen:
+            continue
+        seen.add(lowered)
+        questions.append({
+            "question": line,
+            "section": section,
+            "subsection": subsection,
+            "category_hint": SECTION_CATEGORIES.get(section.lower()),
+        })
+    return questions
+
+
+def remove_known(questions: List[dict], known_terms: Iterable[str]) -> tuple:
+    """
+    Drop questions that near-duplicate a known term or an earlier question.
+
+    Returns (fresh questions, list of (question, matching term)).
+    """
+    index = NearDuplicateIndex()
+    for position, name in enumerate(known_terms):
+        index.add(f"known:{position}", name)
+
+    fresh, skipped = [], []
+    for position, item in enumerate(questions):
+        matches = index.query(item["question"])
+        if matches:
+            skipped.append((item["question"], index.text(matches[0][0])))
+            continue
+        index.add(f"question:{position}", item["question"])
+        fresh.append(item)
+    return fresh, skipped
+
+
+def load_checkpoint(path: str) -> Dict[str, dict]:
+    """Latest record per question from the JSONL checkpoint"""
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write leaves a partial last line; it is retried
+                continue
+            records[record["question"]] = record
+    return records
+
+
+async def generate_all(
+    questions: List[dict],
+    checkpoint_path: str,
+    concurrency: int = 4,
+    rate_per_minute: float = 30,
+    retries: int = 2,
+    generate: Optional[Callable] = None,
+) -> Dict[str, dict]:
+    """
+    Generate content for every question not already finished in the checkpoint.
+
+    Records with status "generated" or "rejected" are final; "failed" ones are
+    retried on the next run.
+    """
+    if generate is None:
+        from app.services.ai_client import generate_term_content
+        generate = generate_term_content
+
+    records = load_checkpoint(checkpoint_path)
+    pending = [q for q in questions if records.get(q["question"], {}).get("status") not in ("generated", "rejected")]
+    print(f"📋 {len(questions) - len(pending)} question(s) already done, {len(pending)} to generate")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rate_per_minute, burst=concurrency)
+    write_lock = asyncio.Lock()
+    budget_hit = asyncio.Event()
+
+    with open(checkpoint_path, "a") as checkpoint:
+
+        async def process(item: dict) -> None:
+            async with semaphore:
+                result = None
+                for attempt in range(retries + 1):
+                    if budget_hit.is_set():
+                        return
+                    await bucket.acquire()
+                    try:
+                        result = await asyncio.to_thread(generate, item["question"], item["category_hint"])
+                    except AIBudgetExceeded as e:
+                        print(f"⛔ {e}")
+                        budget_hit.set()
+                        return
+                    if result is not None:
+                        break
+                    if attempt < retries:
+                        await asyncio.sleep(2 ** attempt)
+
+                if result is None:
+                    status = "failed"
+                elif result.get("approved"):
+                    status = "generated"
+                else:
+                    status = "rejected"
+                record = {**item, "status": status, "result": result}
+                async with write_lock:
+                    checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    checkpoint.flush()
+                records[item["question"]] = record
+                print(f"  [{status}] {item['question']}")
+
+        await asyncio.gather(*(process(item) for item in pending))
+
+    return records
+
+
+def to_term(record: dict) -> dict:
+    """Catalog-shaped term dict from a generated checkpoint record"""
+    result = record["result"]
+    return {
+        "category": result["category"],
+        "term": record["question"],
+        "difficulty": int(result.get("difficulty") or 1),
+        "formal_definition": result["formal_definition"],
+        "simple_definition": result["simple_definition"],
+        "example": result.get("example"),
+        "why_it_matters": result.get("why_it_matters"),
+    }
+
+
+def write_module(terms: List[dict], path: str, variable: str = "generated") -> None:
+    """Write terms as a data module in the same layout as app/data/terms/*.py"""
+    lines = [f"{variable} = ["]
+    current_category = None
+    for term in sorted(terms, key=lambda t: (t["category"], t["difficulty"], t["term"])):
+        if term["category"] != current_category:
+            current_category = term["category"]
+            lines.append(f"    # ---------------------- {current_category} ----------------------")
+        lines.append("    {")
+        fields = [
+            f"        \"{key}\": {json.dumps(term[key], ensure_ascii=False) if term[key] is not None else 'None'}"
+            for key in FIELD_ORDER
+        ]
+        lines.append(",\n".join(fields))
+        lines.append("    },")
+    lines.append("]")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_database(terms: List[dict]) -> int:
+    """Insert terms that aren't in the database yet with one executemany"""
+    from sqlalchemy import insert
+    from app.database import SessionLocal
+    from app.models import Term
+    from app.services.cache_bus import TERMS, publish_sync
+    from seed import content_hash
+
+    db = SessionLocal()
+    try:
+        existing = {name.strip().lower() for (name,) in db.query(Term.term).all()}
+        # With their content hash, so seed.py sees them as unchanged once they reach the catalog
+        rows = [{**t, "content_hash": content_hash(t)} for t in terms if t["term"].strip().lower() not in existing]
+        if rows:
+            db.execute(insert(Term), rows)
+            publish_sync(db, TERMS)
+            db.commit()
+        return len(rows)
+    finally:
+        db.close()
+
+
+def known_term_names(include_db: bool) -> List[str]:
+    names = [t["term"] for t in ALL_TERMS]
+    if include_db:
+        try:
+            from app.database import SessionLocal
+            from app.models import Term
+
+            db = SessionLocal()
+            try:
+                names += [name for (name,) in db.query(Term.term).all()]
+            finally:
+                db.close()
+        except Exception as e:
+            print(f"⚠️  Database terms skipped for dedupe: {e}")
+    return names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate catalog terms from interview_questions_raw.py")
+    parser.add_argument("--write", choices=["db", "module"], default="module", help="Where approved terms go")
+    parser.add_argument("--module-path", default=DEFAULT_MODULE_PATH)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="JSONL progress file (resumable)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Max AI calls in flight")
+    parser.add_argument("--rate", type=float, default=30, help="Max AI calls per minute")
+    parser.add_argument("--limit", type=int, default=None, help="Only process the first N new questions")
+    parser.add_argument("--no-db", action="store_true", help="Don't read database terms for dedupe")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and dedupe only")
+    args = parser.parse_args()
+
+    from interview_questions_raw import raw_question_block
+
+    questions = parse_questions(raw_question_block)
+    fresh, skipped = remove_known(questions, known_term_names(include_db=not args.no_db and args.write == "db"))
+    print(f"🔍 Parsed {len(questions)} questions: {len(skipped)} already covered, {len(fresh)} new")
+    if args.limit is not None:
+        fresh = fresh[:args.limit]
+
+    if args.dry_run:
+        for item in fresh:
+            print(f"  [{item['section']}] {item['question']}")
+        raise SystemExit(0)
+
+    records = asyncio.run(generate_all(fresh, args.checkpoint, args.concurrency, args.rate))
+    wanted = {item["question"] for item in fresh}
+    terms = [to_term(r) for q, r in records.items() if q in wanted and r["status"] == "generated"]
+    failed = sum(1 for q, r in records.items() if q in wanted and r["status"] == "failed")
+
+    if args.write == "db":
+        inserted = write_database(terms)
+        print(f"✅ Inserted {inserted} term(s) into the database ({failed} failed, rerun to retry)")
+    else:
+        write_module(terms, args.module_path)
+        print(f"✅ Wrote {len(terms)} term(s) to {args.module_path} for review ({failed} failed, rerun to retry)")
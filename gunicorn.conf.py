@@ -0,0 +1,55 @@
+"""
+Gunicorn settings for serving the API with several worker processes
+
+Usage:
+    gunicorn -c gunicorn.conf.py
+
+The app is imported once in the master (preload_app) and the term caches are
+built there too, then gc.freeze() moves everything to the permanent generation
+so the workers' garbage collector doesn't write to (and un-share) those pages.
+
+Settings:
+    WEB_CONCURRENCY  worker processes (default: CPUs available to this process)
+    WEB_BIND         listen address (default 0.0.0.0:8001)
+    WEB_BACKLOG      pending connections the kernel queues (default 2048)
+    WEB_KEEPALIVE    seconds an idle keep-alive connection stays open (default 65).
+                     Must exceed the load balancer's idle timeout (60 s on an
+                     ALB), or the ALB may reuse a connection we just closed (502)
+    WEB_TIMEOUT      seconds before a stuck worker is restarted (default 30)
+    PRELOAD_CACHES   build the term caches before forking (default true)
+
+STARTUP_MODE defaults to verify here, whatever ENVIRONMENT is: bootstrap would
+run migrations in every worker at once, so run `python init_db.py` first or
+the app refuses to start. RATE_LIMIT_STORAGE defaults
+to a SQLite file so the workers share one rate limit budget.
+"""
+import gc
+import os
+
+workers = int(os.getenv("WEB_CONCURRENCY", len(os.sched_getaffinity(0))))
+bind = os.getenv("WEB_BIND", "0.0.0.0:8001")
+backlog = int(os.getenv("WEB_BACKLOG", "2048"))
+keepalive = int(os.getenv("WEB_KEEPALIVE", "65"))
+timeout = int(os.getenv("WEB_TIMEOUT", "30"))
+graceful_timeout = timeout
+PRELOAD_CACHES = os.getenv("PRELOAD_CACHES", "true").lower() in ("1", "true", "yes")
+
+wsgi_app = "app.main:app"
+worker_class = "app.serving.UvicornWorker"
+preload_app = True
+accesslog = "-"
+
+# Read when app.main is imported, which happens after this file
+os.environ.setdefault("STARTUP_MODE", "verify")
+os.environ.setdefault("RATE_LIMIT_STORAGE", "sqlite:////tmp/stacktutor-ratelimits.db")
+
+
+def when_ready(server):
+    # Runs in the master after the app is loaded, before any worker is forked
+    if PRELOAD_CACHES:
+        from app.serving import preload_caches
+        preload_caches()
+
+
+def pre_fork(server, worker):
+    gc.freeze()
@@ -0,0 +1,97 @@
+"""
+One-shot database setup: tables, migrations and seed data.
+
+Run once per deploy before the API starts (the `init` service in
+docker-compose.prod.yml does this), then start the API with STARTUP_MODE=verify
+so workers only check the schema revision. Safe to re-run.
+
+1. create_all() creates any table that doesn't exist yet (fresh database)
+2. a database that has never been migrated is stamped at the baseline revision
+3. alembic upgrade head (migrations skip changes create_all already made)
+4. on Postgres, upcoming quiz_attempts partitions are created
+   (partition_quiz_attempts.py ensure)
+5. catalog terms are seeded incrementally (see seed.py)
+
+Usage:
+    python init_db.py
+    python init_db.py --no-seed
+    python init_db.py --check      # exit 1 unless the database is at the head revision
+"""
+import argparse
+import asyncio
+import os
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+# First revision - the schema create_all() produced before migrations were used
+BASELINE_REVISION = "f41def64bc68"
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    # Built in code rather than from alembic.ini: env.py only reconfigures
+    # logging when there's a config file, and the API has its own logging
+    cfg = Config()
+    cfg.set_main_option("script_location", os.path.join(REPO_ROOT, "alembic"))
+    return cfg
+
+
+def current_revisions(engine) -> set:
+    try:
+        with engine.connect() as conn:
+            return set(conn.execute(text("SELECT version_num FROM alembic_version")).scalars())
+    except DBAPIError:
+        return set()
+
+
+def init_database(seed: bool = True) -> None:
+    from alembic import command
+    from app.database import Base, engine
+    import app.models  # noqa: F401 - registers the tables on Base.metadata
+
+    Base.metadata.create_all(bind=engine)
+    print("✅ Tables created/verified")
+
+    cfg = alembic_config()
+    if not current_revisions(engine):
+        command.stamp(cfg, BASELINE_REVISION)
+        print(f"🔖 Stamped baseline revision {BASELINE_REVISION}")
+    command.upgrade(cfg, "head")
+    print(f"✅ Migrated to {', '.join(sorted(current_revisions(engine)))}")
+
+    if engine.dialect.name == "postgresql":
+        from partition_quiz_attempts import ensure_partitions, is_partitioned
+        with engine.connect() as conn:
+            partitioned = is_partitioned(conn)
+        if partitioned:
+            created = ensure_partitions(engine)
+            print(f"🗓️  quiz_attempts partitions created: {', '.join(created)}" if created
+                  else "🗓️  quiz_attempts partitions already in place")
+
+    if seed:
+        from seed import seed_terms
+        stats = seed_terms()
+        print(f"🌱 Terms: {stats['inserted']} inserted, {stats['updated']} updated, "
+              f"{stats['unchanged']} unchanged, {stats['skipped']} unhashed left alone ({stats['ms']} ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create, migrate and seed the database")
+    parser.add_argument("--no-seed", action="store_true", help="Skip seeding terms")
+    parser.add_argument("--check", action="store_true", help="Only check the schema revision")
+    args = parser.parse_args()
+
+    if args.check:
+        from app.database import async_engine
+        from app.migrations import SchemaNotReady, verify_schema
+        try:
+            revision = asyncio.run(verify_schema(async_engine))
+        except SchemaNotReady as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+        print(f"✅ Database is at head revision {revision}")
+    else:
+        init_database(seed=not args.no_seed)
@@ -0,0 +1,71 @@
+"""
+Report near-duplicate term clusters across the catalog modules and AI-added terms.
+
+Uses the MinHash/LSH index from app.services.near_duplicates, so only terms that
+share an LSH bucket are compared (no O(n²) pass over the catalog).
+
+Usage:
+    python near_duplicates_report.py                 # catalog + database terms
+    python near_duplicates_report.py --catalog-only  # skip the database
+    python near_duplicates_report.py --threshold 0.6
+"""
+import argparse
+import time
+
+from app.data.terms import ALL_TERMS
+from app.services.near_duplicates import NearDuplicateIndex, SIMILARITY_THRESHOLD
+
+
+def load_database_terms(catalog_names: set) -> list:
+    """Terms in the database that did not come from the catalog (AI-added)"""
+    from app.database import SessionLocal
+    from app.models import Term
+
+    db = SessionLocal()
+    try:
+        rows = db.query(Term.id, Term.term, Term.category).all()
+    finally:
+        db.close()
+    return [row for row in rows if row.term.strip().lower() not in catalog_names]
+
+
+def build_report(threshold: float, include_db: bool = True) -> tuple:
+    index = NearDuplicateIndex(threshold=threshold)
+    labels = {}
+
+    for position, term in enumerate(ALL_TERMS):
+        key = f"catalog:{position}"
+        index.add(key, term["term"])
+        labels[key] = f"[{term['category']}] {term['term']}"
+
+    if include_db:
+        catalog_names = {t["term"].strip().lower() for t in ALL_TERMS}
+        try:
+            for row in load_database_terms(catalog_names):
+                key = f"db:{row.id}"
+                index.add(key, row.term)
+                labels[key] = f"[{row.category}, AI-added #{row.id}] {row.term}"
+        except Exception as e:
+            print(f"⚠️  Database terms skipped: {e}")
+
+    return [[labels[key] for key in cluster] for cluster in index.clusters()], len(index)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List near-duplicate term clusters")
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD,
+                        help="Estimated Jaccard similarity to treat as duplicate")
+    parser.add_argument("--catalog-only", action="store_true", help="Skip AI-added terms in the database")
+    args = parser.parse_args()
+
+    print("🔍 Looking for near-duplicate terms...")
+    start = time.perf_counter()
+    clusters, total = build_report(args.threshold, include_db=not args.catalog_only)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for number, cluster in enumerate(sorted(clusters, key=len, reverse=True), start=1):
+        print(f"\n Cluster {number} ({len(cluster)} terms):")
+        for label in cluster:
+            print(f"   - {label}")
+
+    print(f"\n Scanned {total} terms in {elapsed_ms:.1f} ms, found {len(clusters)} cluster(s)")
@@ -0,0 +1,259 @@
+"""
+Monthly partitions for quiz_attempts (Postgres only).
+
+Alembic revision 5e8b1c3f9a27 turns quiz_attempts into a table range-partitioned
+on attempted_at: one partition per month named quiz_attempts_yYYYYmMM, plus
+quiz_attempts_default for rows that fall outside every partition. This command
+keeps that layout healthy:
+
+- ensure:  create partitions for this month and the next few, so new attempts
+           never land in the default partition. init_db.py runs it on every
+           deploy; run it from cron too if deploys are rarer than monthly.
+           Rows that did land in the default partition get their month's
+           partition as well: Postgres refuses to create a partition while
+           the default one holds rows in its range, so the default partition
+           is detached, the rows are moved, and it is attached again (one
+           transaction).
+- archive: partitions older than the retention window are detached, exported to
+           <archive-dir>/<partition>.jsonl.gz, checked against the row count and
+           then dropped. A partition that was detached but not yet exported
+           (e.g. the job was killed) is picked up again on the next run.
+- list:    show partitions and their row counts.
+
+Usage:
+    python partition_quiz_attempts.py ensure --months-ahead 3
+    python partition_quiz_attempts.py archive --retention-months 12 --archive-dir archives
+    python partition_quiz_attempts.py archive --dry-run
+    python partition_quiz_attempts.py list
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+
+PARENT = "quiz_attempts"
+DEFAULT_PARTITION = f"{PARENT}_default"
+DEFAULT_ARCHIVE_DIR = "archives"
+
+_PARTITION_NAME = re.compile(rf"^{PARENT}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month a partition covers, or None for names that aren't monthly partitions"""
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def months_to_create(today: date, months_ahead: int) -> List[date]:
+    first = month_start(today)
+    return [add_months(first, i) for i in range(months_ahead + 1)]
+
+
+def partitions_to_archive(names: Iterable[str], today: date, retention_months: int) -> List[str]:
+    """Monthly partitions that end before the retention window starts"""
+    cutoff = add_months(month_start(today), -retention_months)
+    return sorted(n for n in names if partition_month(n) is not None and partition_month(n) < cutoff)
+
+
+def create_partition_sql(month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def ensure_partitions_sql(missing: Iterable[date], stray: Iterable[date]) -> List[str]:
+    """
+    Statements that create the `missing` monthly partitions. Months in `stray`
+    have rows in the default partition, which are moved into their new partition.
+    """
+    missing = sorted(set(missing) | set(stray))
+    stray = sorted(set(stray))
+    if not stray:
+        return [create_partition_sql(month) for month in missing]
+
+    statements = [
+        # DETACH/ATTACH lock the parent; don't queue behind long-running queries
+        "SET LOCAL lock_timeout = '5s'",
+        f"ALTER TABLE {PARENT} DETACH PARTITION {DEFAULT_PARTITION}",
+    ]
+    statements += [create_partition_sql(month) for month in missing]
+    for month in stray:
+        in_month = f"attempted_at >= '{month.isoformat()}' AND attempted_at < '{add_months(month, 1).isoformat()}'"
+        statements.append(f"INSERT INTO {partition_name(month)} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_month}")
+        statements.append(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}")
+    statements.append(f"ALTER TABLE {PARENT} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+    return statements
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def write_jsonl_gz(rows: Iterable[dict], path: str) -> int:
+    """Write rows as gzip-compressed JSON lines (atomically). Returns the row count."""
+    tmp_path = f"{path}.tmp"
+    count = 0
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row, default=_json_default))
+            f.write("\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+# ============================================
+# Database side
+# ============================================
+
+def attached_partitions(conn) -> List[str]:
+    return list(conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent ORDER BY c.relname"
+    ), {"parent": PARENT}).scalars())
+
+
+def detached_partitions(conn) -> List[str]:
+    """Monthly tables no longer attached to quiz_attempts (archive interrupted)"""
+    tables = conn.execute(text(
+        "SELECT c.relname FROM pg_class c "
+        "WHERE c.relkind = 'r' AND c.relname LIKE :pattern "
+        "AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid)"
+    ), {"pattern": f"{PARENT}_y%"}).scalars()
+    return [t for t in tables if partition_month(t) is not None]
+
+
+def is_partitioned(conn) -> bool:
+    return conn.execute(text(
+        "SELECT c.relkind = 'p' FROM pg_class c WHERE c.relname = :parent"
+    ), {"parent": PARENT}).scalar() is True
+
+
+def default_partition_months(conn) -> List[date]:
+    """Months that have rows in the default partition"""
+    return list(conn.execute(text(
+        f"SELECT DISTINCT date_trunc('month', attempted_at)::date FROM {DEFAULT_PARTITION}"
+    )).scalars())
+
+
+def ensure_partitions(engine, months_ahead: int = 3, today: Optional[date] = None) -> List[str]:
+    """
+    Create missing monthly partitions, moving rows out of the default partition
+    into them. Returns the names created.
+    """
+    today = today or date.today()
+    with engine.begin() as conn:
+        existing = set(attached_partitions(conn))
+        missing = [m for m in months_to_create(today, months_ahead) if partition_name(m) not in existing]
+        stray = default_partition_months(conn)
+        for statement in ensure_partitions_sql(missing, stray):
+            conn.execute(text(statement))
+    return [partition_name(m) for m in sorted(set(missing) | set(stray))]
+
+
+def default_partition_rows(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT count(*) FROM {DEFAULT_PARTITION}")).scalar()
+
+
+def archive_partition(engine, name: str, archive_dir: str, attached: bool = True) -> int:
+    """Detach one partition, export it to gzip JSONL and drop it. Returns rows archived."""
+    if attached:
+        with engine.begin() as conn:
+            # DETACH locks the parent; don't queue behind long-running queries
+            conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+            conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.jsonl.gz")
+    with engine.connect() as conn:
+        expected = conn.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+        result = conn.execution_options(yield_per=1000).execute(text(f"SELECT * FROM {name} ORDER BY id"))
+        written = write_jsonl_gz((dict(row._mapping) for row in result), path)
+    if written != expected:
+        raise RuntimeError(f"{name}: exported {written} rows but the table has {expected}; keeping it")
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE {name}"))
+    return written
+
+
+def archive_partitions(engine, retention_months: int, archive_dir: str,
+                       today: Optional[date] = None, dry_run: bool = False) -> List[str]:
+    today = today or date.today()
+    with engine.connect() as conn:
+        attached = partitions_to_archive(attached_partitions(conn), today, retention_months)
+        leftovers = detached_partitions(conn)
+    if dry_run:
+        return leftovers + attached
+    for name in leftovers:
+        rows = archive_partition(engine, name, archive_dir, attached=False)
+        print(f"  📦 {name}: {rows} rows (previously detached)")
+    for name in attached:
+        rows = archive_partition(engine, name, archive_dir)
+        print(f"  📦 {name}: {rows} rows")
+    return leftovers + attached
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    parser = argparse.ArgumentParser(description="Manage monthly quiz_attempts partitions (Postgres)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ensure_cmd = sub.add_parser("ensure", help="Create upcoming monthly partitions")
+    ensure_cmd.add_argument("--months-ahead", type=int, default=3)
+    archive_cmd = sub.add_parser("archive", help="Export and drop partitions past the retention window")
+    archive_cmd.add_argument("--retention-months", type=int, default=12)
+    archive_cmd.add_argument("--archive-dir", default=DEFAULT_ARCHIVE_DIR)
+    archive_cmd.add_argument("--dry-run", action="store_true")
+    sub.add_parser("list", help="Show partitions and row counts")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("❌ Partitioning is only used on Postgres")
+        raise SystemExit(1)
+    with engine.connect() as conn:
+        if not is_partitioned(conn):
+            print("❌ quiz_attempts is not partitioned yet - run `alembic upgrade head` first")
+            raise SystemExit(1)
+
+    if args.command == "ensure":
+        created = ensure_partitions(engine, args.months_ahead)
+        print(f"✅ Created {len(created)} partition(s): {', '.join(created)}" if created else "✅ Partitions already in place")
+        stray = default_partition_rows(engine)
+        if stray:
+            print(f"⚠️  {stray} row(s) still in {DEFAULT_PARTITION}")
+    elif args.command == "archive":
+        names = archive_partitions(engine, args.retention_months, args.archive_dir, dry_run=args.dry_run)
+        if args.dry_run:
+            print(f"🔍 Would archive {len(names)} partition(s): {', '.join(names) or '-'}")
+        else:
+            print(f"✅ Archived {len(names)} partition(s) to {args.archive_dir}/")
+    else:
+        with engine.connect() as conn:
+            for name in attached_partitions(conn):
+                rows = conn.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+                print(f"  {name:32} {rows:10} rows")
@@ -0,0 +1,254 @@
+"""
+Re-grade historical quiz attempts with the current grader.
+
+When the grading prompt or model changes (GRADER_VERSION in
+app/services/ai_client.py), old scores are no longer comparable with new ones.
+This job walks quiz_attempts in id order (keyset pagination, one chunk at a
+time), re-grades every attempt whose grader_version is not current, and writes
+the new scores back with one bulk UPDATE per chunk. vocabulary_items.last_score
+is then refreshed from each user's latest attempt.
+
+- Identical answers to the same term are graded once and reused.
+- AI calls run in a small concurrency-limited pool behind a token bucket.
+  The rate is halved whenever a call fails or is slow, and creeps back up
+  on success, so the job backs off as soon as the AI service is under
+  pressure from interactive grading.
+- Progress is committed per chunk and the last id is saved to a checkpoint
+  file, so the job can be stopped and restarted at any time.
+
+Usage:
+    python regrade_attempts.py                     # regrade everything stale
+    python regrade_attempts.py --rate 10 --concurrency 1
+    python regrade_attempts.py --dry-run           # count stale attempts only
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import func, or_, select, tuple_, update
+
+from app.models import QuizAttempt, Term, VocabularyItem
+from app.services.ai_usage import AIBudgetExceeded
+from app.services.throttle import TokenBucket
+
+DEFAULT_CHECKPOINT = "regrade_progress.json"
+
+
+def answer_key(term_id: int, user_answer: str) -> tuple:
+    """Cache key: same term + same answer (ignoring case/whitespace) = same grade"""
+    normalized = " ".join(user_answer.lower().split())
+    return term_id, hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def stale_filter(grader_version: str):
+    return or_(QuizAttempt.grader_version.is_(None), QuizAttempt.grader_version != grader_version)
+
+
+def load_checkpoint(path: str, grader_version: str) -> int:
+    """Last processed attempt id for this grader version (0 to start over)"""
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        data = json.load(f)
+    return data["last_id"] if data.get("grader_version") == grader_version else 0
+
+
+def save_checkpoint(path: str, grader_version: str, last_id: int) -> None:
+    if not path:
+        return
+    with open(path, "w") as f:
+        json.dump({"grader_version": grader_version, "last_id": last_id}, f)
+
+
+class AdaptiveThrottle:
+    """
+    Token bucket whose rate backs off on failures/slow calls (AIMD).
+
+    Halves the rate on trouble, adds one call/minute back on each success.
+    """
+
+    def __init__(self, max_rate: float, min_rate: float, slow_seconds: float):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.slow_seconds = slow_seconds
+        self.bucket = TokenBucket(max_rate)
+
+    async def acquire(self) -> None:
+        await self.bucket.acquire()
+
+    def report(self, ok: bool, duration: float) -> None:
+        current = self.bucket.rate_per_minute
+        if not ok or duration > self.slow_seconds:
+            self.bucket.set_rate(max(self.min_rate, current / 2))
+        else:
+            self.bucket.set_rate(min(self.max_rate, current + 1))
+
+
+async def regrade(
+    session_factory: Callable,
+    grader_version: str,
+    grade: Callable,
+    chunk_size: int = 200,
+    concurrency: int = 2,
+    max_rate: float = 20,
+    min_rate: float = 2,
+    slow_seconds: float = 8.0,
+    checkpoint_path: Optional[str] = DEFAULT_CHECKPOINT,
+    limit: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Re-grade stale attempts chunk by chunk. Returns counts for the report.
+
+    grade(term, correct_definition, user_answer) -> {"score", "feedback"} or None
+    """
+    stats = {"updated": 0, "cache_hits": 0, "failed": 0, "ai_calls": 0, "chunks": 0}
+    cache: Dict[tuple, dict] = {}
+    throttle = AdaptiveThrottle(max_rate, min_rate, slow_seconds)
+    semaphore = asyncio.Semaphore(concurrency)
+    last_id = load_checkpoint(checkpoint_path, grader_version)
+    # Failed attempts stay stale; the checkpoint never moves past the first one
+    first_failed_id = None
+
+    async def grade_one(term: str, definition: str, user_answer: str) -> Optional[dict]:
+        async with semaphore:
+            await throttle.acquire()
+            start = time.monotonic()
+            result = await asyncio.to_thread(grade, term, definition, user_answer)
+            stats["ai_calls"] += 1
+            throttle.report(result is not None, time.monotonic() - start)
+            return result
+
+    while limit is None or stats["updated"] < limit:
+        db = session_factory()
+        try:
+            rows = db.execute(
+                select(
+                    QuizAttempt.id, QuizAttempt.attempted_at, QuizAttempt.user_id, QuizAttempt.term_id,
+                    QuizAttempt.user_answer, Term.term, Term.simple_definition,
+                )
+                .join(Term, Term.id == QuizAttempt.term_id)
+                .where(QuizAttempt.id > last_id, stale_filter(grader_version))
+                .order_by(QuizAttempt.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+
+            # Grade each distinct (term, answer) once; reuse cached results
+            to_grade = {}
+            for row in rows:
+                key = answer_key(row.term_id, row.user_answer)
+                if key in cache:
+                    stats["cache_hits"] += 1
+                elif key not in to_grade:
+                    to_grade[key] = row
+                else:
+                    stats["cache_hits"] += 1
+            keys = list(to_grade)
+            results = await asyncio.gather(*(
+                grade_one(to_grade[k].term, to_grade[k].simple_definition, to_grade[k].user_answer)
+                for k in keys
+            ))
+            for key, result in zip(keys, results):
+                if result is not None and "score" in result:
+                    cache[key] = result
+
+            updates, touched = [], set()
+            for row in rows:
+                result = cache.get(answer_key(row.term_id, row.user_answer))
+                if result is None:
+                    stats["failed"] += 1
+                    if first_failed_id is None:
+                        first_failed_id = row.id
+                    continue
+                updates.append({
+                    "id": row.id,
+                    "attempted_at": row.attempted_at,
+                    "score": int(result["score"]),
+                    "ai_feedback": result.get("feedback"),
+                    "grader_version": grader_version,
+                })
+                touched.add((row.user_id, row.term_id))
+
+            if updates:
+                # ORM bulk UPDATE by primary key (id, attempted_at: one partition each) -> one executemany
+                db.execute(update(QuizAttempt), updates)
+                latest_score = (
+                    select(QuizAttempt.score)
+                    .where(
+                        QuizAttempt.user_id == VocabularyItem.user_id,
+                        QuizAttempt.term_id == VocabularyItem.term_id,
+                    )
+                    .order_by(QuizAttempt.attempted_at.desc(), QuizAttempt.id.desc())
+                    .limit(1)
+                    .scalar_subquery()
+                )
+                db.execute(
+                    update(VocabularyItem)
+                    .where(tuple_(VocabularyItem.user_id, VocabularyItem.term_id).in_(list(touched)))
+                    .values(last_score=latest_score)
+                    .execution_options(synchronize_session=False)
+                )
+            db.commit()
+        finally:
+            db.close()
+
+        last_id = rows[-1].id
+        resume_from = last_id if first_failed_id is None else first_failed_id - 1
+        save_checkpoint(checkpoint_path, grader_version, resume_from)
+        stats["updated"] += len(updates)
+        stats["chunks"] += 1
+        print(f"  chunk {stats['chunks']}: up to id {last_id}, {len(updates)} updated, "
+              f"rate {throttle.bucket.rate_per_minute:.0f}/min")
+
+    return stats
+
+
+def count_stale(session_factory: Callable, grader_version: str) -> int:
+    db = session_factory()
+    try:
+        return db.execute(select(func.count(QuizAttempt.id)).where(stale_filter(grader_version))).scalar()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+    from app.services.ai_client import GRADER_VERSION, grade_user_answer
+
+    parser = argparse.ArgumentParser(description="Re-grade quiz attempts with the current grader")
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=2, help="Max AI calls in flight")
+    parser.add_argument("--rate", type=float, default=20, help="Max AI calls per minute")
+    parser.add_argument("--min-rate", type=float, default=2, help="Rate floor when backing off")
+    parser.add_argument("--slow-seconds", type=float, default=8.0, help="Calls slower than this count as pressure")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--limit", type=int, default=None, help="Stop after roughly N updated attempts")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    stale = count_stale(SessionLocal, GRADER_VERSION)
+    print(f"🔍 {stale} attempt(s) not graded by {GRADER_VERSION}")
+    if args.dry_run or stale == 0:
+        raise SystemExit(0)
+
+    def grade(term, definition, user_answer):
+        return grade_user_answer(term, definition, user_answer, endpoint="job.regrade")
+
+    try:
+        stats = asyncio.run(regrade(
+            SessionLocal, GRADER_VERSION, grade,
+            chunk_size=args.chunk_size, concurrency=args.concurrency,
+            max_rate=args.rate, min_rate=args.min_rate, slow_seconds=args.slow_seconds,
+            checkpoint_path=args.checkpoint, limit=args.limit,
+        ))
+    except AIBudgetExceeded as e:
+        print(f"⛔ {e} - progress is saved, rerun later to continue")
+        raise SystemExit(1)
+
+    print(f"✅ Updated {stats['updated']} attempt(s) with {stats['ai_calls']} AI call(s) "
+          f"({stats['cache_hits']} cache hits, {stats['failed']} failed - rerun to retry)")
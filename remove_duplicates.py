@@ -7,6 +7,7 @@ sys.path.append('/app')
 
 from app.database import SessionLocal
 from app.models import Term
+from app.services.cache_bus import TERMS, publish_sync
 from sqlalchemy import func
 
 def normalize_term(term: str) -> str:
@@ -47,6 +48,7 @@ def find_and_remove_duplicates():
                     duplicates_found += 1
         
         if duplicates_found > 0:
+            publish_sync(db, TERMS)
             db.commit()
             print(f"\n Removed {duplicates_found} duplicate term(s)")
         else:
@@ -1,39 +1,128 @@
 """
-Seed all terms from app.data.terms.ALL_TERMS into the database.
-Simple, explicit version.
+Seed catalog terms (app.data.terms) into the database, incrementally.
+
+Every catalog term gets a content hash (SHA-256 of its fields). Hashes already
+in the database are read with one query, and only what differs is written:
+new terms are inserted and changed terms updated, each with one executemany,
+all in a single transaction. That transaction also tells running workers to
+drop their term caches (app/services/cache_bus.py).
+
+Rows without a hash were either seeded before content hashes existed or added
+through /terms/suggest. One whose content matches its catalog entry gets the
+hash recorded; any other is left alone, even if the catalog has a term of the
+same name, and is reported as skipped.
+
+Usage:
+    python seed.py
+    python seed.py --dry-run     # report what would change
 """
+import argparse
+import hashlib
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from sqlalchemy import insert, select, update
 
-from sqlalchemy import text
-from app.database import SessionLocal
 from app.models import Term
-from app.data.terms import ALL_TERMS
+from app.services.cache_bus import TERMS, publish_sync
 
+# Catalog fields that make up a term's content
+CONTENT_FIELDS = ("term", "category", "difficulty", "formal_definition",
+                  "simple_definition", "example", "why_it_matters")
 
-def seed_terms():
-    db = SessionLocal()
 
-    # Check if terms already exist - don't truncate if they do!
-    existing_count = db.query(Term).count()
-    if existing_count > 0:
-        print(f"Terms table already has {existing_count} terms. Skipping seed.")
-        db.close()
-        return
-
-    unique_terms = {}
-    dup_count = 0
-    for term in ALL_TERMS:
-        key = term["term"].strip().lower()
-        if key in unique_terms:
-            dup_count += 1
+def term_key(name: str) -> str:
+    return name.strip().lower()
+
+
+def content_hash(term: dict) -> str:
+    # Unit-separated fields, \0 for None - much cheaper than json.dumps per term
+    values = [term.get(field) for field in CONTENT_FIELDS]
+    payload = "\x1f".join(["\0" if value is None else str(value) for value in values])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def seed_terms(terms: Optional[Iterable[dict]] = None, session_factory: Optional[Callable] = None,
+               dry_run: bool = False) -> Dict[str, int]:
+    """Insert new and update changed catalog terms. Returns counts for the report."""
+    if terms is None:
+        # Streams from the compiled pack when it's current
+        from app.data.terms import iter_terms
+        terms = iter_terms()
+    if session_factory is None:
+        from app.database import SessionLocal
+        session_factory = SessionLocal
+
+    start = time.perf_counter()
+    catalog = {}
+    duplicates = 0
+    for term in terms:
+        key = term_key(term["term"])
+        if key in catalog:
+            duplicates += 1
             continue
-        unique_terms[key] = term
+        catalog[key] = term
+
+    db = session_factory()
+    try:
+        existing = {
+            term_key(name): (term_id, stored_hash)
+            for term_id, name, stored_hash in db.execute(select(Term.id, Term.term, Term.content_hash)).all()
+        }
+        # Hash the stored content of unhashed rows the catalog collides with
+        unhashed_ids = [term_id for key, (term_id, stored_hash) in existing.items()
+                        if stored_hash is None and key in catalog]
+        stored_digests = {}
+        if unhashed_ids:
+            columns = [getattr(Term, field) for field in CONTENT_FIELDS]
+            for term_id, *values in db.execute(select(Term.id, *columns).where(Term.id.in_(unhashed_ids))):
+                stored_digests[term_id] = content_hash(dict(zip(CONTENT_FIELDS, values)))
+
+        inserts, updates, skipped = [], [], 0
+        for key, term in catalog.items():
+            digest = content_hash(term)
+            current = existing.get(key)
+            if current is not None and current[1] == digest:
+                continue
+            if current is not None and current[1] is None and stored_digests[current[0]] != digest:
+                skipped += 1
+                continue
+            row = {field: term.get(field) for field in CONTENT_FIELDS}
+            row["content_hash"] = digest
+            if current is None:
+                inserts.append(row)
+            else:
+                row["id"] = current[0]
+                updates.append(row)
+
+        if not dry_run and (inserts or updates):
+            if inserts:
+                db.execute(insert(Term), inserts)
+            if updates:
+                # ORM bulk UPDATE by primary key -> one executemany
+                db.execute(update(Term), updates)
+            publish_sync(db, TERMS)
+            db.commit()
+    finally:
+        db.close()
+
+    return {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "unchanged": len(catalog) - len(inserts) - len(updates) - skipped,
+        "skipped": skipped,
+        "duplicates": duplicates,
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    }
 
-    for term in unique_terms.values():
-        db.add(Term(**term))
 
-    db.commit()
-    db.close()
-    print(f"Inserted {len(unique_terms)} new terms. Skipped {dup_count} duplicates.")
-    
 if __name__ == "__main__":
-    seed_terms()
+    parser = argparse.ArgumentParser(description="Seed catalog terms (only what changed)")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    args = parser.parse_args()
+
+    stats = seed_terms(dry_run=args.dry_run)
+    verbs = ("Would insert", "update") if args.dry_run else ("Inserted", "updated")
+    print(f"✅ {verbs[0]} {stats['inserted']}, {verbs[1]} {stats['updated']}, {stats['unchanged']} unchanged, "
+          f"{stats['duplicates']} duplicate name(s) skipped, {stats['skipped']} unhashed row(s) left alone "
+          f"({stats['ms']} ms)")
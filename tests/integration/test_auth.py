@@ -6,7 +6,7 @@ from fastapi.testclient import TestClient
 os.environ["DATABASE_URL"] = "sqlite:///./test_auth.db"
 
 from app.main import app
-from app.database import Base, SessionLocal, engine, get_db
+from app.database import AsyncSessionLocal, Base, SessionLocal, engine, get_db
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -20,11 +20,9 @@ def db_session():
 
 @pytest.fixture(scope="function")
 def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_db():
+        async with AsyncSessionLocal() as session:
+            yield session
 
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as test_client:
@@ -50,3 +48,70 @@ def test_register_duplicate_user_error(client):
     resp2 = client.post("/api/v1/auth/register", json={"email": "dupe@example.com", "password": "pytestpass123"})
     assert resp2.status_code == 400
     assert "already registered" in resp2.json()["detail"].lower()
+
+
+def test_authenticated_requests_do_not_load_the_user_row(client):
+    from sqlalchemy import event
+    from app.database import async_engine
+
+    token = client.post("/api/v1/auth/register", json={"email": "fast@example.com", "password": "pytestpass123"}).json()["access_token"]
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        resp = client.get("/api/v1/vocabulary/", headers={"Authorization": f"Bearer {token}"})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+    assert resp.status_code == 200
+    assert statements and not any("FROM users" in s for s in statements)
+
+    resp = client.get("/api/v1/vocabulary/", headers={"Authorization": "Bearer not-a-token"})
+    assert resp.status_code == 403
+
+
+def test_refresh_rotates_and_detects_reuse(client, monkeypatch):
+    from app.auth import refresh_tokens
+
+    tokens = client.post("/api/v1/auth/register", json={"email": "refresh@example.com", "password": "pytestpass123"}).json()
+    first = tokens["refresh_token"]
+
+    resp = client.post("/api/v1/auth/refresh", json={"refresh_token": first})
+    assert resp.status_code == 200
+    second = resp.json()["refresh_token"]
+    assert second != first
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    assert client.get("/api/v1/vocabulary/", headers=headers).status_code == 200
+
+    # A second tab refreshing with the same token right away gets a sibling
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": first}).status_code == 200
+
+    # Later reuse of a rotated token revokes the whole session
+    monkeypatch.setattr(refresh_tokens, "REFRESH_REUSE_GRACE_SECONDS", -1)
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": first}).status_code == 401
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": second}).status_code == 401
+
+
+def test_logout_revokes_refresh_token(client):
+    tokens = client.post("/api/v1/auth/register", json={"email": "bye@example.com", "password": "pytestpass123"}).json()
+    assert client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]}).status_code == 204
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": "unknown"}).status_code == 401
+
+
+def test_login_rehashes_passwords_stored_with_an_old_cost(client, db_session, monkeypatch):
+    from app.auth import auth_utils
+    from app.models import User
+
+    client.post("/api/v1/auth/register", json={"email": "cost@example.com", "password": "pytestpass123"})
+    assert db_session.query(User).filter_by(email="cost@example.com").one().hashed_password.startswith("$2b$12$")
+
+    monkeypatch.setattr(auth_utils, "pwd_context", auth_utils.make_context(4))
+    resp = client.post("/api/v1/auth/login", json={"email": "cost@example.com", "password": "pytestpass123"})
+    assert resp.status_code == 200
+    db_session.expire_all()
+    stored = db_session.query(User).filter_by(email="cost@example.com").one().hashed_password
+    assert stored.startswith("$2b$04$")
+    assert auth_utils.verify_password("pytestpass123", stored)
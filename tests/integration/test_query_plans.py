@@ -0,0 +1,147 @@
+"""
+Query-plan regression tests for the hot queries.
+
+Each query the routers (and the regrade job) run per request is EXPLAINed
+against a synthetic dataset, and the test fails if the plan falls back to a
+full table scan. Runs on SQLite by default; set QUERY_PLAN_DATABASE_URL to a
+throwaway Postgres database to check Postgres plans as well (its tables are
+dropped afterwards).
+"""
+import os
+import random
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+# app.database builds its engines on import
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test_auth.db")
+
+from app.database import Base
+from app.models import QuizAttempt, Term, User, VocabularyItem
+from app.queries import quiz_question_query, term_by_id_query, terms_query, vocabulary_query
+
+NUM_USERS = 200
+NUM_TERMS = 20000
+NUM_CATEGORIES = 60
+NUM_ATTEMPTS = 50000
+NUM_VOCAB = 10000
+
+USER_ID = 7
+TERM_ID = 42
+CATEGORY = "category-3"
+
+# name -> (statement, tables that must not be scanned in full)
+HOT_QUERIES = {
+    "vocabulary list": (
+        vocabulary_query(USER_ID),
+        {"vocabulary_items", "terms"},
+    ),
+    "quiz answer vocabulary lookup": (
+        select(VocabularyItem).where(VocabularyItem.user_id == USER_ID, VocabularyItem.term_id == TERM_ID),
+        {"vocabulary_items"},
+    ),
+    "quiz draw by category and difficulty": (
+        quiz_question_query(CATEGORY, 2),
+        {"terms"},
+    ),
+    "quiz draw by category": (
+        quiz_question_query(CATEGORY),
+        {"terms"},
+    ),
+    "terms by category": (
+        terms_query(CATEGORY),
+        {"terms"},
+    ),
+    "term by id": (
+        term_by_id_query(TERM_ID),
+        {"terms"},
+    ),
+    "latest attempt per user and term": (
+        select(QuizAttempt.score)
+        .where(QuizAttempt.user_id == USER_ID, QuizAttempt.term_id == TERM_ID)
+        .order_by(QuizAttempt.attempted_at.desc(), QuizAttempt.id.desc())
+        .limit(1),
+        {"quiz_attempts"},
+    ),
+}
+
+
+def load_synthetic_data(engine):
+    rng = random.Random(0)
+    start = datetime(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "hashed_password": "x"} for i in range(1, NUM_USERS + 1)
+        ])
+        conn.execute(insert(Term), [
+            {
+                "id": i, "term": f"term {i}", "category": f"category-{i % NUM_CATEGORIES}",
+                "difficulty": i % 5 + 1, "formal_definition": "f", "simple_definition": "s",
+            }
+            for i in range(1, NUM_TERMS + 1)
+        ])
+        conn.execute(insert(QuizAttempt), [
+            {
+                "user_id": rng.randint(1, NUM_USERS), "term_id": rng.randint(1, NUM_TERMS),
+                "user_answer": "answer", "score": rng.randint(0, 100),
+                "attempted_at": start + timedelta(minutes=i),
+            }
+            for i in range(NUM_ATTEMPTS)
+        ])
+        conn.execute(insert(VocabularyItem), [
+            {"user_id": rng.randint(1, NUM_USERS), "term_id": rng.randint(1, NUM_TERMS), "review_count": 1}
+            for _ in range(NUM_VOCAB)
+        ])
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+
+def full_scans_sqlite(conn, sql):
+    """Tables SQLite reads in full ("SCAN t" without an index)"""
+    scanned = set()
+    for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"):
+        match = re.match(r"SCAN (?:TABLE )?(\w+)", row[-1])
+        if match and "USING" not in row[-1]:
+            scanned.add(match.group(1))
+    return scanned
+
+
+def full_scans_postgres(conn, sql):
+    """Tables with a Seq Scan node anywhere in the Postgres plan"""
+    plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+    scanned, nodes = set(), [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] == "Seq Scan":
+            scanned.add(node["Relation Name"])
+        nodes.extend(node.get("Plans", []))
+    return scanned
+
+
+DATABASES = ["sqlite"] + (["postgres"] if os.getenv("QUERY_PLAN_DATABASE_URL") else [])
+
+
+@pytest.fixture(scope="module", params=DATABASES)
+def plan_engine(request, tmp_path_factory):
+    if request.param == "sqlite":
+        engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    else:
+        engine = create_engine(os.environ["QUERY_PLAN_DATABASE_URL"])
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    load_synthetic_data(engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_indexes(plan_engine, name):
+    statement, watched = HOT_QUERIES[name]
+    sql = str(statement.compile(dialect=plan_engine.dialect, compile_kwargs={"literal_binds": True}))
+    full_scans = full_scans_sqlite if plan_engine.dialect.name == "sqlite" else full_scans_postgres
+    with plan_engine.connect() as conn:
+        scanned = full_scans(conn, sql) & watched
+    assert not scanned, f"{name}: full scan of {sorted(scanned)}\n{sql}"
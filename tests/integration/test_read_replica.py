@@ -0,0 +1,66 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.auth.auth_handler import sign_jwt
+from app.database import Base, get_db
+from app.main import app
+from app.models import Term, User
+
+
+def seed(path, definition):
+    """One user and one term; the term's definition tells the databases apart"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(User(id=1, email="reader@example.com", hashed_password="x"))
+        db.add(Term(id=1, term="Docker", formal_definition=definition, simple_definition=definition,
+                    category="DevOps", difficulty=1))
+        db.commit()
+    engine.dispose()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    seed(tmp_path / "primary.db", "from primary")
+    seed(tmp_path / "replica.db", "from replica")
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    PrimarySession = async_sessionmaker(primary, class_=AsyncSession, expire_on_commit=False)
+    ReplicaSession = async_sessionmaker(replica, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with PrimarySession() as session:
+            yield session
+
+    monkeypatch.setattr(database, "ReadSessionLocal", ReplicaSession)
+    monkeypatch.setattr(database, "_recent_writes", {})
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as test_client:
+        test_client.headers["Authorization"] = f"Bearer {sign_jwt('1')['access_token']}"
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+def test_reads_go_to_replica(client):
+    resp = client.get("/api/v1/terms/1")
+    assert resp.status_code == 200
+    assert resp.json()["simple_definition"] == "from replica"
+
+
+def test_reads_stick_to_primary_after_a_write(client, monkeypatch):
+    resp = client.post("/api/v1/vocabulary/1")
+    assert resp.status_code == 200
+
+    # The replica hasn't caught up, but this user's reads now go to the primary
+    resp = client.get("/api/v1/vocabulary/")
+    assert resp.json()["total"] == 1
+    assert client.get("/api/v1/terms/1").json()["simple_definition"] == "from primary"
+
+    # Once the window has passed, reads go back to the replica
+    monkeypatch.setattr(database, "_recent_writes", {})
+    assert client.get("/api/v1/terms/1").json()["simple_definition"] == "from replica"
+    assert client.get("/api/v1/vocabulary/").json()["total"] == 0
@@ -0,0 +1,108 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.routers import metrics
+from app.services import ai_usage
+from app.services.ai_usage import AIBudgetExceeded, _DailyUsage, track_ai_call
+
+
+@pytest.fixture(autouse=True)
+def fresh_usage(monkeypatch):
+    monkeypatch.setattr(ai_usage, "_usage", _DailyUsage("memory://"))
+
+
+def fake_response(prompt_tokens, response_tokens):
+    usage = SimpleNamespace(prompt_token_count=prompt_tokens, candidates_token_count=response_tokens)
+    return SimpleNamespace(usage_metadata=usage)
+
+
+def test_track_ai_call_records_tokens_latency_and_outcome():
+    calls_before = ai_usage.ai_calls.value(endpoint="test.endpoint", outcome="success")
+    latency_before = ai_usage.ai_latency.count(endpoint="test.endpoint")
+
+    with track_ai_call("test.endpoint", user_id=1) as call:
+        # The reservation is held while the call runs
+        assert ai_usage._usage.user(1) == {"tokens": ai_usage.TOKEN_RESERVATION, "calls": 1}
+        call.record_usage(fake_response(120, 30))
+        call.outcome = "success"
+
+    assert ai_usage.ai_calls.value(endpoint="test.endpoint", outcome="success") == calls_before + 1
+    assert ai_usage.ai_latency.count(endpoint="test.endpoint") == latency_before + 1
+    assert ai_usage._usage.user(1) == {"tokens": 150, "calls": 1}
+    assert ai_usage._usage.global_usage() == {"tokens": 150, "calls": 1}
+
+
+def test_failed_call_is_counted_as_error():
+    errors_before = ai_usage.ai_calls.value(endpoint="test.endpoint", outcome="error")
+
+    with pytest.raises(RuntimeError):
+        with track_ai_call("test.endpoint"):
+            raise RuntimeError("boom")
+
+    assert ai_usage.ai_calls.value(endpoint="test.endpoint", outcome="error") == errors_before + 1
+    assert ai_usage._usage.global_usage() == {"tokens": 0, "calls": 1}
+
+
+def test_user_token_budget_blocks_before_call(monkeypatch):
+    monkeypatch.setattr(ai_usage, "USER_DAILY_TOKEN_BUDGET", 100)
+
+    with track_ai_call("test.endpoint", user_id=7) as call:
+        call.record_usage(fake_response(90, 20))
+        call.outcome = "success"
+
+    with pytest.raises(AIBudgetExceeded) as exc:
+        with track_ai_call("test.endpoint", user_id=7):
+            pytest.fail("the provider must not be called")
+    assert exc.value.scope == "user"
+    # The refused call is not counted, and other users are unaffected
+    assert ai_usage._usage.user(7) == {"tokens": 110, "calls": 1}
+    assert ai_usage._usage.global_usage() == {"tokens": 110, "calls": 1}
+    with track_ai_call("test.endpoint", user_id=8):
+        pass
+
+
+def test_concurrent_calls_see_each_others_reservations(monkeypatch):
+    monkeypatch.setattr(ai_usage, "GLOBAL_DAILY_TOKEN_BUDGET", ai_usage.TOKEN_RESERVATION)
+
+    with track_ai_call("test.endpoint"):
+        # Nothing has been spent yet, but the first call holds the whole budget
+        with pytest.raises(AIBudgetExceeded) as exc:
+            with track_ai_call("test.endpoint", user_id=3):
+                pass
+    assert exc.value.scope == "global"
+
+
+def test_global_call_budget_is_shared_by_workers(monkeypatch, tmp_path):
+    monkeypatch.setattr(ai_usage, "GLOBAL_DAILY_CALL_BUDGET", 1)
+    # Two stores on one file stand in for two worker processes
+    uri = f"sqlite:///{tmp_path / 'usage.db'}"
+    worker_a, worker_b = _DailyUsage(uri), _DailyUsage(uri)
+
+    monkeypatch.setattr(ai_usage, "_usage", worker_a)
+    with track_ai_call("test.endpoint"):
+        pass
+
+    monkeypatch.setattr(ai_usage, "_usage", worker_b)
+    with pytest.raises(AIBudgetExceeded) as exc:
+        with track_ai_call("test.endpoint", user_id=3):
+            pass
+    assert exc.value.scope == "global"
+    # A restarted worker starts from the stored totals
+    assert _DailyUsage(uri).global_usage()["calls"] == 1
+
+
+def test_metrics_endpoint_requires_token(monkeypatch):
+    from app.main import app
+
+    client = TestClient(app)
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "")
+    assert client.get("/api/v1/metrics/").status_code == 404
+
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "scrape-me")
+    assert client.get("/api/v1/metrics/").status_code == 403
+    assert client.get("/api/v1/metrics/", headers={"Authorization": "Bearer wrong"}).status_code == 403
+    resp = client.get("/api/v1/metrics/", headers={"Authorization": "Bearer scrape-me"})
+    assert resp.status_code == 200
+    assert "ai_calls_total" in resp.json()
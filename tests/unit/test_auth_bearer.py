@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import auth_bearer
+from app.auth.auth_bearer import Principal, forget_user, get_current_user_record
+from app.models import User
+
+
+class FakeSession:
+    def __init__(self, users):
+        self.users = users
+        self.gets = 0
+
+    async def get(self, model, user_id):
+        self.gets += 1
+        return self.users.get(user_id)
+
+    def expunge(self, instance):
+        pass
+
+
+def test_user_record_cache_is_opt_in_bounded_and_expires(monkeypatch):
+    users = {i: User(id=i, email=f"u{i}@example.com", hashed_password="x") for i in (1, 2, 3)}
+    db = FakeSession(users)
+    load = lambda user_id: asyncio.run(get_current_user_record(Principal(id=user_id, expires=0), db))
+
+    load(1)
+    load(1)
+    assert db.gets == 2  # off by default
+
+    monkeypatch.setattr(auth_bearer, "USER_CACHE_TTL_SECONDS", 60)
+    monkeypatch.setattr(auth_bearer, "USER_CACHE_SIZE", 2)
+    monkeypatch.setattr(auth_bearer, "_user_cache", auth_bearer.OrderedDict())
+    assert load(1).email == "u1@example.com"
+    load(1)
+    assert db.gets == 3
+    load(2)
+    load(3)  # evicts user 1, the least recently used
+    load(1)
+    assert db.gets == 6
+
+    forget_user(1)
+    load(1)
+    assert db.gets == 7
+
+    auth_bearer._user_cache[1] = (0, users[1])  # expired
+    load(1)
+    assert db.gets == 8
+
+
+def test_missing_user_is_404():
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_current_user_record(Principal(id=9, expires=0), FakeSession({})))
+    assert exc.value.status_code == 404
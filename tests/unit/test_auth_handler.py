@@ -0,0 +1,48 @@
+import time
+
+import jwt
+
+from app.auth import auth_handler
+from app.auth.auth_handler import decode_jwt, jwt_cache_lookups, sign_jwt
+
+
+def make_token(user_id="7", expires_in=1800):
+    payload = {"user_id": user_id, "expires": time.time() + expires_in}
+    return jwt.encode(payload, auth_handler.JWT_SECRET, algorithm=auth_handler.JWT_ALGORITHM)
+
+
+def test_invalid_tokens_decode_to_none():
+    token = sign_jwt("7")["access_token"]
+    assert decode_jwt(token)["user_id"] == "7"
+    assert decode_jwt("not-a-jwt") is None
+    assert decode_jwt(token[:-2] + ("AA" if not token.endswith("AA") else "BB")) is None
+    assert decode_jwt(make_token(expires_in=-1)) is None
+    assert decode_jwt(jwt.encode({"user_id": "7"}, auth_handler.JWT_SECRET, algorithm=auth_handler.JWT_ALGORITHM)) is None
+
+
+def test_verified_tokens_are_cached_bounded_and_expire(monkeypatch):
+    monkeypatch.setattr(auth_handler, "JWT_CACHE_SIZE", 2)
+    monkeypatch.setattr(auth_handler, "_verified", auth_handler.OrderedDict())
+    verifications = []
+    real_verify = auth_handler._verify
+    monkeypatch.setattr(auth_handler, "_verify", lambda t: verifications.append(t) or real_verify(t))
+    hits = jwt_cache_lookups.value(result="hit")
+
+    a, b, c = make_token("1"), make_token("2"), make_token("3")
+    decode_jwt(a)
+    claims = decode_jwt(a)
+    claims["user_id"] = "tampered"  # callers get a copy
+    assert decode_jwt(a)["user_id"] == "1"
+    assert len(verifications) == 1
+    assert jwt_cache_lookups.value(result="hit") == hits + 2
+
+    decode_jwt(b)
+    decode_jwt(c)  # evicts a
+    decode_jwt(a)
+    assert len(verifications) == 4
+
+    short = make_token("4", expires_in=0.05)
+    assert decode_jwt(short) is not None
+    time.sleep(0.1)
+    assert decode_jwt(short) is None
+    assert len(auth_handler._verified) <= 2
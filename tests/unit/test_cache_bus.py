@@ -0,0 +1,108 @@
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.services import related_terms
+from app.services.cache_bus import TERMS, CacheBus, publish, publish_sync
+
+
+def test_polling_workers_see_writes_from_others(tmp_path):
+    path = tmp_path / "bus.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        writer, reader = CacheBus(mode="poll"), CacheBus(mode="poll", poll_seconds=3600)
+        evictions = {"writer": 0, "reader": 0}
+        writer.on_invalidate(TERMS, lambda: evictions.__setitem__("writer", evictions["writer"] + 1))
+        reader.on_invalidate(TERMS, lambda: evictions.__setitem__("reader", evictions["reader"] + 1))
+        await writer.start(engine)
+        await reader.start(engine)
+        try:
+            async with AsyncSession(engine) as db:
+                version = await publish(db, TERMS)
+                await db.commit()
+            writer.applied_locally(TERMS, version)
+
+            await writer.poll_once()
+            await reader.poll_once()
+            await reader.poll_once()
+            return version, evictions
+        finally:
+            await writer.stop()
+            await reader.stop()
+            await engine.dispose()
+
+    version, evictions = asyncio.run(scenario())
+    assert version == 1
+    # The writer updated its own caches; only the other worker evicts, once
+    assert evictions == {"writer": 0, "reader": 1}
+
+    with sessionmaker(bind=sync_engine)() as db:
+        assert publish_sync(db, TERMS) == 2
+        db.commit()
+    sync_engine.dispose()
+
+
+def test_stale_versions_and_bad_handlers_are_tolerated():
+    bus = CacheBus(mode="off")
+    calls = []
+    bus.on_invalidate(TERMS, lambda: 1 / 0)
+    bus.on_invalidate(TERMS, lambda: calls.append(1))
+
+    assert bus.apply(TERMS, 3)
+    assert not bus.apply(TERMS, 2)
+    bus._on_notify(None, 0, "cache_invalidation", "terms:4")
+    bus._on_notify(None, 0, "cache_invalidation", "garbage")
+    assert calls == [1, 1]
+
+
+def test_related_index_built_during_a_reset_is_synced_next_time(monkeypatch):
+    class Result:
+        def all(self):
+            return []
+
+    class RacingSession:
+        async def execute(self, statement):
+            related_terms.reset_related_index()  # another worker's write lands mid-build
+            return Result()
+
+    monkeypatch.setattr(related_terms, "_related_index", None)
+    monkeypatch.setattr(related_terms, "_stale", False)
+    index = asyncio.run(related_terms.get_related_index(RacingSession()))
+    assert len(index) == 0
+    assert related_terms._related_index is index
+    assert related_terms._stale
+
+
+def test_preloaded_caches_are_evicted_if_terms_changed_before_the_worker_started(tmp_path):
+    path = tmp_path / "bus.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        bus = CacheBus(mode="poll", poll_seconds=3600)
+        evictions = []
+        bus.on_invalidate(TERMS, lambda: evictions.append(1))
+        try:
+            await bus.remember_versions(engine)  # in the gunicorn master, before building caches
+            await bus.start(engine)
+            await bus.stop()
+            assert evictions == []
+
+            async with AsyncSession(engine) as db:
+                await publish(db, TERMS)
+                await db.commit()
+            await bus.start(engine)  # a worker forked after the write
+            await bus.stop()
+            return evictions
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(scenario()) == [1]
+    sync_engine.dispose()
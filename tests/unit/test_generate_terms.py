@@ -0,0 +1,103 @@
+import asyncio
+import runpy
+
+from generate_terms import generate_all, load_checkpoint, parse_questions, remove_known, to_term, write_module
+
+RAW_BLOCK = """
+What is a zombie process?
+Commands (basic & advanced):
+Which command will show you free/used memory?
+🔹 Git
+What is Git?
+What is git cherry-pick?
+What is git cherry-pick?
+SQL
+Difference between NOW() and CURRENT_DATE()
+"""
+
+
+def fake_generate(question, category_hint):
+    return {
+        "approved": "Git?" not in question,
+        "reason": "ok",
+        "category": category_hint or "swe",
+        "formal_definition": f"Formal {question}",
+        "simple_definition": f"Simple {question}",
+        "example": None,
+        "why_it_matters": "It matters",
+        "difficulty": 2,
+    }
+
+
+def test_parse_questions_tracks_sections_and_dedupes():
+    questions = parse_questions(RAW_BLOCK)
+
+    assert [q["question"] for q in questions] == [
+        "What is a zombie process?",
+        "Which command will show you free/used memory?",
+        "What is Git?",
+        "What is git cherry-pick?",
+        "Difference between NOW() and CURRENT_DATE()",
+    ]
+    assert questions[0]["category_hint"] == "linux"
+    assert questions[1]["subsection"] == "Commands (basic & advanced)"
+    assert questions[2]["category_hint"] == "git"
+    assert questions[4]["category_hint"] == "databases"
+
+
+def test_remove_known_skips_catalog_duplicates():
+    questions = parse_questions(RAW_BLOCK)
+    fresh, skipped = remove_known(questions, ["Zombie process", "git cherry-pick"])
+
+    assert [q for q, _ in skipped] == ["What is a zombie process?", "What is git cherry-pick?"]
+    assert len(fresh) == 3
+
+
+def test_generate_all_checkpoints_and_resumes(tmp_path):
+    checkpoint = tmp_path / "progress.jsonl"
+    questions = parse_questions(RAW_BLOCK)
+    calls = []
+
+    def counting_generate(question, category_hint):
+        calls.append(question)
+        return fake_generate(question, category_hint)
+
+    records = asyncio.run(generate_all(questions[:2], str(checkpoint), rate_per_minute=6000, generate=counting_generate))
+    assert {r["status"] for r in records.values()} == {"generated"}
+    assert len(load_checkpoint(str(checkpoint))) == 2
+
+    # Second run only generates the questions that weren't checkpointed yet
+    records = asyncio.run(generate_all(questions, str(checkpoint), rate_per_minute=6000, generate=counting_generate))
+    assert len(calls) == 5
+    assert records["What is Git?"]["status"] == "rejected"
+
+
+def test_failed_question_backs_off_only_between_attempts(tmp_path, monkeypatch):
+    real_sleep = asyncio.sleep
+    backoffs = []
+
+    async def recording_sleep(delay):
+        if delay >= 1:
+            backoffs.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", recording_sleep)
+    questions = parse_questions("What is a zombie process?")
+    records = asyncio.run(generate_all(
+        questions, str(tmp_path / "progress.jsonl"), rate_per_minute=6000, retries=2,
+        generate=lambda question, hint: None,
+    ))
+
+    assert records["What is a zombie process?"]["status"] == "failed"
+    assert backoffs == [1, 2]
+
+
+def test_write_module_produces_importable_catalog(tmp_path):
+    record = {"question": "What is a zombie process?", "result": fake_generate("What is a zombie process?", "linux")}
+    path = tmp_path / "generated.py"
+    write_module([to_term(record)], str(path))
+
+    module = runpy.run_path(str(path))
+    assert module["generated"][0]["term"] == "What is a zombie process?"
+    assert module["generated"][0]["category"] == "linux"
+    assert module["generated"][0]["example"] is None
@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_app_startup_does_not_import_heavy_sdks(tmp_path):
+    code = "import sys, app.main; print([m for m in ('google.generativeai', 'boto3') if m in sys.modules])"
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'lazy.db'}",
+           "SECRET_KEY": "testsecret", "ALGORITHM": "HS256", "LOG_LEVEL": "WARNING"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env,
+                            check=True, capture_output=True, text=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+from alembic import command
+from alembic.script import ScriptDirectory
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.migrations import SchemaNotReady, expected_heads, verify_schema
+from init_db import BASELINE_REVISION, alembic_config
+
+
+def test_expected_heads_match_alembic():
+    assert expected_heads() == set(ScriptDirectory.from_config(alembic_config()).get_heads())
+
+
+def test_verify_schema_requires_head_revision(tmp_path, monkeypatch):
+    db_path = tmp_path / "verify.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db_path}")
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+
+    async def check():
+        try:
+            return await verify_schema(async_engine)
+        finally:
+            await async_engine.dispose()
+
+    with pytest.raises(SchemaNotReady, match="revision none"):
+        asyncio.run(check())
+
+    command.stamp(alembic_config(), BASELINE_REVISION)
+    with pytest.raises(SchemaNotReady, match=BASELINE_REVISION):
+        asyncio.run(check())
+
+    command.stamp(alembic_config(), "head")
+    assert asyncio.run(check()) in expected_heads()
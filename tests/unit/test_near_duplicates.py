@@ -0,0 +1,99 @@
+import json
+
+from app.services.near_duplicates import NearDuplicateIndex, normalize_tokens, same_term
+
+
+def test_normalize_tokens_drops_question_phrasing():
+    assert normalize_tokens("Difference between Docker and Docker Compose?") == ["docker", "vs", "docker", "compose"]
+    assert normalize_tokens("Docker vs Docker Compose") == ["docker", "vs", "docker", "compose"]
+
+
+def test_normalize_tokens_keeps_acronyms_and_short_words():
+    assert normalize_tokens("HTTPS") == ["https"]
+    assert normalize_tokens("What are APIs?") == ["api"]
+    assert normalize_tokens("Microservices") == ["microservice"]
+    assert normalize_tokens("DNS vs CDNs") == ["dns", "vs", "cdn"]
+
+
+def test_query_finds_rephrased_duplicate():
+    index = NearDuplicateIndex()
+    index.add(1, "Docker vs Docker Compose")
+    index.add(2, "What is a VPC?")
+
+    matches = index.query("Difference between Docker and Docker Compose?")
+    assert matches[0][0] == 1
+    assert matches[0][1] == 1.0
+    assert index.query("What is Terraform state?") == []
+    assert same_term("Difference between Docker and Docker Compose?", "Docker vs Docker Compose")
+
+
+def test_distinct_terms_are_not_duplicates():
+    pairs = [
+        ("Docker Compose", "Docker vs Docker Compose"),
+        ("NoSQL", "SQL vs NoSQL"),
+        ("HTTP", "HTTPS"),
+        ("Azure App Service", "Azure Service Bus"),
+    ]
+    for existing, suggested in pairs:
+        index = NearDuplicateIndex()
+        index.add(1, existing)
+        assert index.query(suggested) == [], (existing, suggested)
+        assert not same_term(existing, suggested)
+
+
+def test_clusters_group_near_duplicates_only():
+    index = NearDuplicateIndex()
+    texts = ["What is CAP Theorem?", "CAP theorem", "Blue-green deployment", "What is DNS?", "HTTP", "HTTPS"]
+    for key, text in enumerate(texts):
+        index.add(key, text)
+
+    assert index.clusters() == [[0, 1]]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = NearDuplicateIndex()
+    index.add(7, "Infrastructure as Code")
+    path = tmp_path / "index.json"
+    index.save(str(path))
+
+    loaded = NearDuplicateIndex.load(str(path))
+    assert loaded.text(7) == "Infrastructure as Code"
+    assert loaded.query("What is Infrastructure as Code?")[0][0] == 7
+
+
+def test_index_saved_with_older_shingles_is_not_reused(tmp_path, monkeypatch):
+    from app.services import near_duplicates
+
+    path = tmp_path / "index.json"
+    NearDuplicateIndex(shingle_version=1).save(str(path))
+    assert json.loads(path.read_text())["shingle_version"] == 1
+    monkeypatch.setattr(near_duplicates, "TERM_INDEX_PATH", str(path))
+
+    assert near_duplicates._load_persisted() is None
+
+
+def test_concurrent_saves_use_their_own_temp_files(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = tmp_path / "index.json"
+    indexes = []
+    for n in range(8):
+        index = NearDuplicateIndex()
+        for key in range(50):
+            index.add(key, f"Term {n} {key}")
+        indexes.append(index)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda index: index.save(str(path)), indexes * 4))
+
+    assert len(NearDuplicateIndex.load(str(path))) == 50
+    assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
+
+def test_remove_drops_term_from_buckets():
+    index = NearDuplicateIndex()
+    index.add(1, "Git rebase")
+    index.remove(1)
+
+    assert len(index) == 0
+    assert index.query("Git rebase") == []
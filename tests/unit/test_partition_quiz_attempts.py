@@ -0,0 +1,80 @@
+import gzip
+import json
+from datetime import date, datetime
+
+from partition_quiz_attempts import (
+    add_months,
+    create_partition_sql,
+    ensure_partitions_sql,
+    months_to_create,
+    partition_month,
+    partition_name,
+    partitions_to_archive,
+    write_jsonl_gz,
+)
+
+
+def test_month_arithmetic_crosses_years():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_partition_names_round_trip():
+    assert partition_name(date(2026, 3, 1)) == "quiz_attempts_y2026m03"
+    assert partition_month("quiz_attempts_y2026m03") == date(2026, 3, 1)
+    assert partition_month("quiz_attempts_default") is None
+
+
+def test_months_to_create_starts_at_current_month():
+    assert months_to_create(date(2026, 12, 19), 2) == [date(2026, 12, 1), date(2027, 1, 1), date(2027, 2, 1)]
+    assert "FROM ('2026-12-01') TO ('2027-01-01')" in create_partition_sql(date(2026, 12, 1))
+
+
+def test_ensure_without_stray_rows_only_creates():
+    assert ensure_partitions_sql([date(2027, 1, 1)], []) == [create_partition_sql(date(2027, 1, 1))]
+
+
+def test_ensure_moves_stray_rows_out_of_the_default_partition():
+    statements = ensure_partitions_sql([date(2027, 1, 1)], [date(2026, 8, 1)])
+
+    # The default partition is out of the way while the partitions are created
+    assert statements[1] == "ALTER TABLE quiz_attempts DETACH PARTITION quiz_attempts_default"
+    assert statements[2:4] == [create_partition_sql(date(2026, 8, 1)), create_partition_sql(date(2027, 1, 1))]
+    assert statements[4] == (
+        "INSERT INTO quiz_attempts_y2026m08 SELECT * FROM quiz_attempts_default "
+        "WHERE attempted_at >= '2026-08-01' AND attempted_at < '2026-09-01'"
+    )
+    assert statements[5].startswith("DELETE FROM quiz_attempts_default WHERE attempted_at >= '2026-08-01'")
+    assert statements[-1] == "ALTER TABLE quiz_attempts ATTACH PARTITION quiz_attempts_default DEFAULT"
+
+
+def test_quiz_attempt_identity_includes_the_partition_key():
+    from sqlalchemy import inspect
+    from app.models import QuizAttempt
+
+    assert [c.name for c in inspect(QuizAttempt).primary_key] == ["id", "attempted_at"]
+
+
+def test_only_partitions_past_retention_are_archived():
+    names = [
+        "quiz_attempts_default",
+        "quiz_attempts_y2025m09",
+        "quiz_attempts_y2025m10",
+        "quiz_attempts_y2025m11",
+        "quiz_attempts_y2026m10",
+    ]
+    # 12 months back from October 2026 keeps October 2025 onwards
+    assert partitions_to_archive(names, date(2026, 10, 19), 12) == ["quiz_attempts_y2025m09"]
+
+
+def test_write_jsonl_gz(tmp_path):
+    path = tmp_path / "quiz_attempts_y2025m01.jsonl.gz"
+    rows = [{"id": 1, "attempted_at": datetime(2025, 1, 2, 3, 4, 5), "score": 80}, {"id": 2, "attempted_at": None, "score": 10}]
+
+    assert write_jsonl_gz(iter(rows), str(path)) == 2
+
+    with gzip.open(path, "rt") as f:
+        lines = [json.loads(line) for line in f]
+    assert lines[0] == {"id": 1, "attempted_at": "2025-01-02T03:04:05", "score": 80}
+    assert lines[1]["id"] == 2
+    assert not (tmp_path / "quiz_attempts_y2025m01.jsonl.gz.tmp").exists()
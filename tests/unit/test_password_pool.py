@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from app.auth import password_pool
+from app.auth.password_pool import PasswordHasherBusy, hash_password, verify_password
+
+
+def test_hashing_runs_off_the_event_loop():
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        hashed = await hash_password("correct horse")
+        results = await asyncio.gather(verify_password("correct horse", hashed), verify_password("wrong", hashed))
+        task.cancel()
+        return results, ticks
+
+    results, ticks = asyncio.run(scenario())
+    assert results == [True, False]
+    # bcrypt takes 100+ ms per call; the loop kept running meanwhile
+    assert ticks > 10
+    assert password_pool.hash_duration.count(op="verify") >= 2
+
+
+def test_full_queue_is_refused(monkeypatch):
+    monkeypatch.setattr(password_pool, "PASSWORD_HASH_MAX_PENDING", 0)
+    rejected = password_pool.hash_rejected.value(op="hash")
+    with pytest.raises(PasswordHasherBusy):
+        asyncio.run(hash_password("x"))
+    assert password_pool.hash_rejected.value(op="hash") == rejected + 1
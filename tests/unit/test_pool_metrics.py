@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.services import pool_metrics
+from app.services.pool_metrics import InstrumentedQueuePool, instrument_engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    instrument_engine(engine, "test")
+    yield engine
+    engine.dispose()
+
+
+def test_checkout_and_checkin_update_gauges(engine):
+    checkouts_before = pool_metrics.pool_checkouts.value(pool="test")
+    waits_before = pool_metrics.pool_wait.count(pool="test")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert pool_metrics.pool_checked_out.value(pool="test") == 1
+
+    assert pool_metrics.pool_checked_out.value(pool="test") == 0
+    assert pool_metrics.pool_checkouts.value(pool="test") == checkouts_before + 1
+    assert pool_metrics.pool_wait.count(pool="test") == waits_before + 1
+    assert pool_metrics.pool_size.value(pool="test") == 1
+
+
+def test_exhausted_pool_counts_timeout(engine):
+    timeouts_before = pool_metrics.pool_timeouts.value(pool="test")
+
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert pool_metrics.pool_timeouts.value(pool="test") == timeouts_before + 1
+
+
+def test_label_survives_dispose(engine):
+    engine.dispose()
+    assert engine.pool.metrics_label == "test"
@@ -0,0 +1,201 @@
+import fnmatch
+import multiprocessing
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+from starlette.requests import Request
+
+from app.auth.auth_handler import sign_jwt
+from app.services.rate_limit import rate_limit_key
+from app.services.rate_limit_storage import RespError
+
+
+class RespStandIn(socketserver.ThreadingTCPServer):
+    """A tiny in-memory server for the Redis commands RespStorage uses"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RespHandler)
+        self.data, self.expires = {}, {}
+        self.lock = threading.Lock()
+        # Keys that expire right after a SET NX that found them, as if the TTL ran out mid-pipeline
+        self.expire_after_set = set()
+
+    def alive(self, key):
+        if key in self.expires and self.expires[key] <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    def run(self, cmd, *args):
+        cmd = cmd.upper()
+        if cmd in (b"PING", b"AUTH", b"SELECT"):
+            return "PONG" if cmd == b"PING" else "OK"
+        if cmd == b"GET":
+            return self.data[args[0]] if self.alive(args[0]) else None
+        if cmd == b"SET":
+            if b"NX" in args and self.alive(args[0]):
+                if args[0] in self.expire_after_set:
+                    self.expire_after_set.discard(args[0])
+                    self.expires[args[0]] = time.time()
+                return None
+            self.data[args[0]] = args[1]
+            self.expires.pop(args[0], None)
+            if b"PX" in args:
+                self.expires[args[0]] = time.time() + int(args[args.index(b"PX") + 1]) / 1000
+            return "OK"
+        if cmd == b"PEXPIRE":
+            if not self.alive(args[0]):
+                return 0
+            self.expires[args[0]] = time.time() + int(args[1]) / 1000
+            return 1
+        if cmd in (b"INCRBY", b"DECRBY"):
+            value = int(self.data[args[0]]) if self.alive(args[0]) else 0
+            value += int(args[1]) * (1 if cmd == b"INCRBY" else -1)
+            self.data[args[0]] = str(value).encode()
+            return value
+        if cmd == b"PTTL":
+            if not self.alive(args[0]):
+                return -2
+            return int((self.expires[args[0]] - time.time()) * 1000) if args[0] in self.expires else -1
+        if cmd == b"DEL":
+            return sum(self.data.pop(key, None) is not None for key in args)
+        if cmd == b"SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode()
+            return [b"0", [key for key in list(self.data) if self.alive(key) and fnmatch.fnmatch(key.decode(), pattern)]]
+        return RespError(f"ERR unknown command {cmd.decode()}")
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            header = self.rfile.readline()
+            if not header:
+                return
+            args = []
+            for _ in range(int(header[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            with self.server.lock:
+                reply = self.server.run(*args)
+            self.wfile.write(encode(reply))
+
+
+def encode(reply) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, RespError):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(encode(item) for item in reply)
+
+
+@pytest.fixture
+def resp_server():
+    server = RespStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def resp_uri(resp_server):
+    return f"resp://:secret@127.0.0.1:{resp_server.server_address[1]}/1"
+
+
+@pytest.fixture
+def sqlite_uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'limits.db'}"
+
+
+@pytest.fixture(params=["sqlite", "resp"])
+def storage_uri(request):
+    return request.getfixturevalue(f"{request.param}_uri")
+
+
+def test_workers_share_one_budget_and_never_exceed_it(storage_uri):
+    # Two storages stand in for two worker processes
+    limiters = [SlidingWindowCounterRateLimiter(storage_from_string(storage_uri)) for _ in range(2)]
+    item = parse("10/minute")
+    with ThreadPoolExecutor(8) as pool:
+        granted = list(pool.map(lambda i: limiters[i % 2].hit(item, "user:1", "quiz"), range(40)))
+    assert sum(granted) == 10
+    assert limiters[0].hit(parse("10/minute"), "user:2", "quiz")
+    assert limiters[1].get_window_stats(item, "user:1", "quiz").remaining == 0
+
+
+def test_fixed_window_counts_and_reset(storage_uri):
+    storage = storage_from_string(storage_uri)
+    limiter = FixedWindowRateLimiter(storage)
+    item = parse("2/minute")
+    assert [limiter.hit(item, "ip:1") for _ in range(3)] == [True, True, False]
+    assert 50 < storage.get_expiry(item.key_for("ip:1")) - time.time() <= 60
+    assert storage.check()
+    assert storage.reset() == 1
+    assert limiter.hit(item, "ip:1")
+
+
+def _hammer(uri, results):
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    results.put(sum(limiter.hit(parse("5/minute"), "ip:9") for _ in range(5)))
+
+
+def test_sqlite_budget_is_shared_across_processes(sqlite_uri):
+    storage_from_string(sqlite_uri).check()  # create the table up front
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    workers = [context.Process(target=_hammer, args=(sqlite_uri, results)) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert sum(results.get() for _ in workers) == 5
+
+
+def test_resp_errors_do_not_desync_the_connection(resp_uri):
+    storage = storage_from_string(resp_uri)
+    with pytest.raises(RespError):
+        storage.connection.execute(("BOGUS",), ("PING",))
+    assert storage.connection.execute(("PING",)) == ["PONG"]
+    assert not storage_from_string("resp://127.0.0.1:1").check()
+
+
+def test_resp_counter_that_expires_mid_increment_still_gets_a_ttl(resp_server, resp_uri):
+    storage = storage_from_string(resp_uri)
+    limiter = FixedWindowRateLimiter(storage)
+    item = parse("1/minute")
+    key = item.key_for("user:5")
+    assert limiter.hit(item, "user:5")
+
+    # The window runs out between SET NX (a no-op, key exists) and INCRBY
+    resp_server.expire_after_set.add(key.encode())
+    assert limiter.hit(item, "user:5")
+    assert 50 < storage.get_expiry(key) - time.time() <= 60
+    assert storage.connection.execute(("PTTL", key))[0] > 0
+
+
+def make_request(headers=None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw, "client": ("203.0.113.5", 4000)})
+
+
+def test_requests_are_keyed_by_user_when_authenticated():
+    token = sign_jwt("42")["access_token"]
+    assert rate_limit_key(make_request({"Authorization": f"Bearer {token}"})) == "user:42"
+    assert rate_limit_key(make_request({"Authorization": "Bearer forged"})) == "ip:203.0.113.5"
+    assert rate_limit_key(make_request()) == "ip:203.0.113.5"
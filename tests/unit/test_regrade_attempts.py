@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import QuizAttempt, Term, User, VocabularyItem
+from regrade_attempts import count_stale, load_checkpoint, regrade
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'regrade.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+
+    db = factory()
+    db.add(User(id=1, email="a@example.com", hashed_password="x"))
+    db.add(Term(id=1, term="DNS", category="networking", formal_definition="f",
+                simple_definition="Resolves names to IPs", difficulty=1))
+    start = datetime(2025, 1, 1)
+    answers = ["it resolves names", "It resolves  names", "no idea at all", "it resolves names"]
+    for i, answer in enumerate(answers, start=1):
+        db.add(QuizAttempt(id=i, user_id=1, term_id=1, user_answer=answer, score=10,
+                           attempted_at=start + timedelta(days=i), grader_version="old"))
+    db.add(VocabularyItem(user_id=1, term_id=1, review_count=4, last_score=10))
+    db.commit()
+    db.close()
+    yield factory
+    engine.dispose()
+
+
+def test_regrade_updates_scores_reuses_cache_and_refreshes_last_score(session_factory, tmp_path):
+    calls = []
+
+    def grade(term, definition, user_answer):
+        calls.append(user_answer)
+        return {"score": 20 if "no idea" in user_answer else 90, "feedback": "regraded"}
+
+    stats = asyncio.run(regrade(session_factory, "v2", grade, chunk_size=2, max_rate=6000,
+                                checkpoint_path=str(tmp_path / "progress.json")))
+
+    assert stats["updated"] == 4
+    # "it resolves names" is graded once for three equivalent answers
+    assert len(calls) == 2
+    assert stats["cache_hits"] == 2
+    assert count_stale(session_factory, "v2") == 0
+    assert load_checkpoint(str(tmp_path / "progress.json"), "v2") == 4
+
+    db = session_factory()
+    assert {a.score for a in db.query(QuizAttempt)} == {20, 90}
+    assert {a.grader_version for a in db.query(QuizAttempt)} == {"v2"}
+    # Latest attempt (id 4) scored 90
+    assert db.query(VocabularyItem).one().last_score == 90
+    db.close()
+
+
+def test_failed_grades_stay_stale_and_are_retried(session_factory, tmp_path):
+    checkpoint = str(tmp_path / "progress.json")
+
+    def flaky_grade(term, definition, user_answer):
+        return None if "no idea" in user_answer else {"score": 80, "feedback": "ok"}
+
+    stats = asyncio.run(regrade(session_factory, "v2", flaky_grade, max_rate=6000, checkpoint_path=checkpoint))
+    assert stats["failed"] == 1
+    assert count_stale(session_factory, "v2") == 1
+    assert load_checkpoint(checkpoint, "v2") == 2
+
+    stats = asyncio.run(regrade(session_factory, "v2", lambda *a: {"score": 5, "feedback": "ok"},
+                                max_rate=6000, checkpoint_path=checkpoint))
+    assert stats["updated"] == 1
+    assert count_stale(session_factory, "v2") == 0
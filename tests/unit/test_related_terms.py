@@ -0,0 +1,98 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services import related_terms
+from app.services.related_terms import RelatedTermsIndex
+
+TERMS = [
+    {"id": 1, "term": "Docker", "category": "docker-kubernetes", "difficulty": 1,
+     "formal_definition": "Docker is a platform for building and running containers.",
+     "simple_definition": "A tool to run apps in containers."},
+    {"id": 2, "term": "Docker Compose", "category": "docker-kubernetes", "difficulty": 2,
+     "formal_definition": "Compose defines multi-container Docker applications in YAML.",
+     "simple_definition": "Runs several Docker containers together."},
+    {"id": 3, "term": "DNS", "category": "networking", "difficulty": 1,
+     "formal_definition": "The Domain Name System resolves domain names to IP addresses.",
+     "simple_definition": "The phonebook of the internet."},
+    {"id": 4, "term": "TCP", "category": "networking", "difficulty": 2,
+     "formal_definition": "A reliable, connection-oriented transport protocol for IP networks.",
+     "simple_definition": "Delivers packets between IP addresses reliably."},
+]
+
+
+def test_related_returns_most_similar_first():
+    index = RelatedTermsIndex(top_k=3)
+    index.build(TERMS)
+
+    related = index.related(1)
+    assert related[0]["id"] == 2
+    assert related[0]["term"] == "Docker Compose"
+    assert all(r["id"] != 1 for r in related)
+    assert [r["score"] for r in related] == sorted((r["score"] for r in related), reverse=True)
+
+
+def test_incremental_add_updates_existing_neighbor_lists():
+    index = RelatedTermsIndex(top_k=3)
+    index.build(TERMS)
+
+    index.add({"id": 5, "term": "Docker Swarm", "category": "docker-kubernetes", "difficulty": 3,
+               "formal_definition": "Docker Swarm orchestrates Docker containers across a cluster.",
+               "simple_definition": "Runs Docker containers on many machines."})
+
+    assert 5 in index
+    assert index.related(5)[0]["id"] in (1, 2)
+    assert 5 in [r["id"] for r in index.related(1)]
+
+
+def test_remove_drops_term_from_neighbors():
+    index = RelatedTermsIndex(top_k=3)
+    index.build(TERMS)
+    index.remove(2)
+
+    assert 2 not in index
+    assert 2 not in [r["id"] for r in index.related(1)]
+
+
+SWARM = {"id": 5, "term": "Docker Swarm", "category": "docker-kubernetes", "difficulty": 3,
+         "formal_definition": "Docker Swarm orchestrates Docker containers across a cluster.",
+         "simple_definition": "Runs Docker containers on many machines."}
+
+
+def test_remove_backfills_neighbor_lists():
+    index = RelatedTermsIndex(top_k=1)
+    index.build(TERMS + [SWARM])
+    first = index.related(1)[0]["id"]
+
+    index.remove(first)
+    # The next best neighbor moves up instead of leaving the list short
+    assert [r["id"] for r in index.related(1)] == [{2, 5}.difference({first}).pop()]
+
+
+class FakeSession:
+    def __init__(self, terms):
+        self.terms = terms
+
+    async def execute(self, statement):
+        rows = [SimpleNamespace(**t) for t in self.terms]
+        return SimpleNamespace(all=lambda: rows)
+
+
+def test_changes_from_other_workers_are_applied_incrementally(monkeypatch):
+    many = TERMS + [
+        {"id": 10 + i, "term": f"Filler {i}", "category": "swe", "difficulty": 1,
+         "formal_definition": f"Filler definition number {i}.", "simple_definition": None}
+        for i in range(16)
+    ]
+    monkeypatch.setattr(related_terms, "_related_index", None)
+    monkeypatch.setattr(related_terms, "_stale", False)
+    built = asyncio.run(related_terms.get_related_index(FakeSession(many)))
+
+    renamed = {**TERMS[2], "term": "Domain Name System"}
+    related_terms.reset_related_index()
+    synced = asyncio.run(related_terms.get_related_index(FakeSession([t for t in many if t["id"] not in (2, 3)] + [renamed])))
+
+    # Patched in place, not rebuilt
+    assert synced is built
+    assert not related_terms._stale
+    assert 2 not in synced
+    assert {"id": 3, "term": "Domain Name System"}.items() <= synced.related(4)[0].items()
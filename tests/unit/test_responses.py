@@ -0,0 +1,47 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.responses import FastJSON
+from app.schemas import TermResponse, VocabularyListResponse
+
+
+def make_term(i):
+    return SimpleNamespace(
+        id=i, term=f"Term é{i}", formal_definition="Formal", simple_definition="Simple", example=None,
+        why_it_matters="Because", category="git", category_id=None, difficulty=2,
+        created_at=datetime(2025, 3, 1, 9, 30, 15, 123456),
+    )
+
+
+def test_fast_json_matches_response_model_output_and_schema():
+    terms = [make_term(i) for i in range(3)]
+    app = FastAPI()
+
+    @app.get("/slow", response_model=list[TermResponse])
+    async def slow():
+        return [TermResponse.model_validate(t, from_attributes=True) for t in terms]
+
+    @app.get("/fast", response_model=list[TermResponse])
+    async def fast():
+        return FastJSON(list[TermResponse]).response(terms)
+
+    client = TestClient(app)
+    slow_resp, fast_resp = client.get("/slow"), client.get("/fast")
+    assert fast_resp.headers["content-type"] == "application/json"
+    assert fast_resp.content == slow_resp.content
+    # The route still documents its response_model
+    schema = client.get("/openapi.json").json()["paths"]["/fast"]["get"]["responses"]["200"]
+    assert schema["content"]["application/json"]["schema"]["items"] == {"$ref": "#/components/schemas/TermResponse"}
+
+
+def test_fast_json_accepts_dicts_for_nested_models():
+    item = {
+        "id": 1, "term_id": 2, "term": "Git", "formal_definition": "F", "simple_definition": "S",
+        "category": "git", "difficulty": 1, "saved_at": datetime(2025, 1, 1), "review_count": 0, "last_score": None,
+    }
+    body = FastJSON(VocabularyListResponse).dump({"items": [item], "total": 1})
+    assert json.loads(body)["items"][0]["saved_at"] == "2025-01-01T00:00:00"
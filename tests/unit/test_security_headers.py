@@ -0,0 +1,37 @@
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.security_headers import SecurityHeadersMiddleware
+
+
+async def framed(request):
+    return PlainTextResponse("ok", headers={"X-Frame-Options": "SAMEORIGIN"})
+
+
+async def stream(request):
+    async def body():
+        yield b"a"
+        yield b"b"
+    return StreamingResponse(body())
+
+
+def client(hsts: bool) -> TestClient:
+    app = Starlette(routes=[Route("/framed", framed), Route("/stream", stream)])
+    app.add_middleware(SecurityHeadersMiddleware, hsts=hsts)
+    return TestClient(app)
+
+
+def test_headers_replace_the_apps_own_and_hsts_is_absent_by_default():
+    response = client(hsts=False).get("/framed")
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers.get_list("x-frame-options") == ["DENY"]
+    assert response.headers["x-xss-protection"] == "1; mode=block"
+    assert "strict-transport-security" not in response.headers
+
+
+def test_hsts_and_streaming_bodies():
+    response = client(hsts=True).get("/stream")
+    assert response.text == "ab"
+    assert response.headers["strict-transport-security"] == "max-age=31536000; includeSubDomains"
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Term
+from seed import content_hash, seed_terms
+
+
+def catalog_term(name, definition="d"):
+    return {"term": name, "category": "git", "difficulty": 1, "formal_definition": definition,
+            "simple_definition": definition, "example": None, "why_it_matters": None}
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_seed_inserts_then_only_applies_changes(session_factory):
+    terms = [catalog_term("Git"), catalog_term("Rebase"), catalog_term(" git ")]
+
+    stats = seed_terms(terms, session_factory)
+    assert (stats["inserted"], stats["updated"], stats["duplicates"]) == (2, 0, 1)
+
+    stats = seed_terms(terms, session_factory)
+    assert (stats["inserted"], stats["updated"], stats["unchanged"]) == (0, 0, 2)
+
+    terms = [catalog_term("Git"), catalog_term("Rebase", "changed"), catalog_term("Merge")]
+    stats = seed_terms(terms, session_factory)
+    assert (stats["inserted"], stats["updated"], stats["unchanged"]) == (1, 1, 1)
+
+    with session_factory() as db:
+        rebase = db.execute(select(Term).where(Term.term == "Rebase")).scalar_one()
+        assert rebase.simple_definition == "changed"
+        assert rebase.content_hash == content_hash(catalog_term("Rebase", "changed"))
+
+
+def test_rows_without_hash_are_backfilled_and_suggested_terms_untouched(session_factory):
+    with session_factory() as db:
+        db.add(Term(term="Git", category="git", difficulty=1, formal_definition="d", simple_definition="d"))
+        db.add(Term(term="User suggested", category="git", difficulty=1, formal_definition="x", simple_definition="x"))
+        db.commit()
+
+    stats = seed_terms([catalog_term("Git")], session_factory)
+    assert (stats["inserted"], stats["updated"]) == (0, 1)
+
+    assert seed_terms([catalog_term("Git")], session_factory)["updated"] == 0
+    with session_factory() as db:
+        assert db.execute(select(Term.simple_definition).where(Term.term == "User suggested")).scalar_one() == "x"
+
+
+def test_suggested_term_with_a_catalog_name_is_not_overwritten(session_factory):
+    with session_factory() as db:
+        db.add(Term(term="Rebase", category="git", difficulty=2, formal_definition="mine", simple_definition="mine"))
+        db.commit()
+
+    stats = seed_terms([catalog_term("rebase"), catalog_term("Merge")], session_factory)
+    assert (stats["inserted"], stats["updated"], stats["skipped"]) == (1, 0, 1)
+
+    with session_factory() as db:
+        rebase = db.execute(select(Term).where(Term.term == "Rebase")).scalar_one()
+        assert (rebase.simple_definition, rebase.content_hash) == ("mine", None)
+
+
+def test_dry_run_writes_nothing(session_factory):
+    stats = seed_terms([catalog_term("Git")], session_factory, dry_run=True)
+    assert stats["inserted"] == 1
+    with session_factory() as db:
+        assert db.execute(select(Term)).first() is None
@@ -0,0 +1,75 @@
+import pytest
+
+from app.data import terms as catalog
+from app.data.term_pack import TermPack, TermPackError, write_pack
+
+
+def sample(name, category, example=None):
+    return {"category": category, "term": name, "difficulty": 2, "formal_definition": "f – ü",
+            "simple_definition": "s", "example": example, "why_it_matters": None}
+
+
+def test_pack_round_trip_and_category_index(tmp_path):
+    path = str(tmp_path / "terms.pack")
+    terms = [sample("Git", "git"), sample("DNS", "networking", "dig"), sample("Rebase", "git")]
+
+    assert write_pack(terms, path, "abc") == 3
+
+    pack = TermPack(path)
+    assert len(pack) == 3
+    assert pack.source_hash == "abc"
+    assert list(pack) == terms
+    assert pack.get(1) == terms[1]
+    assert pack.get(3) is None
+    assert pack.categories() == ["git", "networking"]
+    assert pack.ids_for_category("git") == [0, 2]
+    assert [t["term"] for t in pack.by_category("git")] == ["Git", "Rebase"]
+    pack.close()
+
+
+def test_rejects_files_that_are_not_packs(tmp_path):
+    path = tmp_path / "terms.pack"
+    path.write_bytes(b"not a term pack at all")
+    with pytest.raises(TermPackError):
+        TermPack(str(path))
+
+
+def test_rejects_empty_and_truncated_packs(tmp_path):
+    path = tmp_path / "terms.pack"
+    path.write_bytes(b"")
+    with pytest.raises(TermPackError):
+        TermPack(str(path))
+
+    write_pack([sample("Git", "git")], str(path), "hash")
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(TermPackError, match="truncated"):
+        TermPack(str(path))
+
+
+def test_catalog_falls_back_to_modules_for_an_empty_pack(tmp_path, monkeypatch):
+    path = tmp_path / "terms.pack"
+    path.write_bytes(b"")
+    monkeypatch.setattr(catalog, "PACK_PATH", str(path))
+    monkeypatch.setattr(catalog, "_pack_checked", False)
+    monkeypatch.setattr(catalog, "_pack", None)
+
+    assert catalog.get_pack() is None
+    assert list(catalog.iter_terms()) == catalog.load_from_modules()
+
+
+def test_catalog_uses_pack_only_when_current(tmp_path, monkeypatch):
+    path = str(tmp_path / "terms.pack")
+    monkeypatch.setattr(catalog, "PACK_PATH", path)
+    modules = catalog.load_from_modules()
+
+    write_pack(modules, path, catalog.source_hash())
+    monkeypatch.setattr(catalog, "_pack_checked", False)
+    monkeypatch.setattr(catalog, "_pack", None)
+    assert catalog.get_pack() is not None
+    assert list(catalog.iter_terms()) == modules
+
+    write_pack(modules[:1], path, "stale")
+    monkeypatch.setattr(catalog, "_pack_checked", False)
+    monkeypatch.setattr(catalog, "_pack", None)
+    assert catalog.get_pack() is None
+    assert len(list(catalog.iter_terms())) == len(modules)
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 import pytest
 from fastapi.testclient import TestClient
 
-from app.auth.auth_bearer import get_current_user
+from app.auth.auth_bearer import get_current_user, get_current_user_id
 from app.database import get_db
 from app.main import app
 from app.models import Term, User
@@ -23,27 +23,28 @@ def disable_lifespan(monkeypatch):
 
 @pytest.fixture
 def mock_db(mocker):
-    """Fixture to mock the database session, query chain, and current user."""
+    """Fixture to mock the async database session, result chain, and current user."""
 
     mock_session = mocker.MagicMock()
-    mock_query = mocker.MagicMock()
-    mock_filter = mocker.MagicMock()
-    mock_query.filter.return_value = mock_filter
-    mock_session.query.return_value = mock_query
-    mock_filter.first.return_value = None
+    mock_result = mocker.MagicMock()
+    mock_scalars = mocker.MagicMock()
+    mock_session.execute = mocker.AsyncMock(return_value=mock_result)
+    mock_result.scalars.return_value = mock_scalars
+    mock_scalars.first.return_value = None
+    mock_result.first.return_value = None
 
     mock_user = mocker.MagicMock(spec=User)
     mock_user.id = 1
     mock_user.email = "testuser@example.com"
 
-    return mock_session, mock_query, mock_filter, mock_user
+    return mock_session, mock_result, mock_scalars, mock_user
 
 
 @pytest.fixture
 def client(mock_db):
     mock_session, _, _, mock_user = mock_db
 
-    def override_get_db():
+    async def override_get_db():
         yield mock_session
 
     def override_get_current_user():
@@ -51,6 +52,7 @@ def client(mock_db):
 
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_current_user] = override_get_current_user
+    app.dependency_overrides[get_current_user_id] = lambda: mock_user.id
 
     with TestClient(app) as c:
         yield c
@@ -59,7 +61,7 @@ def client(mock_db):
 
 
 def test_explain_term_success(client, mock_db):
-    mock_session, mock_query, mock_filter, _ = mock_db
+    mock_session, mock_result, mock_scalars, _ = mock_db
 
     term_obj = Term(
         id=1,
@@ -74,7 +76,8 @@ def test_explain_term_success(client, mock_db):
         created_at=datetime.now(timezone.utc),
     )
 
-    mock_filter.first.return_value = term_obj
+    # Read endpoints fetch column rows (result.first()); a Term has the same attributes
+    mock_result.first.return_value = term_obj
 
     resp = client.post("/api/v1/terms/", json={"term": "Docker"})
     assert resp.status_code == 200
@@ -85,9 +88,9 @@ def test_explain_term_success(client, mock_db):
 
 
 def test_explain_term_not_found(client, mock_db):
-    mock_session, mock_query, mock_filter, _ = mock_db
+    mock_session, mock_result, mock_scalars, _ = mock_db
 
-    mock_filter.first.return_value = None
+    mock_result.first.return_value = None
 
     resp = client.post("/api/v1/terms/", json={"term": "NonexistentTerm"})
     assert resp.status_code == 404